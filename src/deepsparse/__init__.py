@@ -24,26 +24,71 @@ for Neural Networks on commodity CPUs.
 # this keeps other loggers in nested files creating from the root logger setups
 from .log import *
 
+import importlib as _importlib
+import os as _os
+
 from .cpu import (
     cpu_architecture,
     cpu_avx2_compatible,
     cpu_avx512_compatible,
     cpu_vnni_compatible,
 )
-from .engine import *
 from .timing import *
-from .pipeline import *
-from .loggers import *
 from .version import __version__, is_release
 
-try:
-    from sparsezoo.package import check_package_version as _check_package_version
-
-    _check_package_version(
-        package_name=__name__ if is_release else f"{__name__}-nightly",
-        package_version=__version__,
-    )
-except Exception as err:
-    print(
-        f"Need sparsezoo version above 0.9.0 to run Neural Magic's latest-version check\n{err}"
-    )
+# submodules whose public names are imported on first access rather than with
+# the package, they pull in the engine library, pydantic, and the task registry
+_LAZY_SUBMODULES = ["engine", "pipeline", "loggers"]
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _LAZY_SUBMODULES:
+        return _importlib.import_module(f".{name}", __name__)
+
+    for submodule_name in _LAZY_SUBMODULES:
+        submodule = _importlib.import_module(f".{submodule_name}", __name__)
+        if name in _public_names(submodule):
+            value = getattr(submodule, name)
+            globals()[name] = value
+            return value
+
+    try:
+        # support attribute access of submodules not imported yet
+        return _importlib.import_module(f".{name}", __name__)
+    except ModuleNotFoundError as err:
+        if err.name != f"{__name__}.{name}":
+            raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _public_names(module):
+    # names imported by `from module import *`
+    if hasattr(module, "__all__"):
+        return module.__all__
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __dir__():
+    names = set(globals())
+    for submodule_name in _LAZY_SUBMODULES:
+        submodule = _importlib.import_module(f".{submodule_name}", __name__)
+        names.update(_public_names(submodule))
+    return sorted(names)
+
+
+# NM_VERSION_CHECK=false disables the latest version check, checked before
+# importing sparsezoo to skip the cost of the import altogether
+if _os.getenv("NM_VERSION_CHECK", "").lower().strip() != "false":
+    try:
+        from sparsezoo.package import check_package_version as _check_package_version
+
+        _check_package_version(
+            package_name=__name__ if is_release else f"{__name__}-nightly",
+            package_version=__version__,
+        )
+    except Exception as err:
+        print(
+            f"Need sparsezoo version above 0.9.0 to run Neural Magic's latest-version check\n{err}"
+        )
@@ -16,7 +16,7 @@
 Image classification pipeline
 """
 import json
-from typing import Dict, List, Optional, Tuple, Type, Union
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import numpy
 import onnx
@@ -32,6 +32,7 @@ from deepsparse.image_classification.schemas import (
     ImageClassificationOutput,
 )
 from deepsparse.pipeline import Pipeline
+from deepsparse.pipelines.computer_vision import decode_image, resize_and_center_crop
 from deepsparse.utils import model_to_path
 
 
@@ -90,16 +91,12 @@ class ImageClassificationPipeline(Pipeline):
 
         # torchvision transforms for raw inputs
         non_rand_resize_scale = 256.0 / 224.0  # standard used
+        self._resize_size = tuple(
+            [round(non_rand_resize_scale * size) for size in self._image_size]
+        )
         self._pre_normalization_transforms = transforms.Compose(
             [
-                transforms.Resize(
-                    tuple(
-                        [
-                            round(non_rand_resize_scale * size)
-                            for size in self._image_size
-                        ]
-                    )
-                ),
+                transforms.Resize(self._resize_size),
                 transforms.CenterCrop(self._image_size),
             ]
         )
@@ -137,6 +134,26 @@ class ImageClassificationPipeline(Pipeline):
 
         return model_to_path(self.model_path)
 
+    def inputs_from_files(self, files: Iterable[BinaryIO]) -> ImageClassificationInput:
+        """
+        Decodes uploaded image files in parallel on the pipeline executor,
+        straight into a batch of resized and center cropped images. Large
+        images are decoded at a reduced resolution
+
+        :param files: file objects of the uploaded images
+        :return: inputs holding the batch of images as a uint8 array of shape
+            (batch, 3, height, width), normalized by `process_inputs`
+        """
+        encoded_images = [file.read() for file in files]
+        images = list(self.executor.map(self._decode_image, encoded_images))
+        return self.input_schema(images=numpy.stack(images, axis=0))
+
+    def _decode_image(self, encoded_image: bytes) -> numpy.ndarray:
+        image = decode_image(encoded_image, min_size=self._resize_size)
+        image = resize_and_center_crop(image, self._resize_size, self._image_size)
+        # make channel first dimension
+        return image.transpose(2, 0, 1)
+
     def process_inputs(self, inputs: ImageClassificationInput) -> List[numpy.ndarray]:
         """
         Pre-Process the Inputs for DeepSparse Engine
@@ -18,12 +18,14 @@
 # base modules
 from .base_logger import *
 from .constants import *
+from .sampling import *
 
 
 # logger implementations
 from .async_logger import *
 from .function_logger import *
 from .multi_logger import *
+from .numpy_shard_logger import *
 from .prometheus_logger import *
 from .python_logger import *
 
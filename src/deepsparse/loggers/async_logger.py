@@ -17,32 +17,112 @@ Logger wrapper to run log calls asynchronously to not block the main process
 """
 
 import logging
+import random
 import textwrap
-from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Any
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
 
-from deepsparse.loggers import BaseLogger, MetricCategories
+from deepsparse.loggers import BaseLogger, MetricCategories, SystemGroups
 
 
-__all__ = ["AsyncLogger"]
+__all__ = ["AsyncLogger", "OVERFLOW_POLICIES"]
 
 
 _LOGGER = logging.getLogger(__name__)
 
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+SAMPLE = "sample"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, SAMPLE)
+
+_NUM_DROPPED_IDENTIFIER = f"{SystemGroups.ASYNC_LOGGING}/num_dropped_entries"
+
+_LogEntry = Tuple[str, Any, MetricCategories, Dict[str, Any]]
+
 
 class AsyncLogger(BaseLogger):
     """
     Logger wrapper that forwards log calls to run asynchronously, freeing
     the main process. No call back/returned future currently provided
 
+    Log calls are buffered in a bounded queue that background workers drain
+    in batches to the wrapped logger, so that logging faster than the wrapped
+    logger can process never grows the memory of the process (logged values
+    may be large arrays). Once the queue is full, entries are dropped
+    according to `overflow_policy`:
+        - "drop_oldest": the oldest queued entry is dropped for the new one
+        - "drop_newest": the new entry is dropped
+        - "sample": the queue keeps a uniform sample of the entries logged
+            since it was last drained (reservoir sampling)
+    The total number of dropped entries is logged to the wrapped logger as
+    the SYSTEM metric `async_logging/num_dropped_entries` whenever it grows.
+
     :param logger: logger object to wrap
-    :param max_workers: maximum logging tasks to run in the job pool at once.
+    :param max_workers: number of background workers draining the queue.
         defaults to 1
+    :param max_queue_size: maximum number of queued log calls.
+        defaults to 10000
+    :param overflow_policy: which entries to drop once the queue is full,
+        one of "drop_oldest", "drop_newest", or "sample".
+        defaults to "drop_oldest"
+    :param max_batch_size: maximum number of entries a worker takes from the
+        queue at once. defaults to 64
     """
 
-    def __init__(self, logger: BaseLogger, max_workers: int = 1):
+    def __init__(
+        self,
+        logger: BaseLogger,
+        max_workers: int = 1,
+        max_queue_size: int = 10000,
+        overflow_policy: str = DROP_OLDEST,
+        max_batch_size: int = 64,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow_policy must be one of {OVERFLOW_POLICIES}, "
+                f"found {overflow_policy}"
+            )
+        if max_queue_size < 1 or max_batch_size < 1 or max_workers < 1:
+            raise ValueError(
+                "max_workers, max_queue_size, and max_batch_size must be positive "
+                f"integers, found {max_workers}, {max_queue_size}, {max_batch_size}"
+            )
         self.logger = logger
-        self._job_pool: Executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+        self._max_workers = max_workers
+
+        self._queue: Deque[_LogEntry] = deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        self._workers: List[threading.Thread] = []
+        # entries offered to the full queue since it was last drained,
+        # for reservoir sampling
+        self._num_overflowed = 0
+        self._num_dropped = 0
+        self._num_dropped_logged = 0
+
+    @property
+    def num_dropped(self) -> int:
+        """
+        :return: total number of log calls dropped because the queue was full
+        """
+        return self._num_dropped
+
+    @property
+    def queue_size(self) -> int:
+        """
+        :return: number of log calls waiting to be forwarded
+        """
+        return len(self._queue)
+
+    def is_subscribed(self, identifier: str) -> bool:
+        """
+        :param identifier: The name of the item that would be logged
+        :return: True if the wrapped logger is subscribed to the identifier
+        """
+        return self.logger.is_subscribed(identifier)
 
     def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
         """
@@ -53,21 +133,77 @@ class AsyncLogger(BaseLogger):
         :param category: The metric category that the log belongs to
         :param kwargs: Additional keyword arguments to pass to the logger
         """
-        job_future = self._job_pool.submit(
-            self.logger.log,
-            identifier=identifier,
-            value=value,
-            category=category,
-            **kwargs,
-        )
-        job_future.add_done_callback(_log_async_job_exception)
+        if not self.logger.is_subscribed(identifier):
+            return
+        entry = (identifier, value, category, kwargs)
+        with self._not_empty:
+            new_workers = self._create_workers() if not self._workers else []
+            self._enqueue(entry)
+        for worker in new_workers:
+            # started once the first entry is queued, outside of the lock so
+            # that they may drain it right away
+            worker.start()
 
     def __str__(self):
         child_str = textwrap.indent(str(self.logger), prefix="  ")
         return f"{self.__class__.__name__}:\n{child_str}"
 
-
-def _log_async_job_exception(future):
-    exception = future.exception()
-    if exception is not None:
-        _LOGGER.error(f"Exception occurred during async logging job: {repr(exception)}")
+    def _create_workers(self) -> List[threading.Thread]:
+        # must be called while holding the lock
+        self._workers = [
+            threading.Thread(
+                target=self._drain, name=f"async-logger-{index}", daemon=True
+            )
+            for index in range(self._max_workers)
+        ]
+        return self._workers
+
+    def _enqueue(self, entry: _LogEntry):
+        # must be called while holding the lock
+        if len(self._queue) < self.max_queue_size:
+            self._queue.append(entry)
+            self._not_empty.notify()
+            return
+        self._num_dropped += 1
+        if self.overflow_policy == DROP_OLDEST:
+            self._queue.popleft()
+            self._queue.append(entry)
+        elif self.overflow_policy == SAMPLE:
+            self._num_overflowed += 1
+            index = random.randrange(self.max_queue_size + self._num_overflowed)
+            if index < self.max_queue_size:
+                self._queue[index] = entry
+
+    def _drain(self):
+        while True:
+            with self._not_empty:
+                while not self._queue:
+                    self._not_empty.wait()
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self.max_batch_size, len(self._queue)))
+                ]
+                if not self._queue:
+                    self._num_overflowed = 0
+                if self._num_dropped != self._num_dropped_logged:
+                    self._num_dropped_logged = self._num_dropped
+                    batch.append(
+                        (
+                            _NUM_DROPPED_IDENTIFIER,
+                            self._num_dropped,
+                            MetricCategories.SYSTEM,
+                            {},
+                        )
+                    )
+            for identifier, value, category, kwargs in batch:
+                try:
+                    self.logger.log(
+                        identifier=identifier, value=value, category=category, **kwargs
+                    )
+                except Exception as exception:
+                    _LOGGER.error(
+                        "Exception occurred during async logging job: "
+                        f"{repr(exception)}"
+                    )
+            # release the references to the logged values before waiting
+            del batch
@@ -41,5 +41,17 @@ class BaseLogger(ABC):
         """
         raise NotImplementedError()
 
+    def is_subscribed(self, identifier: str) -> bool:
+        """
+        Whether a call to `log` with the given identifier may result in any
+        information being logged. Callers may skip logging (and the computation
+        of the logged value) entirely for identifiers that are not subscribed to.
+        By default, loggers are subscribed to all identifiers
+
+        :param identifier: The name of the item that would be logged
+        :return: True if the logger may log values with the given identifier
+        """
+        return True
+
     def __str__(self):
         return f"{self.__class__.__name__}"
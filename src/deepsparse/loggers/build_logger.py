@@ -29,12 +29,19 @@ from deepsparse.loggers import (
     FROM_PREDEFINED,
     AsyncLogger,
     BaseLogger,
+    FrequencySampler,
     FunctionLogger,
     MultiLogger,
+    NumpyShardLogger,
+    ProbabilitySampler,
     PrometheusLogger,
     PythonLogger,
+    RateLimitSampler,
+    ReservoirSampler,
+    Sampler,
 )
 from deepsparse.loggers.config import (
+    AsyncLoggingConfig,
     MetricFunctionConfig,
     PipelineLoggingConfig,
     SystemLoggingConfig,
@@ -54,7 +61,11 @@ __all__ = [
 ]
 
 _LOGGER = logging.getLogger(__name__)
-_LOGGER_MAPPING = {"python": PythonLogger, "prometheus": PrometheusLogger}
+_LOGGER_MAPPING = {
+    "python": PythonLogger,
+    "prometheus": PrometheusLogger,
+    "numpy": NumpyShardLogger,
+}
 
 
 def custom_logger_from_identifier(custom_logger_identifier: str) -> Type[BaseLogger]:
@@ -107,6 +118,7 @@ def logger_from_config(config: str, pipeline_identifier: str = None) -> BaseLogg
         data_logging_config=possibly_modify_target_identifiers(
             config.data_logging, pipeline_identifier
         ),
+        async_logging_config=config.async_logging,
     )
 
     return logger
@@ -116,6 +128,7 @@ def build_logger(
     system_logging_config: Optional[Dict[str, SystemLoggingGroup]] = None,
     data_logging_config: Optional[Dict[str, List[MetricFunctionConfig]]] = None,
     loggers_config: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    async_logging_config: Optional[AsyncLoggingConfig] = None,
 ) -> BaseLogger:
     """
     Builds a DeepSparse logger from the set of provided configs
@@ -160,6 +173,8 @@ def build_logger(
         lists of MetricFunctionConfigs.
     :param loggers_config: An optional dictionary that maps logger names to
         a dictionary of logger arguments.
+    :param async_logging_config: An optional AsyncLoggingConfig instance that
+        describes the queue of the AsyncLogger. Defaults to AsyncLoggingConfig()
     :return: a DeepSparseLogger instance
     """
 
@@ -170,10 +185,13 @@ def build_logger(
     function_loggers_data = build_data_loggers(leaf_loggers, data_logging_config)
     function_loggers_system = build_system_loggers(leaf_loggers, system_logging_config)
     function_loggers = function_loggers_data + function_loggers_system
+    async_logging_config = async_logging_config or AsyncLoggingConfig()
 
     return AsyncLogger(
         logger=MultiLogger(function_loggers),  # wrap all loggers to async log call
         max_workers=1,
+        max_queue_size=async_logging_config.max_queue_size,
+        overflow_policy=async_logging_config.overflow_policy,
     )
 
 
@@ -410,10 +428,9 @@ def parse_out_predefined_function_groups(
                 target_name=registered_identifier, pipeline_identifier=identifier_prefix
             )
             for registered_function in registered_functions:
-                new_metric_function = MetricFunctionConfig(
-                    func=registered_function,
-                    frequency=metric_function.frequency,
-                    target_loggers=metric_function.target_loggers,
+                # keep the sampling and target loggers of the group
+                new_metric_function = metric_function.copy(
+                    update={"func": registered_function}
                 )
 
                 new_data_logging_config[target_identifier].append(new_metric_function)
@@ -484,9 +501,24 @@ def _build_function_logger(
         function=function,
         function_name=function_name,
         frequency=metric_function_cfg.frequency,
+        sampler=_build_sampler(metric_function_cfg),
+        run_async=metric_function_cfg.run_async,
     )
 
 
+def _build_sampler(metric_function_cfg: MetricFunctionConfig) -> Sampler:
+    if metric_function_cfg.max_logs_per_second is not None:
+        return RateLimitSampler(metric_function_cfg.max_logs_per_second)
+    if metric_function_cfg.sample_probability is not None:
+        return ProbabilitySampler(metric_function_cfg.sample_probability)
+    if metric_function_cfg.reservoir_size is not None:
+        return ReservoirSampler(
+            metric_function_cfg.reservoir_size,
+            metric_function_cfg.reservoir_window_seconds,
+        )
+    return FrequencySampler(metric_function_cfg.frequency)
+
+
 def _build_function_logger_from_predefined(
     metric_functions: List[MetricFunctionConfig],
     loggers: Dict[str, BaseLogger],
@@ -14,7 +14,9 @@
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
+
+from deepsparse.loggers.async_logger import OVERFLOW_POLICIES
 
 
 """
@@ -25,6 +27,7 @@ __all__ = [
     "MetricFunctionConfig",
     "SystemLoggingGroup",
     "SystemLoggingConfig",
+    "AsyncLoggingConfig",
     "PipelineLoggingConfig",
 ]
 
@@ -57,6 +60,44 @@ class MetricFunctionConfig(BaseModel):
         "the subset of loggers (specified here by a list of their names).",
     )
 
+    max_logs_per_second: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="If set, applies the function to at most this many "
+        "logged values per second on average, skipping the others. "
+        "Replaces `frequency`",
+    )
+
+    sample_probability: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="If set, applies the function to each logged value "
+        "with this probability. Replaces `frequency`",
+    )
+
+    reservoir_size: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="If set, applies the function to a uniform sample of at most "
+        "this many of the values logged in each window of "
+        "`reservoir_window_seconds`. The sample of a window is processed once "
+        "a value is logged after the window ends. Replaces `frequency`",
+    )
+
+    reservoir_window_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Duration of the reservoir sampling windows in seconds",
+    )
+
+    run_async: bool = Field(
+        default=False,
+        description="Whether to apply the function on its own background worker, "
+        "so that expensive functions do not delay the other loggers. "
+        "Values are dropped while the queue of the worker is full",
+    )
+
     @validator("frequency")
     def non_zero_frequency(cls, frequency: int) -> int:
         if frequency <= 0:
@@ -66,6 +107,21 @@ class MetricFunctionConfig(BaseModel):
             )
         return frequency
 
+    @root_validator(skip_on_failure=True)
+    def single_sampling_strategy(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        strategies = [
+            name
+            for name in ("max_logs_per_second", "sample_probability", "reservoir_size")
+            if values.get(name) is not None
+        ]
+        if values.get("frequency", 1) != 1:
+            strategies.append("frequency")
+        if len(strategies) > 1:
+            raise ValueError(
+                f"Only one sampling strategy may be configured, found {strategies}"
+            )
+        return values
+
 
 class SystemLoggingGroup(BaseModel):
     """
@@ -108,6 +164,42 @@ class PipelineSystemLoggingConfig(SystemLoggingConfig):
         description="The configuration group for the prediction latency "
         "logging group. By default this group is enabled.",
     )
+    async_logging: SystemLoggingGroup = Field(
+        default=SystemLoggingGroup(enable=False),
+        description="The configuration group for the async_logging logging "
+        "group, logging the number of log calls dropped because the queue of "
+        "the asynchronous logger was full. Only applies to the logging config "
+        "of a pipeline, for the server use its system_logging config. By "
+        "default this group is disabled.",
+    )
+
+
+class AsyncLoggingConfig(BaseModel):
+    """
+    Holds the configuration for the queue of log calls that are
+    forwarded asynchronously to the loggers
+    """
+
+    max_queue_size: int = Field(
+        default=10000,
+        gt=0,
+        description="The maximum number of queued log calls. Defaults to 10000",
+    )
+    overflow_policy: str = Field(
+        default="drop_oldest",
+        description="Which log calls to drop once the queue is full, one of "
+        "'drop_oldest', 'drop_newest', or 'sample' (keep a uniform sample of "
+        "the log calls). Defaults to 'drop_oldest'",
+    )
+
+    @validator("overflow_policy")
+    def valid_overflow_policy(cls, overflow_policy: str) -> str:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow_policy must be one of {OVERFLOW_POLICIES}, "
+                f"found {overflow_policy}"
+            )
+        return overflow_policy
 
 
 class PipelineLoggingConfig(BaseModel):
@@ -138,3 +230,9 @@ class PipelineLoggingConfig(BaseModel):
         "to a list of metric functions that are to be applied"
         "to this target prior to logging.",
     )
+
+    async_logging: AsyncLoggingConfig = Field(
+        default=AsyncLoggingConfig(),
+        description="The configuration of the queue of the log calls that are "
+        "forwarded asynchronously to the loggers.",
+    )
@@ -51,6 +51,9 @@ class SystemGroups:
     # Server System Groups
     REQUEST_DETAILS: str = "request_details"
     RESOURCE_UTILIZATION: str = "resource_utilization"
+    ENDPOINT_LOADING: str = "endpoint_loading"
+    # Logging System Groups
+    ASYNC_LOGGING: str = "async_logging"
 
 
 def validate_identifier(identifier: str):
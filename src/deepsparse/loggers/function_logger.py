@@ -16,14 +16,25 @@
 Implementation of the Function Logger
 """
 import textwrap
-from typing import Any, Callable
+from typing import Any, Callable, Optional, Tuple
 
 from deepsparse.loggers import BaseLogger, MetricCategories
-from deepsparse.loggers.helpers import NO_MATCH, finalize_identifier, match_and_extract
+from deepsparse.loggers.async_logger import DROP_NEWEST, AsyncLogger
+from deepsparse.loggers.helpers import (
+    check_identifier_match,
+    finalize_identifier,
+    possibly_extract_value,
+)
+from deepsparse.loggers.sampling import FrequencySampler, Sampler
+from deepsparse.utils.cache import LRUCache
 
 
 __all__ = ["FunctionLogger"]
 
+# upper bound on the number of memoized identifier matches per logger, the least
+# recently logged identifiers are evicted first
+_MAX_CACHED_IDENTIFIERS = 4096
+
 
 class FunctionLogger(BaseLogger):
     """
@@ -40,6 +51,14 @@ class FunctionLogger(BaseLogger):
     :param function: The metric function to be applied
     :param frequency: The frequency with which the metric
         name is to be applied
+    :param sampler: Optional strategy that chooses the logged values the
+        metric function is applied to. Defaults to applying it with
+        the given `frequency`
+    :param run_async: Whether to apply the metric function and log its
+        result on a separate background worker, so that expensive functions
+        do not hold up the caller or other loggers. Values logged while the
+        worker is busy are queued and dropped once the queue is full.
+        Defaults to False
     """
 
     def __init__(
@@ -49,6 +68,8 @@ class FunctionLogger(BaseLogger):
         function: Callable[[Any], Any],
         function_name: str = None,
         frequency: int = 1,
+        sampler: Optional[Sampler] = None,
+        run_async: bool = False,
     ):
 
         self.logger = logger
@@ -56,42 +77,75 @@ class FunctionLogger(BaseLogger):
         self.function = function
         self.function_name = function_name or function.__name__
         self.frequency = frequency
+        self.sampler = sampler or FrequencySampler(frequency)
 
-        self._function_call_counter = 0
+        self._async_logger = (
+            AsyncLogger(
+                logger=_CallbackLogger(self._apply_function_and_log),
+                overflow_policy=DROP_NEWEST,
+            )
+            if run_async
+            else None
+        )
+        # identifier -> (is_match, remainder), the result of matching
+        # an identifier against the target identifier never changes
+        self._identifier_matches = LRUCache(max_size=_MAX_CACHED_IDENTIFIERS)
+
+    def is_subscribed(self, identifier: str) -> bool:
+        """
+        :param identifier: The name of the item that would be logged
+        :return: True if the identifier matches the target identifier
+        """
+        return self._match(identifier)[0]
 
     def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
         """
         If the identifier matches the target identifier, the value of interest
         is being extracted and the metric function is applied to the extracted value.
-        The result is then logged to the child logger with the appropriate
-        frequency
+        The result is then logged to the child logger for the values chosen
+        by the sampler
 
         :param identifier: The name of the item that is being logged.
         :param value: The data structure that the logger is logging
         :param category: The metric category that the log belongs to
         :param kwargs: Additional keyword arguments to pass to the logger
         """
-        extracted_value, remainder = match_and_extract(
-            template=self.target_identifier,
-            identifier=identifier,
-            value=value,
+        if not self._match(identifier)[0]:
+            return
+        log_sampled = (
+            self._async_logger.log
+            if self._async_logger is not None
+            else self._apply_function_and_log
+        )
+        # samplers may return values of previous calls, with their own identifiers
+        for sampled in self.sampler.sample((identifier, value, category, kwargs)):
+            log_sampled(sampled[0], sampled[1], sampled[2], **sampled[3])
+
+    def _apply_function_and_log(
+        self, identifier: str, value: Any, category: MetricCategories, **kwargs
+    ):
+        remainder = self._match(identifier)[1]
+        extracted_value = (
+            value
+            if category == MetricCategories.SYSTEM
+            else possibly_extract_value(value, remainder)
+        )
+        mapped_value = self.function(extracted_value)
+        self.logger.log(
+            identifier=finalize_identifier(
+                identifier, category, self.function_name, remainder
+            ),
+            value=mapped_value,
             category=category,
+            **kwargs,
         )
-        # `None` can be a valid, extracted value.
-        #  Hence, we check for `NO_MATCH` flag
-        if extracted_value != NO_MATCH:
-            if self._function_call_counter % self.frequency == 0:
-                mapped_value = self.function(extracted_value)
-                self.logger.log(
-                    identifier=finalize_identifier(
-                        identifier, category, self.function_name, remainder
-                    ),
-                    value=mapped_value,
-                    category=category,
-                    **kwargs,
-                )
-                self._function_call_counter = 0
-            self._function_call_counter += 1
+
+    def _match(self, identifier: str) -> Tuple[bool, Optional[str]]:
+        match = self._identifier_matches.get(identifier)
+        if match is None:
+            match = check_identifier_match(self.target_identifier, identifier)
+            self._identifier_matches.put(identifier, match)
+        return match
 
     def __str__(self):
         def _indent(value):
@@ -112,3 +166,12 @@ class FunctionLogger(BaseLogger):
             f"target_logger:\n{_indent(self.logger)}"
         )
         return f"{self.__class__.__name__}:\n{_indent(_shorten(function_info))}"
+
+
+class _CallbackLogger(BaseLogger):
+    # forwards log calls to a callback, to run it through an AsyncLogger
+    def __init__(self, callback: Callable[..., None]):
+        self.callback = callback
+
+    def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
+        self.callback(identifier, value, category, **kwargs)
@@ -31,6 +31,8 @@ from deepsparse.loggers.metric_functions.utils import BatchResult
 
 __all__ = [
     "match_and_extract",
+    "check_identifier_match",
+    "possibly_extract_value",
     "get_function_and_function_name",
     "NO_MATCH",
     "access_nested_value",
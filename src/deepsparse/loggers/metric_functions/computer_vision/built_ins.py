@@ -15,6 +15,7 @@
 The set of all the built-in metric functions
 """
 from collections import Counter
+from itertools import chain
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy
@@ -22,7 +23,11 @@ import numpy
 from deepsparse.loggers.metric_functions.registry import (
     register as register_metric_function,
 )
-from deepsparse.loggers.metric_functions.utils import BatchResult
+from deepsparse.loggers.metric_functions.utils import (
+    BatchResult,
+    segment_means,
+    segment_stds,
+)
 
 
 __all__ = [
@@ -36,6 +41,10 @@ __all__ = [
     "number_detected_objects",
 ]
 
+# number of pixels of 8 and 16 bit integer images counted at once to compute
+# their standard deviation
+_MAX_CHUNK_ELEMENTS = 2**22
+
 
 @register_metric_function(
     group=["image_classification", "object_detection", "segmentation"],
@@ -115,9 +124,7 @@ def std_pixels_per_channel(
     """
     img_numpy = _assert_numpy_image(img)
     num_dims, channel_dim = _check_valid_image(img_numpy)
-    dims = numpy.arange(0, num_dims, 1)
-    dims = numpy.delete(dims, channel_dim)
-    stds = tuple(numpy.std(img_numpy, axis=tuple(dims)))
+    stds = tuple(_std_per_channel(img_numpy, num_dims, channel_dim))
     keys = ["channel_{}".format(i) for i in range(len(stds))]
     return dict(zip(keys, stds))
 
@@ -165,10 +172,9 @@ def detected_classes(
      :return: Dictionary, where the keys are class labels
         and the values are their counts across the batch
     """
-    counter = Counter()
     for detection in detected_classes:
         _check_valid_detection(detection)
-        counter.update(detection)
+    counter = Counter(chain.from_iterable(detected_classes))
     # convert keys to strings if required
     counter = {str(class_label): count for class_label, count in counter.items()}
     return counter
@@ -219,12 +225,10 @@ def mean_score_per_detection(scores: List[List[Union[None, float]]]) -> BatchRes
     :return: BatchResult object, that contains the mean scores
         per detection in the batch
     """
-    batch_result = BatchResult()
-    for score in scores:
-        _check_valid_score(score)
-        batch_result.append(0.0 if score == [None] else numpy.mean(score))
-
-    return batch_result
+    values, lengths, no_detections = _flatten_scores(scores)
+    means = segment_means(values, lengths)
+    means[no_detections] = 0.0
+    return BatchResult(means.tolist())
 
 
 @register_metric_function(
@@ -244,12 +248,10 @@ def std_score_per_detection(scores: List[List[Optional[float]]]) -> BatchResult:
     :return: BatchResult object, that contains the standard
         deviation of scores per detection in the batch
     """
-    batch_result = BatchResult()
-    for score in scores:
-        _check_valid_score(score)
-        batch_result.append(0.0 if score == [None] else numpy.std(score))
-
-    return batch_result
+    values, lengths, no_detections = _flatten_scores(scores)
+    stds = segment_stds(values, lengths)
+    stds[no_detections] = 0.0
+    return BatchResult(stds.tolist())
 
 
 def _check_valid_detection(detection: List[Union[int, str, None]]):
@@ -273,6 +275,57 @@ def _check_valid_score(score: List[Union[float, None]]):
         )
 
 
+def _flatten_scores(
+    scores: List[List[Optional[float]]],
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    # concatenates the scores of the batch, samples without
+    # detections are empty segments
+    for score in scores:
+        _check_valid_score(score)
+    no_detections = numpy.array([score == [None] for score in scores], dtype=bool)
+    lengths = numpy.array([len(score) for score in scores], dtype=numpy.int64)
+    lengths[no_detections] = 0
+    values = numpy.fromiter(
+        chain.from_iterable(
+            score for score, empty in zip(scores, no_detections) if not empty
+        ),
+        dtype=numpy.float64,
+        count=int(lengths.sum()),
+    )
+    return values, lengths, no_detections
+
+
+def _std_per_channel(
+    img: numpy.ndarray, num_dims: int, channel_dim: int
+) -> numpy.ndarray:
+    if img.dtype.kind not in "iu" or img.dtype.itemsize > 2:
+        dims = tuple(dim for dim in range(num_dims) if dim != channel_dim)
+        return numpy.std(img, axis=dims)
+
+    # numpy.std would convert the whole batch to float64, instead compute
+    # the exact standard deviations from the histograms of the channels
+    unsigned_dtype = numpy.dtype(f"u{img.dtype.itemsize}")
+    num_bins = 2 ** (8 * img.dtype.itemsize)
+    # signed values are counted by their two's complement bit pattern
+    bin_values = (
+        numpy.arange(num_bins, dtype=unsigned_dtype)
+        .view(img.dtype)
+        .astype(numpy.float64)
+    )
+    stds = []
+    for channel in numpy.moveaxis(img, channel_dim, 0):
+        channel = channel.reshape(-1).view(unsigned_dtype)
+        counts = numpy.zeros(num_bins, dtype=numpy.int64)
+        # bincount converts its input to int64, so chunks bound the overhead
+        for start in range(0, channel.size, _MAX_CHUNK_ELEMENTS):
+            counts += numpy.bincount(
+                channel[start : start + _MAX_CHUNK_ELEMENTS], minlength=num_bins
+            )
+        mean = counts @ bin_values / channel.size
+        stds.append(numpy.sqrt(counts @ numpy.square(bin_values - mean) / channel.size))
+    return numpy.array(stds)
+
+
 def _check_valid_image(img: numpy.ndarray) -> Tuple[int, int]:
     num_dims = img.ndim
     if num_dims == 4:
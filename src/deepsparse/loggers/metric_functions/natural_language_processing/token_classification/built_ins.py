@@ -21,7 +21,7 @@ import numpy
 from deepsparse.loggers.metric_functions.registry import (
     register as register_metric_function,
 )
-from deepsparse.loggers.metric_functions.utils import BatchResult
+from deepsparse.loggers.metric_functions.utils import BatchResult, segment_means
 
 
 __all__ = ["mean_score", "percent_zero_labels"]
@@ -55,16 +55,14 @@ def mean_score(
     :return: BatchResult object, that contains the mean score for each
         sequence of tokens in the batch
     """
-    batch_result = BatchResult()
-    for prediction in token_classification_output.predictions:
-        batch_result.append(_mean_score(prediction))
-    return batch_result
-
-
-def _mean_score(
-    token_classification_output: List["TokenClassificationResult"],  # noqa: F821
-) -> float:
-    return numpy.mean([result.score for result in token_classification_output])
+    predictions = token_classification_output.predictions
+    lengths = [len(prediction) for prediction in predictions]
+    scores = numpy.fromiter(
+        (result.score for prediction in predictions for result in prediction),
+        dtype=numpy.float64,
+        count=sum(lengths),
+    )
+    return BatchResult(segment_means(scores, lengths).tolist())
 
 
 def _percent_zero_labels(
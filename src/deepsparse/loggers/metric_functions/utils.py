@@ -12,7 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-__all__ = ["BatchResult"]
+from typing import Sequence
+
+import numpy
+
+
+__all__ = ["BatchResult", "segment_means", "segment_stds"]
 
 
 class BatchResult(list):
@@ -20,3 +25,44 @@ class BatchResult(list):
     Wrapper class for a list of values that
     are derived from a set of batch data
     """
+
+
+def segment_means(values: numpy.ndarray, lengths: Sequence[int]) -> numpy.ndarray:
+    """
+    Computes the means of consecutive segments of a flat array in one pass,
+    e.g. the mean score of every item of a batch from the scores of all items
+
+    :param values: the concatenated values of all segments
+    :param lengths: the number of values of each segment, in order
+    :return: the mean of each segment, NaN for empty segments
+    """
+    lengths = numpy.asarray(lengths)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        return _segment_sums(values, lengths) / lengths
+
+
+def segment_stds(values: numpy.ndarray, lengths: Sequence[int]) -> numpy.ndarray:
+    """
+    Computes the standard deviations of consecutive segments of a flat array
+    in one pass
+
+    :param values: the concatenated values of all segments
+    :param lengths: the number of values of each segment, in order
+    :return: the standard deviation of each segment, NaN for empty segments
+    """
+    lengths = numpy.asarray(lengths)
+    means = segment_means(values, lengths)
+    deviations = values - numpy.repeat(means, lengths)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        return numpy.sqrt(_segment_sums(deviations * deviations, lengths) / lengths)
+
+
+def _segment_sums(values: numpy.ndarray, lengths: numpy.ndarray) -> numpy.ndarray:
+    sums = numpy.zeros(len(lengths), dtype=numpy.float64)
+    non_empty = lengths > 0
+    if non_empty.any():
+        starts = numpy.cumsum(lengths) - lengths
+        # empty segments have no values, so every non-empty segment
+        # ends where the next non-empty one starts
+        sums[non_empty] = numpy.add.reduceat(values, starts[non_empty])
+    return sums
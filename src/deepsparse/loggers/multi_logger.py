@@ -20,19 +20,48 @@ import textwrap
 from typing import Any, List
 
 from deepsparse.loggers import BaseLogger, MetricCategories
+from deepsparse.utils.cache import LRUCache
 
 
 __all__ = ["MultiLogger"]
 
+# upper bound on the number of indexed identifiers, the least recently logged
+# identifiers are evicted first
+_MAX_CACHED_IDENTIFIERS = 4096
+
 
 class MultiLogger(BaseLogger):
     """
     A logger that holds a list of loggers and logs to all of them.
+
+    The loggers subscribed to each logged identifier are indexed on first use,
+    so that subsequent log calls only dispatch to the loggers that may log
+    the identifier. The index keeps the most recently logged identifiers
     """
 
     def __init__(self, loggers: List[BaseLogger]):
         self.loggers = loggers
 
+    @property
+    def loggers(self) -> List[BaseLogger]:
+        """
+        :return: the loggers that log calls are dispatched to
+        """
+        return self._loggers
+
+    @loggers.setter
+    def loggers(self, loggers: List[BaseLogger]):
+        self._loggers = loggers
+        # identifier -> loggers subscribed to the identifier
+        self._subscribers = LRUCache(max_size=_MAX_CACHED_IDENTIFIERS)
+
+    def is_subscribed(self, identifier: str) -> bool:
+        """
+        :param identifier: The name of the item that would be logged
+        :return: True if any of the held loggers is subscribed to the identifier
+        """
+        return bool(self._get_subscribers(identifier))
+
     def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
         """
 
@@ -41,9 +70,18 @@ class MultiLogger(BaseLogger):
         :param category: The metric category that the log belongs to
         :param kwargs: Additional keyword arguments to pass to the logger
         """
-        for logger in self.loggers:
+        for logger in self._get_subscribers(identifier):
             logger.log(identifier, value, category, **kwargs)
 
+    def _get_subscribers(self, identifier: str) -> List[BaseLogger]:
+        subscribers = self._subscribers.get(identifier)
+        if subscribers is None:
+            subscribers = [
+                logger for logger in self._loggers if logger.is_subscribed(identifier)
+            ]
+            self._subscribers.put(identifier, subscribers)
+        return subscribers
+
     def __str__(self):
         text = "\n".join([str(logger) for logger in self.loggers])
         return f"{self.__class__.__name__}:\n{textwrap.indent(text, prefix='  ')}"
@@ -0,0 +1,364 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Implementation of the Numpy Shard Logger that records logged data values
+to disk in chunked .npy files
+"""
+import atexit
+import glob
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy
+
+from deepsparse.loggers import BaseLogger, MetricCategories
+
+
+__all__ = ["NumpyShardLogger", "load_numpy_shards"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_SHARD_PREFIX = "shard-"
+_TIMESTAMPS_SUFFIX = ".timestamps.npy"
+_UNSAFE_PATH_CHARACTERS = re.compile(r"[^\w.\-]+")
+
+
+class NumpyShardLogger(BaseLogger):
+    """
+    DeepSparse logger that records the values of the DATA category to disk,
+    e.g. raw pipeline inputs and outputs to retrain models or analyze drift.
+
+    Logged values are converted to numpy arrays and buffered per identifier.
+    Full buffers are written by a background thread as shards: `.npy` files
+    whose rows are the logged values, next to a `.timestamps.npy` file with
+    the unix timestamp of each row. Consecutive values of a different shape
+    or dtype start a new shard. Values are copied when buffered, so callers
+    may reuse their arrays, and the buffered values are flushed at interpreter
+    exit if the logger was not closed. Shards are stored under `directory`, in
+    one directory per identifier (with `/` in identifiers creating nested
+    directories), and can be loaded back without copies with
+    `load_numpy_shards`.
+
+    Example flow:
+
+    ```
+    logger = NumpyShardLogger("data_logs", max_rows_per_shard=512)
+    logger.log("pipeline_inputs.images", images, MetricCategories.DATA)
+    logger.flush()
+
+    for values, timestamps in load_numpy_shards(
+        "data_logs", "pipeline_inputs.images"
+    ):
+        ...  # memory mapped arrays
+    ```
+
+    :param directory: the directory to write the shards to
+    :param max_rows_per_shard: the number of rows after which a shard is
+        written. Default is 1024
+    :param max_shard_size_mb: the size of the buffered rows after which a
+        shard is written, in megabytes. Default is 64
+    :param max_shards: if set, the number of shards kept per identifier,
+        the oldest shards are deleted once it is exceeded. Default is None,
+        keeping all shards
+    :param flush_interval_seconds: the interval at which partially filled
+        buffers are written, so that recorded values reach the disk even at
+        low rates. Default is 10 seconds
+    :param batched: if True, the first dimension of every logged value is
+        a batch dimension, and each item of the batch is a row. Otherwise,
+        each logged value is a row. Default is False
+    :param max_pending_shards: the number of shards waiting to be written
+        after which new shards are dropped, bounding memory when the disk
+        falls behind. Default is 16
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_rows_per_shard: int = 1024,
+        max_shard_size_mb: float = 64.0,
+        max_shards: Optional[int] = None,
+        flush_interval_seconds: float = 10.0,
+        batched: bool = False,
+        max_pending_shards: int = 16,
+    ):
+        self.directory = directory
+        self.max_rows_per_shard = max_rows_per_shard
+        self.max_shard_size_mb = max_shard_size_mb
+        self.max_shards = max_shards
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batched = batched
+        self.max_pending_shards = max_pending_shards
+
+        self._max_shard_bytes = int(max_shard_size_mb * 1024**2)
+        self._condition = threading.Condition()
+        self._buffers: Dict[str, _ShardBuffer] = {}
+        self._pending: Deque[Tuple[str, _ShardBuffer]] = deque()
+        self._num_writing = 0
+        self._shards: Dict[str, Deque[str]] = {}
+        self._next_shard_index: Dict[str, int] = {}
+        self._unsupported_identifiers: Set[str] = set()
+        self._num_dropped_rows = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def num_dropped_rows(self) -> int:
+        """
+        :return: number of rows dropped because too many shards were
+            waiting to be written
+        """
+        return self._num_dropped_rows
+
+    def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
+        """
+        Buffer the value to be written to the shards of the identifier,
+        if it is a DATA value that converts to a numeric or string array
+
+        :param identifier: The name of the item that is being logged.
+        :param value: The data structure that the logger is logging
+        :param category: The metric category that the log belongs to
+        :param kwargs: Additional keyword arguments to pass to the logger
+        """
+        if category != MetricCategories.DATA:
+            return
+        rows = self._to_rows(identifier, value)
+        if rows is None:
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_periodically,
+                    name="numpy-shard-logger",
+                    daemon=True,
+                )
+                self._writer.start()
+                atexit.register(self.close)
+
+            buffer = self._buffers.get(identifier)
+            if buffer is not None and (
+                buffer.row_shape != rows.shape[1:] or buffer.dtype != rows.dtype
+            ):
+                self._seal(identifier)
+                buffer = None
+            if buffer is None:
+                buffer = self._buffers[identifier] = _ShardBuffer(
+                    rows.shape[1:], rows.dtype
+                )
+            buffer.append(rows, time.time())
+            if (
+                buffer.num_rows >= self.max_rows_per_shard
+                or buffer.nbytes >= self._max_shard_bytes
+            ):
+                self._seal(identifier)
+
+    def flush(self):
+        """
+        Write all buffered values to disk and wait for the pending shards
+        to be written
+        """
+        with self._condition:
+            for identifier in list(self._buffers):
+                self._seal(identifier)
+        self._write_pending()
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._pending and not self._num_writing
+            )
+
+    def close(self):
+        """
+        Flush the buffered values and stop the background writer
+        """
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        atexit.unregister(self.close)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(directory={self.directory})"
+
+    def _to_rows(self, identifier: str, value: Any) -> Optional[numpy.ndarray]:
+        try:
+            # copied, the value is only written later and callers may reuse it
+            array = numpy.array(value, copy=True)
+        except ValueError:
+            # ragged nested sequences
+            array = None
+        if array is None or array.dtype.kind not in "biufcUS":
+            if identifier not in self._unsupported_identifiers:
+                self._unsupported_identifiers.add(identifier)
+                _LOGGER.warning(
+                    f"Values logged for {identifier} are not recorded by "
+                    f"{self.__class__.__name__}, they must convert to numeric or "
+                    f"string numpy arrays, found {type(value)}"
+                )
+            return None
+        if self.batched and array.ndim > 0:
+            return array
+        return array[numpy.newaxis]
+
+    def _seal(self, identifier: str):
+        # must be called while holding the lock
+        buffer = self._buffers.pop(identifier)
+        if len(self._pending) >= self.max_pending_shards:
+            self._num_dropped_rows += buffer.num_rows
+            return
+        self._pending.append((identifier, buffer))
+        self._condition.notify_all()
+
+    def _write_periodically(self):
+        while True:
+            with self._condition:
+                self._condition.wait(timeout=self.flush_interval_seconds)
+                if self._closed:
+                    return
+                if time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+                    for identifier in list(self._buffers):
+                        self._seal(identifier)
+                    self._last_flush = time.monotonic()
+            self._write_pending()
+
+    def _write_pending(self):
+        while True:
+            with self._condition:
+                if not self._pending:
+                    return
+                identifier, buffer = self._pending.popleft()
+                self._num_writing += 1
+            try:
+                self._write_shard(identifier, buffer)
+            except Exception as exception:
+                _LOGGER.error(
+                    f"Unable to write the values logged for {identifier}: "
+                    f"{repr(exception)}"
+                )
+            finally:
+                with self._condition:
+                    self._num_writing -= 1
+                    self._condition.notify_all()
+
+    def _write_shard(self, identifier: str, buffer: "_ShardBuffer"):
+        values, timestamps = buffer.to_arrays()
+        with self._condition:
+            shard_path = self._next_shard_path(identifier)
+        # the values are written last, a shard is complete once they exist
+        _save_atomically(shard_path + _TIMESTAMPS_SUFFIX, timestamps)
+        _save_atomically(shard_path + ".npy", values)
+
+        with self._condition:
+            shards = self._shards[identifier]
+            shards.append(shard_path)
+            expired_shards = []
+            while self.max_shards is not None and len(shards) > self.max_shards:
+                expired_shards.append(shards.popleft())
+        for expired_shard in expired_shards:
+            for path in (expired_shard + ".npy", expired_shard + _TIMESTAMPS_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _next_shard_path(self, identifier: str) -> str:
+        # must be called while holding the lock
+        identifier_directory = _identifier_directory(self.directory, identifier)
+        if identifier not in self._next_shard_index:
+            # continue after the shards of previous runs, which are kept
+            os.makedirs(identifier_directory, exist_ok=True)
+            existing_shards = _shard_paths(identifier_directory)
+            self._shards[identifier] = deque(existing_shards)
+            self._next_shard_index[identifier] = (
+                _shard_index(existing_shards[-1]) + 1 if existing_shards else 0
+            )
+        index = self._next_shard_index[identifier]
+        self._next_shard_index[identifier] += 1
+        return os.path.join(identifier_directory, f"{_SHARD_PREFIX}{index:06d}")
+
+
+def load_numpy_shards(
+    directory: str, identifier: str, mmap_mode: Optional[str] = "r"
+) -> List[Tuple[numpy.ndarray, numpy.ndarray]]:
+    """
+    :param directory: the directory the NumpyShardLogger wrote to
+    :param identifier: the identifier the values were logged under
+    :param mmap_mode: the mode to memory map the shards with, None to
+        load them into memory. Default is "r", read only
+    :return: the (values, timestamps) arrays of every shard of the
+        identifier, oldest first
+    """
+    return [
+        (
+            numpy.load(shard_path + ".npy", mmap_mode=mmap_mode),
+            numpy.load(shard_path + _TIMESTAMPS_SUFFIX, mmap_mode=mmap_mode),
+        )
+        for shard_path in _shard_paths(_identifier_directory(directory, identifier))
+    ]
+
+
+class _ShardBuffer:
+    def __init__(self, row_shape: Tuple[int, ...], dtype: numpy.dtype):
+        self.row_shape = row_shape
+        self.dtype = dtype
+        self.rows: List[numpy.ndarray] = []
+        self.timestamps: List[float] = []
+        self.num_rows = 0
+        self.nbytes = 0
+
+    def append(self, rows: numpy.ndarray, timestamp: float):
+        self.rows.append(rows)
+        self.timestamps.append(timestamp)
+        self.num_rows += len(rows)
+        self.nbytes += rows.nbytes
+
+    def to_arrays(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        counts = [len(rows) for rows in self.rows]
+        return (
+            numpy.concatenate(self.rows),
+            numpy.repeat(numpy.asarray(self.timestamps, dtype=numpy.float64), counts),
+        )
+
+
+def _identifier_directory(directory: str, identifier: str) -> str:
+    parts = [
+        _UNSAFE_PATH_CHARACTERS.sub("_", part) for part in identifier.split("/") if part
+    ]
+    return os.path.join(directory, *parts)
+
+
+def _shard_paths(identifier_directory: str) -> List[str]:
+    # paths of the complete shards without the extension, oldest first
+    paths = glob.glob(os.path.join(identifier_directory, f"{_SHARD_PREFIX}*.npy"))
+    shard_paths = [
+        path[: -len(".npy")] for path in paths if not path.endswith(_TIMESTAMPS_SUFFIX)
+    ]
+    return sorted(shard_paths, key=_shard_index)
+
+
+def _shard_index(shard_path: str) -> int:
+    return int(os.path.basename(shard_path)[len(_SHARD_PREFIX) :])
+
+
+def _save_atomically(path: str, array: numpy.ndarray):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        numpy.save(file, array, allow_pickle=False)
+    os.replace(temporary_path, path)
@@ -18,9 +18,10 @@ Implementation of the Prometheus Logger
 import logging
 import os
 import re
+import threading
 import warnings
 from collections import defaultdict
-from typing import Any, Dict, Optional, Type, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
 
 from deepsparse.loggers import BaseLogger, MetricCategories, SystemGroups
 from deepsparse.loggers.helpers import unwrap_logged_value
@@ -60,10 +61,12 @@ _PrometheusMetric = Union[Histogram, Gauge, Summary, Counter]
 _IDENTIFIER_TO_METRIC_TYPE = {
     "prediction_latency": Histogram,
     SystemGroups.RESOURCE_UTILIZATION: Gauge,
+    SystemGroups.ENDPOINT_LOADING: Gauge,
     f"{SystemGroups.REQUEST_DETAILS}/successful_request": Counter,
     f"{SystemGroups.REQUEST_DETAILS}/input_batch_size": Histogram,
 }
 _SUPPORTED_DATA_TYPES = (int, float)
+_MISSING = object()
 _DESCRIPTION = (
     "{metric_name} metric for identifier: {identifier} | Category: {category}"
 )
@@ -82,6 +85,11 @@ class PrometheusLogger(BaseLogger):
         are saved. By default, the python working directory
     :param text_log_file_name: the name of the text log file.
         Default: `prometheus_logs.prom`
+    :param text_log_save_interval_seconds: optional interval in seconds at which
+        a background thread exports the text log file. If set, logging only
+        records the values into the in memory metrics and
+        `text_log_save_frequency` is ignored. Default is None (the text log
+        file is exported by the logging calls)
     """
 
     def __init__(
@@ -90,8 +98,16 @@ class PrometheusLogger(BaseLogger):
         text_log_save_frequency: int = 10,
         text_log_save_dir: str = os.getcwd(),
         text_log_file_name: Optional[str] = None,
+        text_log_save_interval_seconds: Optional[float] = None,
     ):
         _check_prometheus_import()
+        if text_log_save_interval_seconds is not None and (
+            text_log_save_interval_seconds <= 0
+        ):
+            raise ValueError(
+                "text_log_save_interval_seconds must be positive, "
+                f"found {text_log_save_interval_seconds}"
+            )
 
         self.port = port
         self.text_log_save_frequency = text_log_save_frequency
@@ -99,10 +115,24 @@ class PrometheusLogger(BaseLogger):
         self.text_log_file_path = os.path.join(
             text_log_save_dir, text_log_file_name or "prometheus_logs.prom"
         )
+        self.text_log_save_interval_seconds = text_log_save_interval_seconds
         self._prometheus_metrics = defaultdict(str)
+        # (identifier, pipeline name) -> function recording a value into the
+        # metric, resolved once per identifier instead of on every call
+        self._recorders: Dict[
+            Tuple[str, Optional[str]], Optional[Callable[[Any], None]]
+        ] = {}
+        self._recorders_lock = threading.Lock()
 
         self._setup_client()
         self._counter = 0
+        self._stop_export = threading.Event()
+        if text_log_save_interval_seconds is not None:
+            threading.Thread(
+                target=self._export_metrics_periodically,
+                name="prometheus-textfile-export",
+                daemon=True,
+            ).start()
 
     def log(self, identifier: str, value: Any, category: MetricCategories, **kwargs):
         """
@@ -115,23 +145,55 @@ class PrometheusLogger(BaseLogger):
         """
 
         pipeline_name = kwargs.get("pipeline_name")
-        for identifier, value in unwrap_logged_value(value, identifier):
-            prometheus_metric = self._get_prometheus_metric(
-                identifier, category, **kwargs
-            )
-            if prometheus_metric is None:
+        if isinstance(value, _SUPPORTED_DATA_TYPES):
+            # plain values need no unwrapping
+            identifiers_and_values = ((identifier, value),)
+        else:
+            identifiers_and_values = unwrap_logged_value(value, identifier)
+        for identifier, value in identifiers_and_values:
+            recorder = self._recorders.get((identifier, pipeline_name), _MISSING)
+            if recorder is _MISSING:
+                recorder = self._create_recorder(identifier, category, **kwargs)
+            if recorder is None:
                 warnings.warn(
                     f"The identifier {identifier} cannot be matched with any "
                     f"of the Prometheus metrics and will be ignored."
                 )
                 return
-            if pipeline_name:
-                prometheus_metric.labels(pipeline_name=pipeline_name).observe(
-                    self._validate(value)
-                )
-            else:
-                prometheus_metric.observe(self._validate(value))
-        self._export_metrics_to_textfile()
+            recorder(self._validate(value))
+        if self.text_log_save_interval_seconds is None:
+            self._export_metrics_to_textfile()
+
+    def close(self):
+        """
+        Stops the background export of the text log file, if any,
+        after a final export
+        """
+        if self.text_log_save_interval_seconds is not None:
+            self._stop_export.set()
+            self._write_textfile()
+
+    def _create_recorder(
+        self, identifier: str, category: MetricCategories, **kwargs
+    ) -> Optional[Callable[[Any], None]]:
+        pipeline_name = kwargs.get("pipeline_name")
+        with self._recorders_lock:
+            # metrics may only be registered once, even by concurrent calls
+            recorder = self._recorders.get((identifier, pipeline_name), _MISSING)
+            if recorder is not _MISSING:
+                return recorder
+            prometheus_metric = self._get_prometheus_metric(
+                identifier, category, **kwargs
+            )
+            recorder = None
+            if prometheus_metric is not None:
+                if pipeline_name:
+                    prometheus_metric = prometheus_metric.labels(
+                        pipeline_name=pipeline_name
+                    )
+                recorder = _metric_recorder(prometheus_metric)
+            self._recorders[(identifier, pipeline_name)] = recorder
+            return recorder
 
     def _get_prometheus_metric(
         self,
@@ -164,12 +226,22 @@ class PrometheusLogger(BaseLogger):
     def _export_metrics_to_textfile(self):
         # export the metrics to a text file with
         # the specified frequency
-        os.makedirs(self.text_log_save_dir, exist_ok=True)
         if self._counter % self.text_log_save_frequency == 0:
-            write_to_textfile(self.text_log_file_path, REGISTRY)
+            self._write_textfile()
             self._counter = 0
         self._counter += 1
 
+    def _export_metrics_periodically(self):
+        while not self._stop_export.wait(self.text_log_save_interval_seconds):
+            try:
+                self._write_textfile()
+            except Exception:
+                _LOGGER.exception("Unable to export the Prometheus text log file")
+
+    def _write_textfile(self):
+        os.makedirs(self.text_log_save_dir, exist_ok=True)
+        write_to_textfile(self.text_log_file_path, REGISTRY)
+
     def _setup_client(self):
         # starts the Prometheus client
         start_http_server(port=self.port)
@@ -240,6 +312,16 @@ def _get_metric_from_the_mapping(
             return metric_type
 
 
+def _metric_recorder(prometheus_metric: Any) -> Callable[[Any], None]:
+    # histograms and summaries observe the values, gauges are set to them
+    # and counters are incremented by them
+    if hasattr(prometheus_metric, "observe"):
+        return prometheus_metric.observe
+    if hasattr(prometheus_metric, "set"):
+        return prometheus_metric.set
+    return prometheus_metric.inc
+
+
 def format_identifier(identifier: str, namespace: str = _NAMESPACE) -> str:
     """
     Replace forbidden characters with `__` so that the identifier
@@ -0,0 +1,159 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Strategies that choose which logged values a FunctionLogger applies its metric
+function to, bounding the cost of data logging
+"""
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+
+__all__ = [
+    "Sampler",
+    "FrequencySampler",
+    "RateLimitSampler",
+    "ProbabilitySampler",
+    "ReservoirSampler",
+]
+
+
+class Sampler(ABC):
+    """
+    Base class of the sampling strategies. A sampler is offered every
+    logged item and returns the items that should be processed now
+    """
+
+    @abstractmethod
+    def sample(self, item: Any) -> List[Any]:
+        """
+        :param item: the newly logged item
+        :return: the items to process now, possibly none, or items offered
+            by previous calls
+        """
+        raise NotImplementedError()
+
+
+class FrequencySampler(Sampler):
+    """
+    Samples every `frequency`-th item, starting with the first one
+
+    :param frequency: the interval of the sampled items, in number of items
+    """
+
+    def __init__(self, frequency: int = 1):
+        if frequency < 1:
+            raise ValueError(f"frequency must be at least 1, found {frequency}")
+        self.frequency = frequency
+        self._counter = 0
+
+    def sample(self, item: Any) -> List[Any]:
+        sampled = self._counter % self.frequency == 0
+        self._counter = (self._counter + 1) % self.frequency
+        return [item] if sampled else []
+
+
+class RateLimitSampler(Sampler):
+    """
+    Samples at most `max_per_second` items per second on average, allowing
+    bursts of up to `max(1, max_per_second)` items (token bucket)
+
+    :param max_per_second: the maximum average rate of sampled items
+    """
+
+    def __init__(self, max_per_second: float):
+        if max_per_second <= 0:
+            raise ValueError(f"max_per_second must be positive, found {max_per_second}")
+        self.max_per_second = max_per_second
+        self._capacity = max(1.0, max_per_second)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def sample(self, item: Any) -> List[Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_refill) * self.max_per_second,
+            )
+            self._last_refill = now
+            if self._tokens < 1.0:
+                return []
+            self._tokens -= 1.0
+        return [item]
+
+
+class ProbabilitySampler(Sampler):
+    """
+    Samples every item independently with the given probability
+
+    :param probability: the probability of sampling an item, in (0, 1]
+    """
+
+    def __init__(self, probability: float):
+        if not 0 < probability <= 1:
+            raise ValueError(f"probability must be in (0, 1], found {probability}")
+        self.probability = probability
+
+    def sample(self, item: Any) -> List[Any]:
+        return [item] if random.random() < self.probability else []
+
+
+class ReservoirSampler(Sampler):
+    """
+    Keeps a uniform sample of at most `size` of the items offered during
+    consecutive windows of `window_seconds`. The sample of a window is
+    returned by the first call after the window ends
+
+    :param size: the maximum number of items sampled per window
+    :param window_seconds: the duration of a window in seconds
+    """
+
+    def __init__(self, size: int, window_seconds: float):
+        if size < 1 or window_seconds <= 0:
+            raise ValueError(
+                "size and window_seconds must be positive, "
+                f"found {size} and {window_seconds}"
+            )
+        self.size = size
+        self.window_seconds = window_seconds
+        self._reservoir: List[Any] = []
+        self._num_offered = 0
+        self._window_end = time.monotonic() + window_seconds
+        self._lock = threading.Lock()
+
+    def sample(self, item: Any) -> List[Any]:
+        with self._lock:
+            sampled = []
+            now = time.monotonic()
+            if now >= self._window_end:
+                sampled, self._reservoir = self._reservoir, []
+                self._num_offered = 0
+                # windows without items are skipped
+                elapsed_windows = (now - self._window_end) // self.window_seconds
+                self._window_end += (elapsed_windows + 1) * self.window_seconds
+
+            self._num_offered += 1
+            if len(self._reservoir) < self.size:
+                self._reservoir.append(item)
+            else:
+                index = random.randrange(self._num_offered)
+                if index < self.size:
+                    self._reservoir[index] = item
+        return sampled
@@ -16,11 +16,29 @@
 Classes and registry for end to end inference pipelines that wrap an underlying
 inference engine and include pre/postprocessing
 """
+import asyncio
+import functools
 import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy
 from pydantic import BaseModel, Field
@@ -36,7 +54,15 @@ from deepsparse.loggers.constants import (
     validate_identifier,
 )
 from deepsparse.tasks import SupportedTasks, dynamic_import_task
-from deepsparse.timing import InferencePhases, Timer
+from deepsparse.timing import (
+    InferencePhases,
+    LatencyProfiler,
+    MergedLatencyProfiler,
+    Timer,
+)
+from deepsparse.utils.cache import LRUCache, hash_inputs
+from deepsparse.utils.data import ArrayBufferPool
+from deepsparse.utils.onnx import generate_random_inputs
 
 
 __all__ = [
@@ -45,6 +71,7 @@ __all__ = [
     "SUPPORTED_PIPELINE_ENGINES",
     "Pipeline",
     "PipelineConfig",
+    "ResultCacheConfig",
     "question_answering_pipeline",
     "text_classification_pipeline",
     "zero_shot_text_classification_pipeline",
@@ -62,6 +89,19 @@ SUPPORTED_PIPELINE_ENGINES = [DEEPSPARSE_ENGINE, ORT_ENGINE]
 
 _REGISTERED_PIPELINES = {}
 
+# phases of each call accumulated by `Pipeline.latency_profiler`
+_PROFILED_PHASES = [
+    InferencePhases.PRE_PROCESS,
+    InferencePhases.ENGINE_FORWARD,
+    InferencePhases.POST_PROCESS,
+    InferencePhases.TOTAL_INFERENCE,
+]
+
+# marks the end of the inputs passed between the stages of `Pipeline.run_stream`
+_END_OF_STREAM = object()
+# stops the background thread of an `_EngineInputsBatcher`
+_CLOSE_BATCHER = object()
+
 
 class Pipeline(ABC):
     """
@@ -141,6 +181,30 @@ class Pipeline(ABC):
         a path to the logging config, or yaml string representation the logging
         config. If logger provided (in any form), the pipeline will log inference
         metrics to the logger. Default is None
+    :param max_batch_wait_ms: An optional maximum time (in milliseconds) to wait
+        for concurrent requests to fill a batch of the engine's batch size.
+        If provided, engine inputs from concurrent calls to the pipeline are queued
+        and merged into shared engine forward passes, whose outputs are scattered
+        back to each of the callers. The merged batch is run once it is full or
+        once the oldest queued request has waited `max_batch_wait_ms`. Default
+        is None (each call runs its own engine forward passes)
+    :param pad_remainder_batches: if True, inputs with a total batch size that is
+        not divisible by the engine batch size are accepted. The last partial
+        batch is padded with filler rows that are removed from the engine outputs
+        before postprocessing. Default is False (raise an error for such inputs)
+    :param reuse_output_buffers: if True, the outputs of the engine forward passes
+        for a request are joined into preallocated arrays from a pool of buffers
+        that are reused across requests instead of newly concatenated arrays.
+        Buffers are returned to the pool once postprocessing finishes, so
+        `process_engine_outputs` must not return views of the engine outputs and
+        loggers must not hold on to the logged engine outputs. Default is False
+    :param result_cache: optional `ResultCacheConfig` (or dict of its fields)
+        to enable a cache of the pipeline outputs keyed by the contents of the
+        parsed inputs. Cached requests skip preprocessing, the engine, and
+        postprocessing entirely. Pipelines that implement `cache_batch_fields`
+        cache each item of a batched request separately, so that only the items
+        missing from the cache are run. Inputs given as file paths are keyed
+        by the path rather than the file contents. Default is None (no caching)
     """
 
     def __init__(
@@ -155,6 +219,10 @@ class Pipeline(ABC):
         context: Optional[Context] = None,
         executor: Optional[Union[ThreadPoolExecutor, int]] = None,
         logger: Optional[Union[BaseLogger, str]] = None,
+        max_batch_wait_ms: Optional[float] = None,
+        pad_remainder_batches: bool = False,
+        reuse_output_buffers: bool = False,
+        result_cache: Optional[Union["ResultCacheConfig", Dict[str, Any]]] = None,
         _delay_engine_initialize: bool = False,  # internal use only
     ):
         self._model_path_orig = model_path
@@ -162,6 +230,19 @@ class Pipeline(ABC):
         self._engine_type = engine_type
         self._batch_size = batch_size
         self._alias = alias
+        self._pad_remainder_batches = pad_remainder_batches
+        self._latency_profiler = LatencyProfiler()
+        self._output_buffer_pool = ArrayBufferPool() if reuse_output_buffers else None
+        if isinstance(result_cache, dict):
+            result_cache = ResultCacheConfig(**result_cache)
+        self._result_cache_config = result_cache
+        self._result_cache = (
+            LRUCache(
+                max_size=result_cache.max_size, ttl_seconds=result_cache.ttl_seconds
+            )
+            if result_cache is not None
+            else None
+        )
         self.context = context
         self.logger = (
             logger
@@ -204,7 +285,16 @@ class Pipeline(ABC):
         else:
             self.engine = self._initialize_engine()
 
+        if max_batch_wait_ms is not None and batch_size is None:
+            raise ValueError(
+                "max_batch_wait_ms is not supported in dynamic batch mode, "
+                "a static batch_size must be set to batch concurrent requests"
+            )
+        self._max_batch_wait_ms = max_batch_wait_ms
         self._batch_size = self._batch_size or 1
+        # created on first use, and again after `close`
+        self._engine_batcher: Optional[_EngineInputsBatcher] = None
+        self._engine_batcher_lock = threading.Lock()
 
         self.log(
             identifier=f"{SystemGroups.INFERENCE_DETAILS}/num_cores_total",
@@ -213,14 +303,414 @@ class Pipeline(ABC):
         )
 
     def __call__(self, *args, **kwargs) -> BaseModel:
+        if self._result_cache is None or "engine_inputs" in kwargs:
+            return self._run(*args, **kwargs)
+
+        lookup = self._lookup_result_cache(*args, **kwargs)
+        miss_outputs = (
+            self._run(lookup.miss_inputs) if lookup.miss_inputs is not None else None
+        )
+        return self._finish_result_cache_lookup(lookup, miss_outputs)
+
+    def _run(self, *args, **kwargs) -> BaseModel:
+        timer = Timer()
+
+        timer.start(InferencePhases.TOTAL_INFERENCE)
+        engine_inputs, postprocess_kwargs = self._run_pre_process(
+            timer, *args, **kwargs
+        )
+        engine_outputs = self._run_engine_forward(timer, engine_inputs)
+        return self._run_post_process(timer, engine_outputs, postprocess_kwargs)
+
+    async def run_async(self, *args, **kwargs) -> BaseModel:
+        """
+        Awaitable version of `Pipeline.__call__` for use within an asyncio event
+        loop. Pre-processing, the engine forward passes, and post-processing are
+        all offloaded to the pipeline's executor, so the event loop is never
+        blocked and the number of threads doing pipeline work is bounded by the
+        executor's workers, no matter how many requests are awaited concurrently.
+
+        Example:
+        ```python
+        outputs = await asyncio.gather(
+            *(pipeline.run_async(sequences=seq) for seq in sequences)
+        )
+        ```
+
+        :param args: ordered arguments to the pipeline, see `parse_inputs`
+        :param kwargs: keyword arguments to the pipeline, see `parse_inputs`
+        :return: pipeline outputs in the `output_schema` format
+        """
+        if self._result_cache is None or "engine_inputs" in kwargs:
+            return await self._run_async(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        lookup = await loop.run_in_executor(
+            self.executor,
+            functools.partial(self._lookup_result_cache, *args, **kwargs),
+        )
+        miss_outputs = (
+            await self._run_async(lookup.miss_inputs)
+            if lookup.miss_inputs is not None
+            else None
+        )
+        return self._finish_result_cache_lookup(lookup, miss_outputs)
+
+    async def _run_async(self, *args, **kwargs) -> BaseModel:
+        loop = asyncio.get_running_loop()
+        timer = Timer()
+
+        timer.start(InferencePhases.TOTAL_INFERENCE)
+        engine_inputs, postprocess_kwargs = await loop.run_in_executor(
+            self.executor,
+            functools.partial(self._run_pre_process, timer, *args, **kwargs),
+        )
+
+        batch_futures = self._submit_engine_forward(timer, engine_inputs)
+        batch_outputs = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in batch_futures)
+        )
+
+        def _join_and_post_process():
+            engine_outputs = self._finish_engine_forward(
+                timer, engine_inputs, list(batch_outputs)
+            )
+            return self._run_post_process(timer, engine_outputs, postprocess_kwargs)
+
+        return await loop.run_in_executor(self.executor, _join_and_post_process)
+
+    def run_stream(
+        self,
+        inputs: Iterable[Union[BaseModel, Dict[str, Any]]],
+        prefetch: int = 2,
+    ) -> Generator[BaseModel, None, None]:
+        """
+        Runs the pipeline over a stream of inputs, overlapping the pre-processing,
+        engine forward pass, and post-processing of consecutive inputs.
+        Pre-processing and the engine forward pass each run in their own
+        background thread, post-processing runs in the consuming thread.
+        Stages are connected by bounded queues of size `prefetch` and outputs
+        are yielded in the same order as the inputs.
+
+        Example:
+        ```python
+        for output in pipeline.run_stream(input_schema_objects, prefetch=4):
+            ...
+        ```
+
+        :param inputs: iterable of pipeline inputs. Each item may be an instance
+            of the `input_schema` or a dictionary of keyword arguments used
+            to construct one
+        :param prefetch: maximum number of inputs buffered between two consecutive
+            stages. Default is 2
+        :return: generator of pipeline outputs in the `output_schema` format
+        """
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be a positive integer, got {prefetch}")
+
+        stop = threading.Event()
+        engine_queue = queue.Queue(maxsize=prefetch)
+        post_process_queue = queue.Queue(maxsize=prefetch)
+
+        def _pre_process_stage():
+            try:
+                for item in inputs:
+                    timer = Timer()
+                    timer.start(InferencePhases.TOTAL_INFERENCE)
+                    if isinstance(item, dict):
+                        processed = self._run_pre_process(timer, **item)
+                    else:
+                        processed = self._run_pre_process(timer, item)
+                    if not _put_unless_stopped(
+                        engine_queue, (timer, processed, None), stop
+                    ):
+                        return
+            except Exception as err:
+                _put_unless_stopped(engine_queue, (None, None, err), stop)
+                return
+            _put_unless_stopped(engine_queue, _END_OF_STREAM, stop)
+
+        def _engine_forward_stage():
+            while True:
+                item = _get_unless_stopped(engine_queue, stop)
+                if item is None:
+                    return
+                if item is _END_OF_STREAM or item[2] is not None:
+                    _put_unless_stopped(post_process_queue, item, stop)
+                    return
+                timer, (engine_inputs, postprocess_kwargs), _ = item
+                try:
+                    engine_outputs = self._run_engine_forward(timer, engine_inputs)
+                except Exception as err:
+                    _put_unless_stopped(post_process_queue, (None, None, err), stop)
+                    return
+                if not _put_unless_stopped(
+                    post_process_queue,
+                    (timer, (engine_outputs, postprocess_kwargs), None),
+                    stop,
+                ):
+                    return
+
+        stages = [
+            threading.Thread(target=_pre_process_stage, daemon=True),
+            threading.Thread(target=_engine_forward_stage, daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        try:
+            while True:
+                item = post_process_queue.get()
+                if item is _END_OF_STREAM:
+                    return
+                timer, processed, err = item
+                if err is not None:
+                    raise err
+                engine_outputs, postprocess_kwargs = processed
+                yield self._run_post_process(timer, engine_outputs, postprocess_kwargs)
+        finally:
+            # unblock the background stages if the consumer stops early
+            stop.set()
+
+    def run_batch(
+        self, inputs: List[Union[BaseModel, Dict[str, Any]]]
+    ) -> List[Union[BaseModel, Exception]]:
+        """
+        Runs the pipeline over a list of independent inputs, merging their engine
+        inputs into as few engine batches of size `batch_size` as possible.
+        Each input is pre-processed and post-processed on its own, so an input
+        that fails to run does not fail the others
+
+        Example:
+        ```python
+        for result in pipeline.run_batch(input_schema_objects):
+            if isinstance(result, Exception):
+                ...
+        ```
+
+        :param inputs: list of pipeline inputs. Each item may be an instance
+            of the `input_schema` or a dictionary of keyword arguments used
+            to construct one
+        :return: list with, for each input, its outputs in the `output_schema`
+            format or the exception raised while running it
+        """
+        results: List[Union[BaseModel, Exception, None]] = [None] * len(inputs)
+        processed = {}  # input index -> (timer, engine inputs, postprocess kwargs)
+        groups: Dict[Tuple, List[int]] = {}  # engine inputs signature -> indices
+
+        for index, item in enumerate(inputs):
+            timer = Timer()
+            timer.start(InferencePhases.TOTAL_INFERENCE)
+            try:
+                if isinstance(item, dict):
+                    engine_inputs, postprocess_kwargs = self._run_pre_process(
+                        timer, **item
+                    )
+                else:
+                    engine_inputs, postprocess_kwargs = self._run_pre_process(
+                        timer, item
+                    )
+            except Exception as err:
+                results[index] = err
+                continue
+            processed[index] = (timer, engine_inputs, postprocess_kwargs)
+            # only engine inputs of matching shapes and dtypes can be merged
+            signature = tuple(
+                (array.shape[1:], array.dtype.str) for array in engine_inputs
+            )
+            groups.setdefault(signature, []).append(index)
+
+        for indices in groups.values():
+            # merge the longest run of inputs that fills whole batches,
+            # the remaining inputs run on their own
+            num_rows = numpy.cumsum(
+                [processed[index][1][0].shape[0] for index in indices]
+            )
+            num_merged = len(indices)
+            while num_merged > 1 and not self._can_run_batch_size(
+                int(num_rows[num_merged - 1])
+            ):
+                num_merged -= 1
+            runs = [indices[:num_merged]] + [[index] for index in indices[num_merged:]]
+
+            for run in runs:
+                run_results = self._run_merged_engine_forward(
+                    [processed[index] for index in run]
+                )
+                for index, result in zip(run, run_results):
+                    results[index] = result
+
+        return results
+
+    def _run_merged_engine_forward(
+        self, items: List[Tuple[Timer, List[numpy.ndarray], Dict[str, Any]]]
+    ) -> List[Union[BaseModel, Exception]]:
+        # runs the engine forward pass of the concatenated engine inputs of
+        # the given pre-processed items, then post-processes each item
+        if len(items) == 1:
+            merged_inputs = items[0][1]
+        else:
+            merged_inputs = [
+                numpy.concatenate(arrays)
+                for arrays in zip(*(engine_inputs for _, engine_inputs, _ in items))
+            ]
+
+        merged_timer = Timer()
+        for timer, _, _ in items:
+            timer.start(InferencePhases.ENGINE_FORWARD)
+        try:
+            batch_futures = self._submit_engine_forward(merged_timer, merged_inputs)
+            batch_outputs = [future.result() for future in batch_futures]
+            engine_outputs = self._finish_engine_forward(
+                merged_timer, merged_inputs, batch_outputs
+            )
+        except Exception as err:
+            return [err] * len(items)
+        for timer, _, _ in items:
+            timer.stop(InferencePhases.ENGINE_FORWARD)
+
+        if len(items) == 1:
+            item_outputs = [engine_outputs]
+        else:
+            item_outputs = []
+            start = 0
+            for _, engine_inputs, _ in items:
+                end = start + engine_inputs[0].shape[0]
+                item_outputs.append(
+                    [
+                        # pooled buffers are released after each post-process,
+                        # so items can not keep views into the shared outputs
+                        output[start:end].copy()
+                        if self._output_buffer_pool is not None
+                        else output[start:end]
+                        for output in engine_outputs
+                    ]
+                )
+                start = end
+            if self._output_buffer_pool is not None:
+                for output in engine_outputs:
+                    self._output_buffer_pool.release(output)
+
+        results = []
+        for (timer, _, postprocess_kwargs), outputs in zip(items, item_outputs):
+            try:
+                results.append(
+                    self._run_post_process(timer, outputs, postprocess_kwargs)
+                )
+            except Exception as err:
+                results.append(err)
+        return results
+
+    def cache_batch_fields(self) -> Optional[Tuple[str, List[str]]]:
+        """
+        Optional extension point for pipelines with a result cache. Pipelines
+        whose input schema holds a batch of items in a single list field, and
+        whose output schema holds one value per item in list fields, may return
+        the names of these fields so that each item is cached separately
+
+        :return: tuple of the name of the batched `input_schema` field and the
+            names of the batched `output_schema` fields, or None if requests
+            should be cached as a whole. Default is None
+        """
+        return None
+
+    def _lookup_result_cache(self, *args, **kwargs) -> "_ResultCacheLookup":
+        pipeline_inputs = self.parse_inputs(*args, **kwargs)
+        batch_fields = self.cache_batch_fields()
+        batch_items = (
+            getattr(pipeline_inputs, batch_fields[0], None) if batch_fields else None
+        )
+        if isinstance(batch_items, list) and len(batch_items) > 1:
+            input_field = batch_fields[0]
+            items = [
+                pipeline_inputs.copy(update={input_field: [item]})
+                for item in batch_items
+            ]
+        else:
+            batch_items = None
+            items = [pipeline_inputs]
+
+        keys = [hash_inputs(item) for item in items]
+        outputs = [
+            self._result_cache.get(key) if key is not None else None for key in keys
+        ]
+        miss_indices = [idx for idx, output in enumerate(outputs) if output is None]
+
+        self.log(
+            identifier=f"{SystemGroups.INFERENCE_DETAILS}/result_cache_hits",
+            value=len(items) - len(miss_indices),
+            category=MetricCategories.SYSTEM,
+        )
+        self.log(
+            identifier=f"{SystemGroups.INFERENCE_DETAILS}/result_cache_misses",
+            value=len(miss_indices),
+            category=MetricCategories.SYSTEM,
+        )
+
+        if not miss_indices:
+            miss_inputs = None
+        elif len(miss_indices) == len(items) or not self._can_run_batch_size(
+            len(miss_indices)
+        ):
+            # run the full request if the missing items alone can not be run
+            miss_inputs = pipeline_inputs
+            miss_indices = list(range(len(items)))
+        else:
+            miss_inputs = pipeline_inputs.copy(
+                update={batch_fields[0]: [batch_items[idx] for idx in miss_indices]}
+            )
+
+        return _ResultCacheLookup(
+            keys=keys,
+            outputs=outputs,
+            miss_indices=miss_indices,
+            miss_inputs=miss_inputs,
+            output_fields=batch_fields[1] if batch_items is not None else None,
+        )
+
+    def _finish_result_cache_lookup(
+        self, lookup: "_ResultCacheLookup", miss_outputs: Optional[BaseModel]
+    ) -> BaseModel:
+        if miss_outputs is not None:
+            if lookup.output_fields is None:
+                miss_item_outputs = [miss_outputs]
+            else:
+                miss_item_outputs = _split_batched_fields(
+                    miss_outputs, lookup.output_fields, len(lookup.miss_indices)
+                )
+            for idx, output in zip(lookup.miss_indices, miss_item_outputs):
+                lookup.outputs[idx] = output
+                if lookup.keys[idx] is not None:
+                    self._result_cache.put(lookup.keys[idx], output.copy(deep=True))
+            if len(lookup.miss_indices) == len(lookup.outputs):
+                return miss_outputs
+
+        # copy cached outputs so that callers can not modify the cache
+        outputs = [output.copy(deep=True) for output in lookup.outputs]
+        if lookup.output_fields is None:
+            return outputs[0]
+        return outputs[0].copy(
+            update={
+                field: [value for output in outputs for value in getattr(output, field)]
+                for field in lookup.output_fields
+            }
+        )
+
+    def _can_run_batch_size(self, num_items: int) -> bool:
+        return (
+            num_items % self._batch_size == 0
+            or self._pad_remainder_batches
+            or self._max_batch_wait_ms is not None
+        )
+
+    def _run_pre_process(
+        self, timer: Timer, *args, **kwargs
+    ) -> Tuple[List[numpy.ndarray], Dict[str, Any]]:
         if "engine_inputs" in kwargs:
             raise ValueError(
                 "invalid kwarg engine_inputs. engine inputs determined "
                 f"by {self.__class__.__qualname__}.parse_inputs"
             )
-        timer = Timer()
-
-        timer.start(InferencePhases.TOTAL_INFERENCE)
 
         # ------ PREPROCESSING ------
         timer.start(InferencePhases.PRE_PROCESS)
@@ -256,17 +746,52 @@ class Pipeline(ABC):
             value=timer.time_delta(InferencePhases.PRE_PROCESS),
             category=MetricCategories.SYSTEM,
         )
+        return engine_inputs, postprocess_kwargs
+
+    def _run_engine_forward(
+        self, timer: Timer, engine_inputs: List[numpy.ndarray]
+    ) -> List[numpy.ndarray]:
+        batch_futures = self._submit_engine_forward(timer, engine_inputs)
+        batch_outputs = [future.result() for future in batch_futures]
+        return self._finish_engine_forward(timer, engine_inputs, batch_outputs)
 
+    def _submit_engine_forward(
+        self, timer: Timer, engine_inputs: List[numpy.ndarray]
+    ) -> List[Future]:
         # ------ INFERENCE ------
-        # split inputs into batches of size `self._batch_size`
         timer.start(InferencePhases.ENGINE_FORWARD)
-        batches = self.split_engine_inputs(engine_inputs, self._batch_size)
+        if self._max_batch_wait_ms is not None:
+            # queue inputs to be merged with concurrent requests into
+            # shared batches of size `self._batch_size`
+            return self._get_engine_batcher().submit(engine_inputs)
+
+        # split inputs into batches of size `self._batch_size`
+        batches = self.split_engine_inputs(
+            engine_inputs,
+            self._batch_size,
+            pad_remainder=self._pad_remainder_batches,
+        )
 
         # submit split batches to engine threadpool
-        batch_outputs = list(self.executor.map(self.engine_forward, batches))
+        return [self.executor.submit(self.engine_forward, batch) for batch in batches]
 
+    def _finish_engine_forward(
+        self,
+        timer: Timer,
+        engine_inputs: List[numpy.ndarray],
+        batch_outputs: List[List[numpy.ndarray]],
+    ) -> List[numpy.ndarray]:
         # join together the batches of size `self._batch_size`
-        engine_outputs = self.join_engine_outputs(batch_outputs)
+        input_batch_size = engine_inputs[0].shape[0]
+        if self._max_batch_wait_ms is None and input_batch_size % self._batch_size:
+            # slice off the rows used to pad the last batch
+            engine_outputs = self.join_engine_outputs(
+                batch_outputs, input_batch_size, buffer_pool=self._output_buffer_pool
+            )
+        else:
+            engine_outputs = self.join_engine_outputs(
+                batch_outputs, buffer_pool=self._output_buffer_pool
+            )
         timer.stop(InferencePhases.ENGINE_FORWARD)
 
         self.log(
@@ -289,12 +814,25 @@ class Pipeline(ABC):
             value=timer.time_delta(InferencePhases.ENGINE_FORWARD),
             category=MetricCategories.SYSTEM,
         )
+        return engine_outputs
 
+    def _run_post_process(
+        self,
+        timer: Timer,
+        engine_outputs: List[numpy.ndarray],
+        postprocess_kwargs: Dict[str, Any],
+    ) -> BaseModel:
         # ------ POSTPROCESSING ------
         timer.start(InferencePhases.POST_PROCESS)
-        pipeline_outputs = self.process_engine_outputs(
-            engine_outputs, **postprocess_kwargs
-        )
+        try:
+            pipeline_outputs = self.process_engine_outputs(
+                engine_outputs, **postprocess_kwargs
+            )
+        finally:
+            if self._output_buffer_pool is not None:
+                # engine outputs are no longer used, buffers may be reused
+                for output in engine_outputs:
+                    self._output_buffer_pool.release(output)
         if not isinstance(pipeline_outputs, self.output_schema):
             raise ValueError(
                 f"Outputs of {self.__class__} must be instances of "
@@ -302,6 +840,7 @@ class Pipeline(ABC):
             )
         timer.stop(InferencePhases.POST_PROCESS)
         timer.stop(InferencePhases.TOTAL_INFERENCE)
+        self._latency_profiler.record_timer(timer, _PROFILED_PHASES)
 
         self.log(
             identifier="pipeline_outputs",
@@ -323,7 +862,7 @@ class Pipeline(ABC):
 
     @staticmethod
     def split_engine_inputs(
-        items: List[numpy.ndarray], batch_size: int
+        items: List[numpy.ndarray], batch_size: int, pad_remainder: bool = False
     ) -> List[List[numpy.ndarray]]:
         """
         Splits each item into numpy arrays with the first dimension == `batch_size`.
@@ -353,6 +892,22 @@ class Pipeline(ABC):
             [(1, 32, 32), (1, 64, 64), (1, 128, 128)],
         ]
         ```
+
+        Then with `batch_size==3` and `pad_remainder=True` the output would be
+        (where the last batch is one input row followed by two rows of zeros):
+        ```
+        [
+            [(3, 32, 32), (3, 64, 64), (3, 128, 128)],
+            [(3, 32, 32), (3, 64, 64), (3, 128, 128)],
+        ]
+        ```
+
+        :param items: list of numpy arrays with the same first dimension
+        :param batch_size: batch size to split the items into
+        :param pad_remainder: if True, a total batch size that is not divisible
+            by `batch_size` pads the last batch with zeros instead of raising
+            an error. Default is False
+        :return: list of batches, each batch a list of arrays of `batch_size` rows
         """
         # if not all items here are numpy arrays, there's an internal
         # but in the processing code
@@ -363,28 +918,55 @@ class Pipeline(ABC):
         total_batch_size = items[0].shape[0]
         assert all(item.shape[0] == total_batch_size for item in items)
 
-        if total_batch_size % batch_size != 0:
+        if total_batch_size % batch_size != 0 and not pad_remainder:
             raise RuntimeError(
                 f"batch size of {total_batch_size} passed into pipeline "
                 f"is not divisible by model batch size of {batch_size}"
             )
 
         batches = []
-        for i_batch in range(total_batch_size // batch_size):
-            start = i_batch * batch_size
-            batches.append([item[start : start + batch_size] for item in items])
+        for start in range(0, total_batch_size, batch_size):
+            batches.append(
+                [
+                    _pad_to_batch_size(item[start : start + batch_size], batch_size)
+                    for item in items
+                ]
+            )
         return batches
 
     @staticmethod
     def join_engine_outputs(
         batch_outputs: List[List[numpy.ndarray]],
+        orig_batch_size: Optional[int] = None,
+        buffer_pool: Optional[ArrayBufferPool] = None,
     ) -> List[numpy.ndarray]:
         """
         Joins list of engine outputs together into one list using `numpy.concatenate`.
 
         This is the opposite of `Pipeline.split_engine_inputs`.
+
+        :param batch_outputs: list of engine outputs for each batch
+        :param orig_batch_size: optional total batch size of the inputs before
+            the last batch was padded by `split_engine_inputs`. If provided, the
+            padded rows are sliced off of the joined outputs
+        :param buffer_pool: optional pool of reusable arrays. If provided, the
+            batch outputs are copied into arrays acquired from the pool instead
+            of newly allocated ones. The caller is responsible for releasing them
+        :return: list of joined engine outputs
         """
-        return list(map(numpy.concatenate, zip(*batch_outputs)))
+        if len(batch_outputs) == 1:
+            # nothing to join, avoid copying the outputs
+            engine_outputs = list(batch_outputs[0])
+        elif buffer_pool is not None:
+            engine_outputs = [
+                _concatenate_into_buffer(outputs, buffer_pool)
+                for outputs in zip(*batch_outputs)
+            ]
+        else:
+            engine_outputs = list(map(numpy.concatenate, zip(*batch_outputs)))
+        if orig_batch_size is not None:
+            engine_outputs = [output[:orig_batch_size] for output in engine_outputs]
+        return engine_outputs
 
     @staticmethod
     def _get_task_constructor(task: str) -> Type["Pipeline"]:
@@ -606,6 +1188,7 @@ class Pipeline(ABC):
             alias=config.alias,
             context=context,
             logger=logger,
+            result_cache=config.result_cache,
             **config.kwargs,
         )
 
@@ -704,6 +1287,52 @@ class Pipeline(ABC):
         """
         return self._engine_type
 
+    @property
+    def batch_size(self) -> int:
+        """
+        :return: batch size of the engine forward passes, 1 in dynamic batch mode
+        """
+        return self._batch_size or 1
+
+    @property
+    def pad_remainder_batches(self) -> bool:
+        """
+        :return: True if partial engine batches are padded to the engine batch
+            size, False if inputs must be divisible by the engine batch size
+        """
+        return self._pad_remainder_batches
+
+    @property
+    def max_batch_wait_ms(self) -> Optional[float]:
+        """
+        :return: maximum time in milliseconds to wait for concurrent requests
+            to fill an engine batch. None if requests are not batched together
+        """
+        return self._max_batch_wait_ms
+
+    @property
+    def reuse_output_buffers(self) -> bool:
+        """
+        :return: True if engine outputs are joined into reusable pooled buffers
+        """
+        return self._output_buffer_pool is not None
+
+    @property
+    def latency_profiler(self) -> LatencyProfiler:
+        """
+        :return: profiler accumulating the latencies of the pre_process,
+            engine_forward, post_process, and total_inference phases across calls
+            to this pipeline. Use `latency_profiler.summary()` for percentiles
+        """
+        return self._latency_profiler
+
+    @property
+    def result_cache(self) -> Optional[LRUCache]:
+        """
+        :return: cache of pipeline outputs, None if result caching is disabled
+        """
+        return self._result_cache
+
     def to_config(self) -> "PipelineConfig":
         """
         :return: PipelineConfig that can be used to reload this object
@@ -732,6 +1361,7 @@ class Pipeline(ABC):
             scheduler=self.scheduler,
             input_shapes=self.input_shapes,
             alias=self.alias,
+            result_cache=self._result_cache_config,
             kwargs=kwargs,
         )
 
@@ -753,6 +1383,9 @@ class Pipeline(ABC):
 
         identifier = f"{self._identifier()}/{identifier}"
         validate_identifier(identifier)
+        if not self.logger.is_subscribed(identifier):
+            # no logger would log the value, skip dispatching it
+            return
         self.logger.log(
             identifier=identifier,
             value=value,
@@ -783,6 +1416,17 @@ class Pipeline(ABC):
 
         return self.input_schema(**kwargs)
 
+    def inputs_from_files(self, files: Iterable[BinaryIO]) -> BaseModel:
+        """
+        Creates the inputs of the pipeline from uploaded files, using the
+        `from_files` factory method of the `input_schema`. Pipelines may override
+        it to decode the files straight into their engine input format
+
+        :param files: file objects of the uploaded files
+        :return: pipeline inputs in the `input_schema` format
+        """
+        return self.input_schema.from_files(files, from_server=True)
+
     def engine_forward(self, engine_inputs: List[numpy.ndarray]) -> List[numpy.ndarray]:
         """
         :param engine_inputs: list of numpy inputs to Pipeline engine forward
@@ -791,6 +1435,52 @@ class Pipeline(ABC):
         """
         return self.engine(engine_inputs)
 
+    def warmup(
+        self, num_iterations: int = 1, sample_input: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Runs inferences to pay the first run costs of the pipeline (such as
+        engine initialization and lazily loaded processing resources) before
+        serving requests. The recorded latencies are reset afterwards
+
+        :param num_iterations: number of inferences to run. Default is 1
+        :param sample_input: optional keyword arguments of a sample input to run
+            end to end through the pipeline. Default is None, running the engine
+            only, on random inputs matching the model inputs
+        """
+        if sample_input is not None:
+            for _ in range(num_iterations):
+                self(**sample_input)
+        else:
+            engine_inputs = generate_random_inputs(self.onnx_file_path, self.batch_size)
+            for _ in range(num_iterations):
+                self.engine_forward(engine_inputs)
+        self.latency_profiler.reset()
+
+    def close(self):
+        """
+        Stops the background thread batching concurrent requests, if any, and
+        releases the engine, so that the memory of a pipeline that is no longer
+        served is freed. To run the pipeline again, its engine must be
+        re-initialized
+        """
+        with self._engine_batcher_lock:
+            engine_batcher, self._engine_batcher = self._engine_batcher, None
+        if engine_batcher is not None:
+            engine_batcher.close()
+        self.engine = None
+
+    def _get_engine_batcher(self) -> "_EngineInputsBatcher":
+        with self._engine_batcher_lock:
+            if self._engine_batcher is None:
+                self._engine_batcher = _EngineInputsBatcher(
+                    engine_forward=self.engine_forward,
+                    batch_size=self._batch_size,
+                    max_wait_seconds=self._max_batch_wait_ms / 1000,
+                    executor=self.executor,
+                )
+            return self._engine_batcher
+
     def _initialize_engine(self) -> Union[Engine, ORTEngine]:
         engine_type = self.engine_type.lower()
 
@@ -819,6 +1509,28 @@ class Pipeline(ABC):
         return f"{self.alias or self.task or 'unknown_pipeline'}"
 
 
+class ResultCacheConfig(BaseModel):
+    """
+    Configuration for the cache of pipeline outputs enabled with the
+    `result_cache` argument of a Pipeline
+    """
+
+    max_size: int = Field(
+        default=1024,
+        description=(
+            "maximum number of cached outputs (or batch items), the least recently "
+            "used entry is evicted once the cache is full. Default is 1024"
+        ),
+    )
+    ttl_seconds: Optional[float] = Field(
+        default=None,
+        description=(
+            "optional number of seconds after which a cached output expires. "
+            "Default is None (outputs expire only once evicted)"
+        ),
+    )
+
+
 class PipelineConfig(BaseModel):
     """
     Configuration for creating a Pipeline object
@@ -872,6 +1584,13 @@ class PipelineConfig(BaseModel):
             "with multiple models. Default is None"
         ),
     )
+    result_cache: Optional[ResultCacheConfig] = Field(
+        default=None,
+        description=(
+            "optional configuration of a cache of pipeline outputs for repeated "
+            "inputs. Default is None (no caching)"
+        ),
+    )
     kwargs: Dict[str, Any] = Field(
         default={},
         description=(
@@ -902,6 +1621,90 @@ class BucketingPipeline(object):
         bucket, parsed_inputs = self._choose_bucket(*args, **kwargs)
         return bucket(parsed_inputs)
 
+    async def run_async(self, *args, **kwargs) -> BaseModel:
+        """
+        Awaitable version of `BucketingPipeline.__call__`, the input is routed to
+        its bucket on the executor of the pipelines, then run with the
+        `run_async` of the bucket
+
+        :param args: ordered arguments to the pipeline, see `parse_inputs`
+        :param kwargs: keyword arguments to the pipeline, see `parse_inputs`
+        :return: pipeline outputs in the `output_schema` format
+        """
+        loop = asyncio.get_running_loop()
+        bucket, parsed_inputs = await loop.run_in_executor(
+            self.executor,
+            functools.partial(self._choose_bucket, *args, **kwargs),
+        )
+        return await bucket.run_async(parsed_inputs)
+
+    def run_batch(
+        self, inputs: List[Union[BaseModel, Dict[str, Any]]]
+    ) -> List[Union[BaseModel, Exception]]:
+        """
+        Routes each input to its bucket, then runs the inputs of each bucket
+        with the `run_batch` of the bucket. An input that fails to be routed
+        or to run does not fail the others
+
+        :param inputs: list of pipeline inputs. Each item may be an instance
+            of the `input_schema` or a dictionary of keyword arguments used
+            to construct one
+        :return: list with, for each input, its outputs in the `output_schema`
+            format or the exception raised while running it
+        """
+        results: List[Union[BaseModel, Exception, None]] = [None] * len(inputs)
+        bucket_inputs: Dict[int, List[Tuple[int, BaseModel]]] = {}
+        for index, item in enumerate(inputs):
+            try:
+                if isinstance(item, dict):
+                    bucket, parsed_inputs = self._choose_bucket(**item)
+                else:
+                    bucket, parsed_inputs = self._choose_bucket(item)
+            except Exception as err:
+                results[index] = err
+                continue
+            bucket_index = self._pipelines.index(bucket)
+            bucket_inputs.setdefault(bucket_index, []).append((index, parsed_inputs))
+
+        for bucket_index, items in bucket_inputs.items():
+            bucket_results = self._pipelines[bucket_index].run_batch(
+                [parsed_inputs for _, parsed_inputs in items]
+            )
+            for (index, _), result in zip(items, bucket_results):
+                results[index] = result
+        return results
+
+    def inputs_from_files(self, files: Iterable[BinaryIO]) -> BaseModel:
+        """
+        :param files: file objects of the uploaded files
+        :return: pipeline inputs in the `input_schema` format, left for the
+            chosen bucket to process
+        """
+        return self.input_schema.from_files(files, from_server=True)
+
+    def warmup(
+        self, num_iterations: int = 1, sample_input: Optional[Dict[str, Any]] = None
+    ):
+        """
+        :param num_iterations: number of inferences to run. Default is 1
+        :param sample_input: optional keyword arguments of a sample input to run
+            end to end through the bucket it is routed to. Default is None,
+            running the engine of every bucket on random inputs
+        """
+        if sample_input is not None:
+            bucket, _ = self._choose_bucket(**sample_input)
+            bucket.warmup(num_iterations, sample_input)
+            return
+        for pipeline in self._pipelines:
+            pipeline.warmup(num_iterations)
+
+    def close(self):
+        """
+        Closes the pipelines of every bucket
+        """
+        for pipeline in self._pipelines:
+            pipeline.close()
+
     def _choose_bucket(self, *args, **kwargs):
         parsed_inputs = self._pipelines[-1].parse_inputs(*args, **kwargs)
         bucket = self._pipeline_class.route_input_to_bucket(
@@ -921,6 +1724,30 @@ class BucketingPipeline(object):
             f"and is not a property of {self._pipeline_class.__name__}"
         )
 
+    @property
+    def logger(self) -> Optional[BaseLogger]:
+        """
+        :return: the logger of the buckets, which share the same logger
+        """
+        return self._pipelines[0].logger
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        :return: the executor of the buckets, which share the same executor
+        """
+        return self._pipelines[0].executor
+
+    @property
+    def latency_profiler(self) -> MergedLatencyProfiler:
+        """
+        :return: profiler merging the latencies of the phases of the calls to
+            every bucket, resetting it resets the profilers of every bucket
+        """
+        return MergedLatencyProfiler(
+            [pipeline.latency_profiler for pipeline in self._pipelines]
+        )
+
     @property
     def input_schema(self) -> Type[BaseModel]:
         """
@@ -988,6 +1815,236 @@ class Bucketable(ABC):
         pass
 
 
+class _EngineInputsBatcher:
+    """
+    Queues the engine inputs of concurrent pipeline calls and merges them into
+    shared engine forward passes of the static engine batch size.
+
+    A background thread collects queued inputs until either the batch is full
+    or `max_wait_seconds` has passed since the first input of the batch was
+    dequeued. The merged batch is padded to the engine batch size if needed, run
+    on the executor, and the output rows are scattered back to each caller
+
+    :param engine_forward: function that runs a single engine forward pass
+    :param batch_size: static batch size of the engine
+    :param max_wait_seconds: maximum time to wait for a batch to fill up
+    :param executor: executor to run the merged engine forward passes on
+    """
+
+    def __init__(
+        self,
+        engine_forward: Callable[[List[numpy.ndarray]], List[numpy.ndarray]],
+        batch_size: int,
+        max_wait_seconds: float,
+        executor: ThreadPoolExecutor,
+    ):
+        self._engine_forward = engine_forward
+        self._batch_size = batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._executor = executor
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __call__(self, engine_inputs: List[numpy.ndarray]) -> List[List[numpy.ndarray]]:
+        """
+        :param engine_inputs: engine inputs of a single pipeline call, of any
+            total batch size
+        :return: list of engine outputs for consecutive chunks of the inputs
+            of at most the engine batch size, to be joined with
+            `Pipeline.join_engine_outputs`
+        """
+        return [future.result() for future in self.submit(engine_inputs)]
+
+    def submit(self, engine_inputs: List[numpy.ndarray]) -> List[Future]:
+        """
+        :param engine_inputs: engine inputs of a single pipeline call, of any
+            total batch size
+        :return: list of futures of the engine outputs for consecutive chunks
+            of the inputs of at most the engine batch size
+        """
+        futures = []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Unable to submit inputs, engine batcher was closed")
+            for start in range(0, _num_rows(engine_inputs), self._batch_size):
+                future = Future()
+                chunk = [
+                    item[start : start + self._batch_size] for item in engine_inputs
+                ]
+                self._queue.put((chunk, future))
+                futures.append(future)
+        return futures
+
+    def close(self):
+        """
+        Stops the background thread. The futures of inputs that were not yet
+        forwarded fail, and inputs submitted afterwards are rejected
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE_BATCHER)
+        self._thread.join()
+
+    def _run(self):
+        pending = None
+        while True:
+            first = pending or self._queue.get()
+            pending = None
+            if first is _CLOSE_BATCHER:
+                return
+            batch = [first]
+            try:
+                num_rows = _num_rows(first[0])
+                deadline = time.perf_counter() + self._max_wait_seconds
+
+                while num_rows < self._batch_size:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if item is _CLOSE_BATCHER:
+                        # closed while the batch was collected
+                        _fail_futures(batch, RuntimeError("Engine batcher was closed"))
+                        return
+                    if num_rows + _num_rows(item[0]) > self._batch_size:
+                        # does not fit, start the next batch with this item
+                        pending = item
+                        break
+                    batch.append(item)
+                    num_rows += _num_rows(item[0])
+
+                self._executor.submit(self._forward, batch, num_rows)
+            except Exception as err:
+                # fail the callers of this batch, the thread keeps serving others
+                _fail_futures(batch, err)
+
+    def _forward(self, batch: List[Tuple[List[numpy.ndarray], Future]], num_rows: int):
+        try:
+            engine_inputs = [
+                _pad_to_batch_size(numpy.concatenate(inputs), self._batch_size)
+                for inputs in zip(*(item for item, _ in batch))
+            ]
+            engine_outputs = self._engine_forward(engine_inputs)
+        except Exception as err:
+            _fail_futures(batch, err)
+            return
+
+        start = 0
+        for item, future in batch:
+            end = start + _num_rows(item)
+            # outputs without a leading batch dimension are shared by all callers
+            future.set_result(
+                [
+                    output[start:end] if output.shape[0] == self._batch_size else output
+                    for output in engine_outputs
+                ]
+            )
+            start = end
+
+
+def _fail_futures(batch: List[Tuple[Any, Future]], err: Exception):
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(err)
+
+
+def _put_unless_stopped(
+    stage_queue: queue.Queue, item: Any, stop: threading.Event
+) -> bool:
+    # blocking put that gives up once the stream consumer has stopped
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get_unless_stopped(stage_queue: queue.Queue, stop: threading.Event) -> Any:
+    # blocking get that returns None once the stream consumer has stopped
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _num_rows(engine_inputs: List[numpy.ndarray]) -> int:
+    return engine_inputs[0].shape[0]
+
+
+class _ResultCacheLookup(NamedTuple):
+    # cache keys and outputs of each item of a request, outputs are
+    # None for the items at `miss_indices` until `miss_inputs` are run
+    keys: List[Optional[str]]
+    outputs: List[Optional[BaseModel]]
+    miss_indices: List[int]
+    miss_inputs: Optional[BaseModel]
+    output_fields: Optional[List[str]]
+
+
+def _split_batched_fields(
+    outputs: BaseModel, fields: List[str], num_items: int
+) -> List[BaseModel]:
+    for field in fields:
+        if len(getattr(outputs, field)) != num_items:
+            raise RuntimeError(
+                f"Expected {num_items} values for batched output field {field} "
+                f"of {outputs.__class__}, found {len(getattr(outputs, field))}"
+            )
+    return [
+        outputs.copy(update={field: [getattr(outputs, field)[idx]] for field in fields})
+        for idx in range(num_items)
+    ]
+
+
+def _concatenate_into_buffer(
+    arrays: Tuple[numpy.ndarray, ...], buffer_pool: ArrayBufferPool
+) -> numpy.ndarray:
+    # equivalent to numpy.concatenate(arrays) writing into a pooled buffer
+    row_shape = arrays[0].shape[1:]
+    dtype = arrays[0].dtype
+    if any(array.shape[1:] != row_shape or array.dtype != dtype for array in arrays):
+        return numpy.concatenate(arrays)
+
+    total_rows = sum(array.shape[0] for array in arrays)
+    buffer = buffer_pool.acquire((total_rows,) + row_shape, dtype)
+    start = 0
+    for array in arrays:
+        buffer[start : start + array.shape[0]] = array
+        start += array.shape[0]
+    return buffer
+
+
+def _pad_to_batch_size(array: numpy.ndarray, batch_size: int) -> numpy.ndarray:
+    # fill a partial batch with rows of zeros up to the engine batch size
+    num_padding_rows = batch_size - array.shape[0]
+    if num_padding_rows <= 0:
+        return array
+    padding = _zeros_batch(batch_size, array.shape[1:], array.dtype)
+    return numpy.concatenate([array, padding[:num_padding_rows]])
+
+
+@functools.lru_cache(maxsize=64)
+def _zeros_batch(
+    batch_size: int, row_shape: Tuple[int, ...], dtype: numpy.dtype
+) -> numpy.ndarray:
+    # preallocated, read only padding buffer reused for each input shape
+    zeros = numpy.zeros((batch_size, *row_shape), dtype=dtype)
+    zeros.setflags(write=False)
+    return zeros
+
+
 def _initialize_executor_and_workers(
     batch_size: Optional[int],
     workers_or_executor: Optional[Union[int, ThreadPoolExecutor]],
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Iterable, List, TextIO, Union
+import io
+from typing import Any, Iterable, List, Optional, TextIO, Tuple, Union
 
 import numpy
 
@@ -24,13 +25,26 @@ try:
 except Exception as import_error:
     Image, pil_import_error = None, import_error
 
+try:
+    import cv2
+
+    cv2_import_error = None
+except Exception as import_error:
+    cv2, cv2_import_error = None, import_error
+
 from pydantic import BaseModel, Field
 
 
 __all__ = [
     "ComputerVisionSchema",
+    "decode_image",
+    "resize_and_center_crop",
 ]
 
+# reduced resolution decoding factors, JPEG images are decoded at these
+# scales directly from their DCT coefficients
+_REDUCED_DECODE_FACTORS = (8, 4, 2)
+
 
 class ComputerVisionSchema(BaseModel):
     """
@@ -66,3 +80,83 @@ class ComputerVisionSchema(BaseModel):
             )
         images = [numpy.asarray(Image.open(file)) for file in files]
         return cls(*args, images=images, **kwargs)
+
+
+def decode_image(
+    data: bytes, min_size: Optional[Tuple[int, int]] = None
+) -> numpy.ndarray:
+    """
+    Decodes an encoded image with OpenCV if installed, PIL otherwise
+
+    :param data: bytes of the encoded image, e.g. the contents of a JPEG file
+    :param min_size: optional (height, width) the decoded image is resized to
+        or beyond afterwards. Images at least twice as large in both dimensions
+        are decoded at a reduced resolution (1/2, 1/4 or 1/8) that still covers
+        `min_size`, which is several times faster for JPEG images.
+        Default is None (decodes at full resolution)
+    :return: decoded image as an RGB uint8 array of shape (height, width, 3)
+    """
+    if pil_import_error is not None:
+        raise ImportError(
+            "PIL is a requirement for decoding images,"
+            f" but was not found. Error:\n{pil_import_error}, "
+            "try `pip install Pillow`"
+        )
+    # PIL reads the header only, the pixels are decoded below
+    image = Image.open(io.BytesIO(data))
+    if cv2 is None:
+        if min_size is not None:
+            # configures the JPEG decoder to the smallest scale covering min_size
+            image.draft("RGB", (min_size[1], min_size[0]))
+        return numpy.asarray(image.convert("RGB"))
+
+    width, height = image.size
+    flags = cv2.IMREAD_COLOR
+    if min_size is not None:
+        for factor in _REDUCED_DECODE_FACTORS:
+            if height >= factor * min_size[0] and width >= factor * min_size[1]:
+                flags = getattr(cv2, f"IMREAD_REDUCED_COLOR_{factor}")
+                break
+    # orientation is ignored to match the images decoded by PIL
+    flags |= cv2.IMREAD_IGNORE_ORIENTATION
+    decoded = cv2.imdecode(numpy.frombuffer(data, dtype=numpy.uint8), flags)
+    if decoded is None:
+        raise ValueError("Unable to decode image")
+    return cv2.cvtColor(decoded, cv2.COLOR_BGR2RGB)
+
+
+def resize_and_center_crop(
+    image: numpy.ndarray,
+    resize_size: Tuple[int, int],
+    crop_size: Tuple[int, int],
+) -> numpy.ndarray:
+    """
+    Resizes an image with bilinear interpolation and crops its center,
+    as torchvision's `Resize` followed by `CenterCrop` do
+
+    :param image: RGB uint8 array of shape (height, width, 3)
+    :param resize_size: (height, width) to resize the image to
+    :param crop_size: (height, width) of the center crop of the resized image
+    :return: cropped RGB uint8 array of shape (*crop_size, 3)
+    """
+    resize_height, resize_width = resize_size
+    if image.shape[:2] != (resize_height, resize_width):
+        if cv2 is not None:
+            downscale = resize_height < image.shape[0] and resize_width < image.shape[1]
+            image = cv2.resize(
+                image,
+                (resize_width, resize_height),
+                # area interpolation averages the pixels like PIL's antialiasing
+                interpolation=cv2.INTER_AREA if downscale else cv2.INTER_LINEAR,
+            )
+        else:
+            image = numpy.asarray(
+                Image.fromarray(image).resize(
+                    (resize_width, resize_height), Image.BILINEAR
+                )
+            )
+
+    crop_height, crop_width = crop_size
+    top = int(round((resize_height - crop_height) / 2.0))
+    left = int(round((resize_width - crop_width) / 2.0))
+    return image[top : top + crop_height, left : left + crop_width]
@@ -0,0 +1,289 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Admission control of the requests to the DeepSparse Server endpoints
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+__all__ = ["AdmissionController", "PriorityScheduler"]
+
+
+class AdmissionController:
+    """
+    Async context manager that tracks and bounds the number of requests an
+    endpoint processes at once. Requests beyond `max_concurrent_requests` wait
+    (in arrival order) in a queue of at most `max_queued_requests`, and are
+    rejected immediately with an HTTPException once the queue is full,
+    so that an overloaded server sheds load instead of growing its latency
+
+    Example flow:
+
+    ```
+    admission = AdmissionController(max_concurrent_requests=4)
+
+    async def _predict(request):
+        async with admission:
+            return await pipeline.run_async(request)
+    ```
+
+    :param max_concurrent_requests: maximum number of admitted requests at once.
+        Default is None (all requests are admitted)
+    :param max_queued_requests: maximum number of requests waiting to be
+        admitted. Default is 0
+    :param overload_status_code: status code of the HTTPException raised for
+        rejected requests. Default is 503
+    :param scheduler: optional scheduler shared by the endpoints of a server,
+        admitted requests additionally wait for one of its slots before being
+        processed. Default is None
+    :param priority: priority of the requests of the endpoint in the scheduler,
+        higher values are served first. Default is 0
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: Optional[int] = None,
+        max_queued_requests: int = 0,
+        overload_status_code: int = 503,
+        scheduler: Optional["PriorityScheduler"] = None,
+        priority: int = 0,
+    ):
+        if max_concurrent_requests is not None and max_concurrent_requests < 1:
+            raise ValueError(
+                "max_concurrent_requests must be a positive integer, "
+                f"found {max_concurrent_requests}"
+            )
+        self._max_concurrent_requests = max_concurrent_requests
+        self._max_queued_requests = max_queued_requests
+        self._overload_status_code = overload_status_code
+        self._scheduler = scheduler
+        self._priority = priority
+
+        # requests may be served from multiple event loops (e.g. by a test
+        # client), so the state is guarded by a lock and waiters are woken
+        # up thread safely on their own loop
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._num_rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :return: number of currently admitted requests
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """
+        :return: number of requests waiting to be admitted
+        """
+        return len(self._waiters)
+
+    @property
+    def num_rejected(self) -> int:
+        """
+        :return: total number of rejected requests
+        """
+        return self._num_rejected
+
+    @property
+    def priority(self) -> int:
+        """
+        :return: priority of the requests of the endpoint in the scheduler
+        """
+        return self._priority
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    async def acquire(self):
+        """
+        Waits until the request is admitted. Every successful call must be
+        followed by a call to `release` once the request is processed
+
+        :raises HTTPException: if the request is rejected
+        """
+        await self._admit()
+        if self._scheduler is None:
+            return
+        try:
+            await self._scheduler.acquire(self._priority)
+        except BaseException:
+            self._release_admission()
+            raise
+
+    def release(self):
+        """
+        Releases the slot of an admitted request, admitting the longest
+        waiting request if any
+        """
+        if self._scheduler is not None:
+            self._scheduler.release()
+        self._release_admission()
+
+    async def _admit(self):
+        with self._lock:
+            if (
+                self._max_concurrent_requests is None
+                or self._in_flight < self._max_concurrent_requests
+            ):
+                self._in_flight += 1
+                return
+            if len(self._waiters) >= self._max_queued_requests:
+                self._num_rejected += 1
+                raise HTTPException(
+                    status_code=self._overload_status_code,
+                    detail="Endpoint is overloaded, retry later",
+                    headers={"Retry-After": "1"},
+                )
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # the slot was handed over before the cancellation, pass it on
+            self._release_admission()
+            raise
+
+    def _release_admission(self):
+        with self._lock:
+            if not self._waiters:
+                self._in_flight -= 1
+                return
+            # hand the slot over to the longest waiting request
+            waiter = self._waiters.popleft()
+        waiter.get_loop().call_soon_threadsafe(_wake_up, waiter)
+
+
+class PriorityScheduler:
+    """
+    Bounds the number of requests processed at once by the endpoints sharing
+    a pool of workers. When all slots are taken, waiting requests are served
+    by descending priority (in arrival order within a priority), so that a
+    burst of requests to a heavy, low priority endpoint can not delay the
+    requests to a latency critical one by more than the requests already
+    in flight
+
+    Example flow:
+
+    ```
+    scheduler = PriorityScheduler(num_slots=4)
+
+    await scheduler.acquire(priority=10)
+    try:
+        ...  # process the request
+    finally:
+        scheduler.release()
+    ```
+
+    :param num_slots: maximum number of requests processed at once, typically
+        the number of workers of the shared pool
+    """
+
+    def __init__(self, num_slots: int):
+        if num_slots < 1:
+            raise ValueError(f"num_slots must be a positive integer, found {num_slots}")
+        self._num_slots = num_slots
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # heap of (-priority, arrival order, waiter), the arrival order
+        # keeps the ordering first in first out within a priority
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    def num_slots(self) -> int:
+        """
+        :return: maximum number of requests processed at once
+        """
+        return self._num_slots
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :return: number of requests currently holding a slot
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """
+        :return: number of requests waiting for a slot
+        """
+        return len(self._waiters)
+
+    async def acquire(self, priority: int = 0):
+        """
+        Waits until a slot is available for the request. Every call must be
+        followed by a call to `release` once the request is processed
+
+        :param priority: priority of the request, higher values are served first
+        """
+        with self._lock:
+            if self._in_flight < self._num_slots:
+                self._in_flight += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (-priority, next(self._arrivals), waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                for index, (_, _, queued_waiter) in enumerate(self._waiters):
+                    if queued_waiter is waiter:
+                        self._waiters.pop(index)
+                        heapq.heapify(self._waiters)
+                        raise
+            # the slot was handed over before the cancellation, pass it on
+            self.release()
+            raise
+
+    def release(self):
+        """
+        Releases the slot of a request, handing it over to the waiting request
+        with the highest priority if any
+        """
+        with self._lock:
+            if not self._waiters:
+                self._in_flight -= 1
+                return
+            _, _, waiter = heapq.heappop(self._waiters)
+        waiter.get_loop().call_soon_threadsafe(_wake_up, waiter)
+
+
+def _wake_up(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,165 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Binary (numpy `.npz`) request and response bodies for the prediction endpoints
+"""
+
+import asyncio
+import json
+import struct
+import zipfile
+from typing import Any, Callable, Coroutine, Dict, Optional, Type
+
+import numpy
+from pydantic import BaseModel, ValidationError
+
+from deepsparse.utils.data import arrays_to_npz_bytes, npz_bytes_to_arrays
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+
+__all__ = [
+    "NPZ_MEDIA_TYPE",
+    "BinaryTensorRoute",
+]
+
+NPZ_MEDIA_TYPE = "application/x-npz"
+
+
+class BinaryTensorRoute(APIRoute):
+    """
+    Route of a prediction endpoint that, in addition to JSON, accepts request
+    bodies of the `application/x-npz` content type, and responds with that
+    content type if the `Accept` header of the request lists it.
+
+    The arrays of an `.npz` request body (such as written by `numpy.savez`) are
+    passed by name to the input schema of the endpoint, without copying them
+    out of the request body. Arrays are converted to lists for fields of the
+    input schema that do not accept arrays.
+    In an `.npz` response body, each field of the output schema is stored as an
+    array, requests for outputs that can not be represented as arrays (such as
+    ragged lists) are answered with a 406 status code.
+    Compressed entries of a request body that would decompress to more than
+    `max_uncompressed_size` bytes are answered with a 400 status code.
+
+    The endpoint of the route must take an instance of the input schema
+    as its only argument
+    """
+
+    max_uncompressed_size: int = 1024**3
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        json_handler = super().get_route_handler()
+        input_schema = self.body_field.type_
+
+        async def _handler(request: Request) -> Response:
+            binary_request = _is_npz_media_type(request.headers.get("content-type"))
+            binary_response = _accepts_npz(request.headers.get("accept"))
+            if not binary_request and not binary_response:
+                return await json_handler(request)
+
+            if binary_request:
+                inputs = _parse_npz_inputs(
+                    await request.body(), input_schema, self.max_uncompressed_size
+                )
+            else:
+                inputs = await _parse_json_inputs(request, input_schema)
+
+            if asyncio.iscoroutinefunction(self.endpoint):
+                outputs = await self.endpoint(inputs)
+            else:
+                outputs = await run_in_threadpool(self.endpoint, inputs)
+
+            if not binary_response:
+                return JSONResponse(jsonable_encoder(outputs))
+            return Response(
+                content=arrays_to_npz_bytes(_outputs_to_arrays(outputs)),
+                media_type=NPZ_MEDIA_TYPE,
+            )
+
+        return _handler
+
+
+def _is_npz_media_type(content_type: Optional[str]) -> bool:
+    return (
+        content_type is not None
+        and content_type.split(";")[0].strip().lower() == NPZ_MEDIA_TYPE
+    )
+
+
+def _accepts_npz(accept: Optional[str]) -> bool:
+    if not accept:
+        return False
+    return any(_is_npz_media_type(media_type) for media_type in accept.split(","))
+
+
+def _parse_npz_inputs(
+    body: bytes, input_schema: Type[BaseModel], max_uncompressed_size: int
+) -> BaseModel:
+    try:
+        arrays = npz_bytes_to_arrays(body, max_uncompressed_size)
+    except (zipfile.BadZipFile, struct.error, ValueError) as error:
+        raise HTTPException(status_code=400, detail=f"Invalid npz body: {error}")
+
+    try:
+        return input_schema(**arrays)
+    except ValidationError:
+        pass
+    try:
+        # fields that only accept lists, e.g. List[str]
+        return input_schema(**{name: array.tolist() for name, array in arrays.items()})
+    except ValidationError as error:
+        raise RequestValidationError(error.raw_errors)
+
+
+async def _parse_json_inputs(
+    request: Request, input_schema: Type[BaseModel]
+) -> BaseModel:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError as error:
+        raise HTTPException(status_code=400, detail=f"Invalid json body: {error}")
+    try:
+        return input_schema.parse_obj(body)
+    except ValidationError as error:
+        raise RequestValidationError(error.raw_errors, body=body)
+
+
+def _outputs_to_arrays(outputs: Any) -> Dict[str, numpy.ndarray]:
+    values = (
+        {name: getattr(outputs, name) for name in outputs.__fields__}
+        if isinstance(outputs, BaseModel)
+        else {"outputs": outputs}
+    )
+    arrays = {}
+    for name, value in values.items():
+        if value is None:
+            continue
+        try:
+            array = numpy.asarray(value)
+        except ValueError:
+            array = None
+        if array is None or array.dtype.hasobject:
+            raise HTTPException(
+                status_code=406,
+                detail=f"Output {name} can not be represented as an array, "
+                "request a json response instead",
+            )
+        arrays[name] = array
+    return arrays
@@ -17,8 +17,9 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field, validator
 
-from deepsparse import DEEPSPARSE_ENGINE, PipelineConfig
+from deepsparse import DEEPSPARSE_ENGINE, PipelineConfig, ResultCacheConfig
 from deepsparse.loggers.config import (
+    AsyncLoggingConfig,
     MetricFunctionConfig,
     PipelineSystemLoggingConfig,
     SystemLoggingConfig,
@@ -32,6 +33,7 @@ __all__ = [
     "EndpointConfig",
     "SequenceLengthsConfig",
     "ImageSizesConfig",
+    "LazyLoadingConfig",
 ]
 
 # these are stored as global variables instead of enum because in order
@@ -54,6 +56,20 @@ class ImageSizesConfig(BaseModel):
     )
 
 
+class ResourceUtilizationLoggingGroup(SystemLoggingGroup):
+    """
+    Holds the configuration for the resource utilization system logging group
+    """
+
+    sampling_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds between two samples of the resource utilization. "
+        "The utilization is sampled on a background thread, and requests log "
+        "the latest sample. Defaults to 1.",
+    )
+
+
 class ServerSystemLoggingConfig(SystemLoggingConfig):
     """
     A configuration that specifies system group metrics
@@ -67,13 +83,51 @@ class ServerSystemLoggingConfig(SystemLoggingConfig):
         "system logging documentation. By default this group is disabled.",
     )
 
-    resource_utilization: SystemLoggingGroup = Field(
-        default=SystemLoggingGroup(enable=False),
+    resource_utilization: ResourceUtilizationLoggingGroup = Field(
+        default=ResourceUtilizationLoggingGroup(enable=False),
         description="The configuration group for the request_details system "
         "logging group. For details refer to the DeepSparse server "
         "system logging documentation. By default this group is disabled.",
     )
 
+    endpoint_loading: SystemLoggingGroup = Field(
+        default=SystemLoggingGroup(enable=False),
+        description="The configuration group for the endpoint_loading system "
+        "logging group, logging the loads and evictions of lazily loaded "
+        "endpoints. By default this group is disabled.",
+    )
+
+    async_logging: SystemLoggingGroup = Field(
+        default=SystemLoggingGroup(enable=False),
+        description="The configuration group for the async_logging system "
+        "logging group, logging the number of log calls dropped because the "
+        "queue of the server logger was full. By default this group is disabled.",
+    )
+
+
+class LazyLoadingConfig(BaseModel):
+    """
+    Holds the configuration for loading the pipelines of the endpoints
+    on their first request, and evicting them once idle
+    """
+
+    max_memory_mb: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Optional budget for the memory of the loaded pipelines in "
+        "MB. Once exceeded, the least recently used idle pipelines are evicted. "
+        "The memory of a pipeline is measured as the growth of the resident "
+        "memory of the server while loading it. Defaults to None (no budget).",
+    )
+
+    idle_ttl_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Optional number of seconds after its last request after "
+        "which a pipeline is evicted. Defaults to None (pipelines are only "
+        "evicted to respect `max_memory_mb`).",
+    )
+
 
 class EndpointConfig(BaseModel):
     name: Optional[str] = Field(
@@ -126,10 +180,108 @@ class EndpointConfig(BaseModel):
         ),
     )
 
+    result_cache: Optional[ResultCacheConfig] = Field(
+        default=None,
+        description="Optional configuration of a cache of the pipeline outputs, "
+        "repeated requests are answered from the cache without running inference. "
+        "Example in yaml: "
+        "```yaml\n"
+        "result_cache:\n"
+        "  max_size: 1024\n"
+        "  ttl_seconds: 600\n"
+        "```\n",
+    )
+
+    max_concurrent_requests: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Optional maximum number of requests this endpoint runs "
+        "inference for at once. Requests beyond the limit wait in a queue of "
+        "`max_queued_requests`, or are rejected with `overload_status_code` "
+        "if the queue is full. Defaults to None (no limit).",
+    )
+
+    max_queued_requests: int = Field(
+        default=0,
+        ge=0,
+        description="Number of requests that may wait for one of the "
+        "`max_concurrent_requests` slots. Ignored if `max_concurrent_requests` "
+        "is not set. Defaults to 0, rejecting requests as soon as all "
+        "slots are taken.",
+    )
+
+    overload_status_code: int = Field(
+        default=503,
+        description="HTTP status code of the responses to requests rejected "
+        "because the endpoint is overloaded. One of 429 or 503, defaults to 503.",
+    )
+
+    num_cores: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Optional number of cores dedicated to this endpoint. If "
+        "`num_cores` or `num_streams` is set, the endpoint runs in its own "
+        "engine context and pool of `num_streams` workers instead of sharing "
+        "the ones of the server, so that bursts of requests to other endpoints "
+        "can not starve it. The cores of all endpoints should add up to at most "
+        "the cores of the machine. Defaults to None (shares the cores of the "
+        "server).",
+    )
+
+    num_streams: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Optional number of requests this endpoint runs through "
+        "its dedicated engine context at once, see `num_cores`. Defaults to "
+        "None (derived by the engine from `num_cores`).",
+    )
+
+    priority: Optional[int] = Field(
+        default=None,
+        description="Optional priority class of the requests to this endpoint. "
+        "If any endpoint of the server sets a priority, the requests to the "
+        "endpoints sharing the server workers are scheduled onto them by "
+        "descending priority, endpoints without a priority having priority 0. "
+        "Defaults to None.",
+    )
+
+    warmup_iterations: int = Field(
+        default=0,
+        ge=0,
+        description="Number of warmup inferences to run before the endpoint "
+        "reports ready on `/ready`, paying the first run costs of the pipeline "
+        "before serving traffic. Endpoints of the server config warm up in the "
+        "background after startup, endpoints added or replaced at runtime warm "
+        "up before their routes are served. Defaults to 0 (no warmup).",
+    )
+
+    warmup_input: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Optional sample request body to run the warmup inferences "
+        "with end to end, including pre and post processing. Defaults to None, "
+        "running the engine on random inputs matching the model.",
+    )
+
     kwargs: Dict[str, Any] = Field(
         default={}, description="Additional arguments to pass to the Pipeline"
     )
 
+    @property
+    def has_dedicated_context(self) -> bool:
+        """
+        :return: True if the endpoint runs in its own engine context and
+            pool of workers
+        """
+        return self.num_cores is not None or self.num_streams is not None
+
+    @validator("overload_status_code")
+    def validate_overload_status_code(cls, status_code: int) -> int:
+        if status_code not in (429, 503):
+            raise ValueError(
+                f"overload_status_code must be one of 429 or 503, found {status_code}"
+            )
+        return status_code
+
     def to_pipeline_config(self) -> PipelineConfig:
         input_shapes, kwargs = _unpack_bucketing(self.task, self.bucketing)
 
@@ -145,6 +297,7 @@ class EndpointConfig(BaseModel):
             num_cores=None,  # this will be set from Context
             alias=self.name,
             input_shapes=input_shapes,
+            result_cache=self.result_cache,
             kwargs=kwargs,
         )
 
@@ -194,6 +347,15 @@ class ServerConfig(BaseModel):
         ),
     )
 
+    lazy_loading: Optional[LazyLoadingConfig] = Field(
+        default=None,
+        description="Optional configuration to load the engines of the "
+        "endpoints on their first request instead of at startup, and evict "
+        "them once idle, so that a server can host more models than fit in "
+        "memory at once. Endpoints with `bucketing` are always loaded at "
+        "startup. Defaults to None (all endpoints are loaded at startup).",
+    )
+
     system_logging: ServerSystemLoggingConfig = Field(
         default_factory=ServerSystemLoggingConfig,
         description="A model that holds the system logging configuration. "
@@ -201,6 +363,12 @@ class ServerConfig(BaseModel):
         "default SystemLoggingConfig model is used.",
     )
 
+    async_logging: AsyncLoggingConfig = Field(
+        default_factory=AsyncLoggingConfig,
+        description="The configuration of the queue of the log calls that are "
+        "forwarded asynchronously to the loggers.",
+    )
+
     @validator("endpoints")
     def assert_unique_endpoint_names(
         cls, endpoints: List[EndpointConfig]
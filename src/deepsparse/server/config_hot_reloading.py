@@ -144,13 +144,24 @@ def _update_endpoints(
     url: str, old_config: ServerConfig, new_config: ServerConfig
 ) -> None:
     added, removed = endpoint_diff(old_config, new_config)
+    # modified endpoints are both added and removed, they are replaced in place
+    # so that the current endpoint keeps serving until its replacement is ready
+    replaced_routes = {endpoint.route for endpoint in added} & {
+        endpoint.route for endpoint in removed
+    }
 
     for endpoint in removed:
+        if endpoint.route in replaced_routes:
+            continue
         _LOGGER.info(f"Requesting removal of endpoint '{endpoint.route}'")
         requests.delete(url, json=endpoint.dict()).raise_for_status()
 
     for endpoint in added:
-        _LOGGER.info(f"Requesting addition of endpoint '{endpoint.route}'")
-        requests.post(url, json=endpoint.dict()).raise_for_status()
+        if endpoint.route in replaced_routes:
+            _LOGGER.info(f"Requesting replacement of endpoint '{endpoint.route}'")
+            requests.put(url, json=endpoint.dict()).raise_for_status()
+        else:
+            _LOGGER.info(f"Requesting addition of endpoint '{endpoint.route}'")
+            requests.post(url, json=endpoint.dict()).raise_for_status()
 
     return added, removed
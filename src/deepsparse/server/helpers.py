@@ -55,6 +55,7 @@ def server_logger_from_config(config: ServerConfig) -> BaseLogger:
         system_logging_config=system_logging_groups,
         loggers_config=config.loggers,
         data_logging_config=_extract_data_logging_from_endpoints(config.endpoints),
+        async_logging_config=config.async_logging,
     )
 
 
@@ -0,0 +1,337 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Loading of the engines of the DeepSparse Server endpoints on their first
+request, and eviction of the engines of idle endpoints
+"""
+
+import contextlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from os import getpid
+from typing import Any, Dict, Generator, List, Optional
+
+import psutil
+from deepsparse.loggers import BaseLogger, SystemGroups
+from deepsparse.pipeline import Pipeline
+from deepsparse.server.config import LazyLoadingConfig, SystemLoggingConfig
+from deepsparse.server.system_logging import log_system_information
+from starlette.concurrency import run_in_threadpool
+
+
+__all__ = ["LazyPipeline", "PipelineLoader"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PipelineLoader:
+    """
+    Loads the engines of lazy pipelines when they are first used and tracks the
+    loaded ones in least recently used order. Engines of idle pipelines are
+    evicted when the memory of the loaded engines exceeds `max_memory_mb`,
+    or when they were not used for `idle_ttl_seconds`. Pipelines in use are
+    never evicted
+
+    Example flow:
+
+    ```
+    loader = PipelineLoader(LazyLoadingConfig(max_memory_mb=4096))
+    pipeline = loader.lazy_pipeline("bert", Pipeline.create(
+        task="text_classification", _delay_engine_initialize=True
+    ))
+
+    pipeline(sequences="...")  # loads the engine, evicting others if needed
+    ```
+
+    :param config: budget and idle time to live of the loaded engines
+    :param server_logger: optional logger to log the loads and evictions to,
+        under the `endpoint_loading` system logging group
+    :param system_logging_config: system logging config of the server
+    """
+
+    def __init__(
+        self,
+        config: LazyLoadingConfig,
+        server_logger: Optional[BaseLogger] = None,
+        system_logging_config: Optional[SystemLoggingConfig] = None,
+    ):
+        self._max_memory_bytes = (
+            int(config.max_memory_mb * 1024**2)
+            if config.max_memory_mb is not None
+            else None
+        )
+        self._idle_ttl_seconds = config.idle_ttl_seconds
+        self._server_logger = server_logger
+        self._system_logging_config = system_logging_config
+
+        # guards the bookkeeping, held only briefly
+        self._lock = threading.Lock()
+        # loads run one at a time so that the growth of the resident memory
+        # during a load can be attributed to the loaded engine
+        self._load_lock = threading.Lock()
+        self._loaded: "OrderedDict[LazyPipeline, None]" = OrderedDict()
+        self._num_loads = 0
+        self._num_evictions = 0
+
+        self._closed = threading.Event()
+        if self._idle_ttl_seconds is not None:
+            threading.Thread(
+                target=self._evict_idle_periodically,
+                name="pipeline-eviction",
+                daemon=True,
+            ).start()
+
+    @property
+    def loaded(self) -> List[str]:
+        """
+        :return: names of the pipelines with a loaded engine, least recently
+            used first
+        """
+        with self._lock:
+            return [pipeline.name for pipeline in self._loaded]
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        :return: estimated memory of the loaded engines in bytes
+        """
+        with self._lock:
+            return self._loaded_memory_bytes()
+
+    @property
+    def num_loads(self) -> int:
+        """
+        :return: total number of engine loads
+        """
+        return self._num_loads
+
+    @property
+    def num_evictions(self) -> int:
+        """
+        :return: total number of engine evictions
+        """
+        return self._num_evictions
+
+    def lazy_pipeline(self, name: str, pipeline: Pipeline) -> "LazyPipeline":
+        """
+        :param name: name of the pipeline for logging
+        :param pipeline: pipeline created with `_delay_engine_initialize=True`
+        :return: proxy of the pipeline that loads its engine through this loader
+            when running inferences
+        """
+        return LazyPipeline(name, pipeline, self)
+
+    def acquire(self, pipeline: "LazyPipeline"):
+        """
+        Loads the engine of the pipeline if needed and marks the pipeline
+        as in use. Every call must be followed by a call to `release`
+
+        :param pipeline: pipeline to acquire
+        """
+        if self._try_acquire_loaded(pipeline):
+            return
+
+        with self._load_lock:
+            if self._try_acquire_loaded(pipeline):
+                # loaded by a concurrent request
+                return
+            if pipeline.memory_bytes:
+                # make room for the engine, using the size of its last load
+                self._evict(required_bytes=pipeline.memory_bytes)
+
+            process = psutil.Process(getpid())
+            start_rss = process.memory_info().rss
+            start = time.perf_counter()
+            pipeline.pipeline.engine = pipeline.pipeline._initialize_engine()
+            load_seconds = time.perf_counter() - start
+            memory_bytes = max(process.memory_info().rss - start_rss, 0)
+
+            with self._lock:
+                pipeline.memory_bytes = max(memory_bytes, pipeline.memory_bytes)
+                pipeline.active += 1
+                self._loaded[pipeline] = None
+                self._num_loads += 1
+
+            _LOGGER.info(
+                f"Loaded pipeline '{pipeline.name}' in {load_seconds:.2f} seconds "
+                f"using {memory_bytes / 1024 ** 2:.1f} MB"
+            )
+            self._log(
+                **{
+                    f"{pipeline.name}/loaded": 1,
+                    f"{pipeline.name}/cold_load_seconds": load_seconds,
+                    f"{pipeline.name}/memory_bytes": pipeline.memory_bytes,
+                }
+            )
+            self._evict()
+
+    def release(self, pipeline: "LazyPipeline"):
+        """
+        Marks the pipeline as no longer in use by a caller of `acquire`
+
+        :param pipeline: pipeline to release
+        """
+        with self._lock:
+            pipeline.active -= 1
+            pipeline.last_used = time.monotonic()
+
+    @contextlib.contextmanager
+    def loaded_pipeline(
+        self, pipeline: "LazyPipeline"
+    ) -> Generator["LazyPipeline", None, None]:
+        """
+        :param pipeline: pipeline to use
+        :return: context in which the engine of the pipeline is loaded and not
+            evicted
+        """
+        self.acquire(pipeline)
+        try:
+            yield pipeline
+        finally:
+            self.release(pipeline)
+
+    def unload(self, pipeline: "LazyPipeline"):
+        """
+        Evicts the engine of the pipeline regardless of its use, for example
+        once its endpoint is removed
+
+        :param pipeline: pipeline to unload
+        """
+        with self._lock:
+            if pipeline in self._loaded:
+                self._unload(pipeline)
+
+    def evict_idle(self):
+        """
+        Evicts the engines of the idle pipelines not used for `idle_ttl_seconds`,
+        and of the least recently used idle pipelines while over the budget
+        """
+        self._evict()
+
+    def close(self):
+        """
+        Stops the periodic eviction of idle pipelines
+        """
+        self._closed.set()
+
+    def _try_acquire_loaded(self, pipeline: "LazyPipeline") -> bool:
+        with self._lock:
+            if pipeline not in self._loaded:
+                return False
+            pipeline.active += 1
+            self._loaded.move_to_end(pipeline)
+            return True
+
+    def _evict(self, required_bytes: int = 0):
+        now = time.monotonic()
+        with self._lock:
+            for pipeline in list(self._loaded):
+                if pipeline.active:
+                    continue
+                expired = (
+                    self._idle_ttl_seconds is not None
+                    and now - pipeline.last_used > self._idle_ttl_seconds
+                )
+                over_budget = (
+                    self._max_memory_bytes is not None
+                    and self._loaded_memory_bytes() + required_bytes
+                    > self._max_memory_bytes
+                )
+                if expired or over_budget:
+                    self._unload(pipeline)
+
+    def _unload(self, pipeline: "LazyPipeline"):
+        # must be called while holding the lock
+        del self._loaded[pipeline]
+        # also stops the batching thread, which references the pipeline
+        pipeline.pipeline.close()
+        self._num_evictions += 1
+        _LOGGER.info(f"Evicted pipeline '{pipeline.name}'")
+        self._log(**{f"{pipeline.name}/loaded": 0})
+
+    def _loaded_memory_bytes(self) -> int:
+        return sum(pipeline.memory_bytes for pipeline in self._loaded)
+
+    def _log(self, **items_to_log: Any):
+        if self._server_logger is None or self._system_logging_config is None:
+            return
+        log_system_information(
+            self._server_logger,
+            self._system_logging_config,
+            SystemGroups.ENDPOINT_LOADING,
+            load_count=self._num_loads,
+            eviction_count=self._num_evictions,
+            loaded_endpoints=len(self._loaded),
+            **items_to_log,
+        )
+
+    def _evict_idle_periodically(self):
+        interval = min(self._idle_ttl_seconds / 2, 10.0)
+        while not self._closed.wait(interval):
+            self.evict_idle()
+
+
+class LazyPipeline:
+    """
+    Proxy of a pipeline whose engine is loaded by a `PipelineLoader` for the
+    duration of each inference. Attributes other than the inference methods
+    are forwarded to the pipeline
+
+    :param name: name of the pipeline for logging
+    :param pipeline: pipeline created with `_delay_engine_initialize=True`
+    :param loader: loader of the engine of the pipeline
+    """
+
+    def __init__(self, name: str, pipeline: Pipeline, loader: PipelineLoader):
+        self.name = name
+        self.pipeline = pipeline
+        self.loader = loader
+        # bookkeeping of the loader
+        self.active = 0
+        self.last_used = time.monotonic()
+        self.memory_bytes = 0
+
+    def __getattr__(self, item):
+        return getattr(self.pipeline, item)
+
+    def __call__(self, *args, **kwargs):
+        with self.loader.loaded_pipeline(self):
+            return self.pipeline(*args, **kwargs)
+
+    async def run_async(self, *args, **kwargs):
+        # loads may take seconds, they run off the event loop
+        await run_in_threadpool(self.loader.acquire, self)
+        try:
+            return await self.pipeline.run_async(*args, **kwargs)
+        finally:
+            self.loader.release(self)
+
+    def run_batch(self, inputs: List[Any]) -> List[Any]:
+        with self.loader.loaded_pipeline(self):
+            return self.pipeline.run_batch(inputs)
+
+    def warmup(
+        self, num_iterations: int = 1, sample_input: Optional[Dict[str, Any]] = None
+    ):
+        with self.loader.loaded_pipeline(self):
+            self.pipeline.warmup(num_iterations, sample_input)
+
+    def unload(self):
+        """
+        Evicts the engine of the pipeline
+        """
+        self.loader.unload(self)
@@ -12,19 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 import logging
 import os
-from collections import Counter
+import threading
+import time
+from collections import Counter, deque
 from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import List
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Union
 
 import yaml
+from pydantic import create_model
 
 import uvicorn
 from deepsparse.engine import Context
 from deepsparse.loggers import BaseLogger
 from deepsparse.pipeline import Pipeline
+from deepsparse.server.admission import AdmissionController, PriorityScheduler
+from deepsparse.server.binary_format import BinaryTensorRoute
 from deepsparse.server.config import (
     INTEGRATION_LOCAL,
     INTEGRATION_SAGEMAKER,
@@ -35,16 +42,28 @@ from deepsparse.server.config import (
 )
 from deepsparse.server.config_hot_reloading import start_config_watcher
 from deepsparse.server.helpers import server_logger_from_config
+from deepsparse.server.lazy_loading import LazyPipeline, PipelineLoader
 from deepsparse.server.system_logging import (
     SystemLoggingMiddleware,
     log_system_information,
+    start_resource_sampler,
 )
-from fastapi import FastAPI, UploadFile
-from starlette.responses import RedirectResponse
+from fastapi import BackgroundTasks, FastAPI, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import RedirectResponse, StreamingResponse
+from starlette.routing import BaseRoute
 
 
 _LOGGER = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# number of chunks of a streamed response that run ahead of the one being sent
+_STREAM_CHUNKS_AHEAD = 2
+# maximum time to wait for the requests to a replaced endpoint to complete
+_DRAIN_TIMEOUT_SECONDS = 300
+
 
 def start_server(
     config_path: str,
@@ -123,7 +142,29 @@ def _build_app(server_config: ServerConfig) -> FastAPI:
     _LOGGER.info(f"Built context: {repr(context)}")
     _LOGGER.info(f"Built ThreadPoolExecutor with {executor._max_workers} workers")
 
+    # once any endpoint sets a priority, the requests to the endpoints sharing
+    # the executor are scheduled onto its workers by priority
+    scheduler = None
+    if any(cfg.priority is not None for cfg in server_config.endpoints):
+        scheduler = PriorityScheduler(num_slots=executor._max_workers)
+        _LOGGER.info(f"Built PriorityScheduler with {scheduler.num_slots} slots")
+
     server_logger = server_logger_from_config(server_config)
+    resource_utilization = server_config.system_logging.resource_utilization
+    if server_config.system_logging.enable and resource_utilization.enable:
+        # requests log the latest sample instead of querying the system
+        start_resource_sampler(resource_utilization.sampling_interval_seconds)
+    pipeline_loader = None
+    if server_config.lazy_loading is not None:
+        pipeline_loader = PipelineLoader(
+            server_config.lazy_loading, server_logger, server_config.system_logging
+        )
+    pipelines: Dict[str, Pipeline] = {}  # endpoint name -> pipeline
+    # endpoint name -> admission controller, tracks the requests in flight
+    admission_controllers: Dict[str, AdmissionController] = {}
+    route_endpoint_names: Dict[str, str] = {}  # route path -> endpoint name
+    replace_lock = threading.Lock()
+    ready_endpoints: Set[str] = set()  # names of the warmed up endpoints
     app = FastAPI()
     app.add_middleware(
         SystemLoggingMiddleware,
@@ -146,18 +187,29 @@ def _build_app(server_config: ServerConfig) -> FastAPI:
     def _health():
         return True
 
+    @app.get("/ready", tags=["general"], response_model=bool)
+    def _ready(response: Response):
+        # readiness probe, unlike the health checks it only succeeds once
+        # every endpoint is warmed up
+        ready = all(name in ready_endpoints for name in pipelines)
+        if not ready:
+            response.status_code = 503
+        return ready
+
+    @app.get("/metrics/latency", tags=["general"])
+    def _latency_metrics(reset: bool = False):
+        # latency percentiles (in seconds) of each phase of each endpoint,
+        # reset=true starts a new window after reporting
+        return {
+            name: pipeline.latency_profiler.summary(reset=reset)
+            for name, pipeline in pipelines.items()
+        }
+
     @app.post("/endpoints", tags=["endpoints"], response_model=bool)
     def _add_endpoint_endpoint(cfg: EndpointConfig):
         if cfg.name is None:
             cfg.name = f"endpoint-{len(app.routes)}"
-        _add_endpoint(
-            app,
-            server_config,
-            cfg,
-            executor,
-            context,
-            server_logger,
-        )
+        _add_tracked_endpoint(cfg)
         # force regeneration of the docs
         app.openapi_schema = None
         return True
@@ -167,21 +219,138 @@ def _build_app(server_config: ServerConfig) -> FastAPI:
         _LOGGER.info(f"Deleting endpoint for {cfg}")
         matching = [r for r in app.routes if r.path == cfg.route]
         assert len(matching) == 1
-        app.routes.remove(matching[0])
+        endpoint_name = route_endpoint_names.get(cfg.route)
+        if endpoint_name is not None:
+            # also remove the batch and from_files routes of the endpoint
+            matching = [
+                r
+                for r in app.routes
+                if route_endpoint_names.get(getattr(r, "path", None)) == endpoint_name
+            ]
+        for route in matching:
+            app.routes.remove(route)
+            route_endpoint_names.pop(route.path, None)
+        pipeline = pipelines.pop(endpoint_name, None)
+        admission_controllers.pop(endpoint_name, None)
+        if isinstance(pipeline, LazyPipeline):
+            pipeline.unload()
+        elif pipeline is not None:
+            pipeline.close()
+        if pipeline is not None and pipeline.executor is not executor:
+            # workers dedicated to the endpoint exit once their work is done
+            pipeline.executor.shutdown(wait=False)
         # force regeneration of the docs
         app.openapi_schema = None
         return True
 
-    # create pipelines & endpoints
-    for endpoint_config in server_config.endpoints:
-        _add_endpoint(
-            app,
-            server_config,
-            endpoint_config,
-            executor,
-            context,
-            server_logger,
+    @app.put("/endpoints", tags=["endpoints"], response_model=bool)
+    def _replace_endpoint(cfg: EndpointConfig, background_tasks: BackgroundTasks):
+        # the replacement is built while the current endpoint keeps serving,
+        # then the routes are swapped and the old pipeline is drained
+        with replace_lock:
+            old_name = route_endpoint_names.get(cfg.route)
+            if old_name is None:
+                _LOGGER.info(f"No endpoint to replace for {cfg}, adding it")
+                return _add_endpoint_endpoint(cfg)
+
+            _LOGGER.info(f"Replacing endpoint for {cfg}")
+            if cfg.name is None:
+                cfg.name = old_name
+            old_routes = [
+                r
+                for r in app.routes
+                if route_endpoint_names.get(getattr(r, "path", None)) == old_name
+            ]
+            old_pipeline = pipelines[old_name]
+            old_admission_controller = admission_controllers[old_name]
+
+            # new routes are appended after the old ones, which match first
+            # until they are removed. The old pipeline stays tracked while the
+            # new one builds, a failed build leaves the endpoint untouched
+            new_routes = _add_tracked_endpoint(cfg)
+            if cfg.name != old_name:
+                pipelines.pop(old_name, None)
+                admission_controllers.pop(old_name, None)
+            old_route_ids = {id(route) for route in old_routes}
+            app.router.routes[:] = [
+                route for route in app.router.routes if id(route) not in old_route_ids
+            ]
+
+            new_paths = {route.path for route in new_routes}
+            for route in old_routes:
+                if route.path not in new_paths:
+                    route_endpoint_names.pop(route.path, None)
+            # force regeneration of the docs
+            app.openapi_schema = None
+
+        background_tasks.add_task(
+            _drain_and_release_pipeline,
+            old_pipeline,
+            old_admission_controller,
+            shutdown_executor=old_pipeline.executor is not executor,
         )
+        return True
+
+    def _add_tracked_endpoint(
+        endpoint_config: EndpointConfig, warmup: bool = True
+    ) -> List[BaseRoute]:
+        num_routes = len(app.routes)
+        endpoint_context, endpoint_executor = context, executor
+        endpoint_scheduler = scheduler
+        if endpoint_config.has_dedicated_context:
+            # the endpoint is isolated from the load of the other endpoints,
+            # it does not compete for the shared workers
+            endpoint_context, endpoint_executor = _build_dedicated_context(
+                endpoint_config
+            )
+            endpoint_scheduler = None
+        admission_controller = AdmissionController(
+            max_concurrent_requests=endpoint_config.max_concurrent_requests,
+            max_queued_requests=endpoint_config.max_queued_requests,
+            overload_status_code=endpoint_config.overload_status_code,
+            scheduler=endpoint_scheduler,
+            priority=endpoint_config.priority or 0,
+        )
+        try:
+            pipelines[endpoint_config.name] = _add_endpoint(
+                app,
+                server_config,
+                endpoint_config,
+                endpoint_executor,
+                endpoint_context,
+                server_logger,
+                admission_controller,
+                warmup,
+                pipeline_loader,
+            )
+        except Exception:
+            if endpoint_executor is not executor:
+                endpoint_executor.shutdown(wait=False)
+            raise
+        admission_controllers[endpoint_config.name] = admission_controller
+        if warmup or not endpoint_config.warmup_iterations:
+            ready_endpoints.add(endpoint_config.name)
+        new_routes = app.routes[num_routes:]
+        for route in new_routes:
+            route_endpoint_names[route.path] = endpoint_config.name
+        return new_routes
+
+    # create pipelines & endpoints, warmups run in the background so that the
+    # server is live (but not ready) while they run
+    for endpoint_config in server_config.endpoints:
+        _add_tracked_endpoint(endpoint_config, warmup=False)
+
+    def _warmup_endpoints():
+        for endpoint_config in server_config.endpoints:
+            pipeline = pipelines.get(endpoint_config.name)
+            if pipeline is not None:
+                _warmup_pipeline(pipeline, endpoint_config)
+            ready_endpoints.add(endpoint_config.name)
+
+    if any(cfg.warmup_iterations for cfg in server_config.endpoints):
+        threading.Thread(
+            target=_warmup_endpoints, name="endpoint-warmup", daemon=True
+        ).start()
 
     _LOGGER.info(f"Added endpoints: {[route.path for route in app.routes]}")
 
@@ -219,6 +388,21 @@ def _set_thread_pinning(server_config: ServerConfig):
     _LOGGER.info(f"NM_BIND_THREADS_TO_SOCKETS={socks}")
 
 
+def _build_dedicated_context(
+    endpoint_config: EndpointConfig,
+) -> Tuple[Context, ThreadPoolExecutor]:
+    context = Context(
+        num_cores=endpoint_config.num_cores,
+        num_streams=endpoint_config.num_streams,
+    )
+    executor = ThreadPoolExecutor(max_workers=context.num_streams)
+    _LOGGER.info(
+        f"Built dedicated context for '{endpoint_config.name}': {repr(context)} "
+        f"with {executor._max_workers} workers"
+    )
+    return context, executor
+
+
 def _add_endpoint(
     app: FastAPI,
     server_config: ServerConfig,
@@ -226,12 +410,23 @@ def _add_endpoint(
     executor: ThreadPoolExecutor,
     context: Context,
     server_logger: BaseLogger,
-):
+    admission_controller: Optional[AdmissionController] = None,
+    warmup: bool = True,
+    pipeline_loader: Optional[PipelineLoader] = None,
+) -> Pipeline:
     pipeline_config = endpoint_config.to_pipeline_config()
     pipeline_config.kwargs["executor"] = executor
+    # bucketing pipelines hold an engine per bucket, they are loaded eagerly
+    lazy = pipeline_loader is not None and endpoint_config.bucketing is None
+    if lazy:
+        pipeline_config.kwargs["_delay_engine_initialize"] = True
 
     _LOGGER.info(f"Initializing pipeline for '{endpoint_config.name}'")
     pipeline = Pipeline.from_config(pipeline_config, context, server_logger)
+    if lazy:
+        pipeline = pipeline_loader.lazy_pipeline(endpoint_config.name, pipeline)
+    if warmup:
+        _warmup_pipeline(pipeline, endpoint_config)
 
     _LOGGER.info(f"Adding endpoints for '{endpoint_config.name}'")
     _add_pipeline_endpoint(
@@ -240,7 +435,53 @@ def _add_endpoint(
         server_config.system_logging,
         pipeline,
         server_config.integration,
+        admission_controller,
     )
+    return pipeline
+
+
+def _warmup_pipeline(pipeline: Pipeline, endpoint_config: EndpointConfig):
+    if not endpoint_config.warmup_iterations:
+        return
+    _LOGGER.info(
+        f"Warming up '{endpoint_config.name}' with "
+        f"{endpoint_config.warmup_iterations} inferences"
+    )
+    try:
+        pipeline.warmup(endpoint_config.warmup_iterations, endpoint_config.warmup_input)
+    except Exception:
+        # a failed warmup does not prevent serving, requests pay the first
+        # run costs instead
+        _LOGGER.exception(
+            f"Warmup of '{endpoint_config.name}' failed, serving it without warmup"
+        )
+
+
+def _drain_and_release_pipeline(
+    pipeline: Pipeline,
+    admission_controller: AdmissionController,
+    timeout_seconds: float = _DRAIN_TIMEOUT_SECONDS,
+    shutdown_executor: bool = False,
+):
+    # waits for the requests admitted to a replaced endpoint to complete,
+    # then closes it so the memory of its engine is freed even if the
+    # pipeline object itself is still referenced
+    deadline = time.monotonic() + timeout_seconds
+    while admission_controller.in_flight or admission_controller.queued:
+        if time.monotonic() > deadline:
+            _LOGGER.warning(
+                f"Requests to the replaced pipeline '{pipeline.alias}' did not "
+                f"complete within {timeout_seconds} seconds, releasing it anyway"
+            )
+            break
+        time.sleep(0.01)
+    if isinstance(pipeline, LazyPipeline):
+        pipeline.unload()
+    else:
+        pipeline.close()
+    if shutdown_executor:
+        pipeline.executor.shutdown(wait=False)
+    _LOGGER.info(f"Released replaced pipeline '{pipeline.alias}'")
 
 
 def _add_pipeline_endpoint(
@@ -249,12 +490,17 @@ def _add_pipeline_endpoint(
     system_logging_config: SystemLoggingConfig,
     pipeline: Pipeline,
     integration: str = INTEGRATION_LOCAL,
+    admission_controller: Optional[AdmissionController] = None,
 ):
     input_schema = pipeline.input_schema
     output_schema = pipeline.output_schema
+    # admits all requests if not provided
+    admission_controller = admission_controller or AdmissionController()
 
-    def _predict(request: pipeline.input_schema):
-        pipeline_outputs = pipeline(request)
+    async def _run_pipeline(request):
+        # the pipeline work runs on the pipeline's executor,
+        # the event loop only awaits it
+        pipeline_outputs = await pipeline.run_async(request)
         server_logger = pipeline.logger
         if server_logger:
             log_system_information(
@@ -263,34 +509,123 @@ def _add_pipeline_endpoint(
             )
         return pipeline_outputs
 
-    def _predict_from_files(request: List[UploadFile]):
-        request = pipeline.input_schema.from_files(
-            (file.file for file in request), from_server=True
+    async def _predict(request: pipeline.input_schema):
+        async with admission_controller:
+            return await _run_pipeline(request)
+
+    async def _predict_from_files(request: List[UploadFile]):
+        async with admission_controller:
+            # reading and decoding the files blocks, keep it off the event loop
+            request = await run_in_threadpool(
+                pipeline.inputs_from_files, [file.file for file in request]
+            )
+            return await _run_pipeline(request)
+
+    batch_item_schema = create_model(
+        f"{getattr(output_schema, '__name__', 'Output')}BatchItem",
+        output=(Optional[output_schema], None),
+        error=(Optional[str], None),
+    )
+
+    async def _predict_batch(request: List[Union[input_schema, Dict[str, Any]]]):
+        # items that do not match the input schema are passed on as dicts,
+        # to fail on their own in the pipeline
+        async with admission_controller:
+            # runs the pre and post-processing of the items in the threadpool,
+            # while the merged engine batches run on the pipeline's executor
+            results = await run_in_threadpool(pipeline.run_batch, request)
+        server_logger = pipeline.logger
+        if server_logger:
+            log_system_information(
+                server_logger=server_logger,
+                system_logging_config=system_logging_config,
+            )
+        return [
+            batch_item_schema(error=f"{result.__class__.__name__}: {result}")
+            if isinstance(result, Exception)
+            else batch_item_schema(output=result)
+            for result in results
+        ]
+
+    async def _predict_from_files_stream(request: List[UploadFile]):
+        # rejected requests get an error status before streaming starts,
+        # the slot is held until the whole response is streamed
+        await admission_controller.acquire()
+        return StreamingResponse(
+            _stream_ndjson_results(pipeline, request),
+            media_type=NDJSON_MEDIA_TYPE,
+            background=BackgroundTask(admission_controller.release),
         )
-        return _predict(request)
 
-    routes_and_fns = []
+    routes_fns_and_outputs = []
     if integration == INTEGRATION_LOCAL:
         route = endpoint_config.route or "/predict"
         if not route.startswith("/"):
             route = "/" + route
 
-        routes_and_fns.append((route, _predict))
+        routes_fns_and_outputs.append(
+            (route + "/batch", _predict_batch, List[batch_item_schema])
+        )
+        routes_fns_and_outputs.append((route, _predict, output_schema))
         if hasattr(input_schema, "from_files"):
-            routes_and_fns.append((route + "/from_files", _predict_from_files))
+            routes_fns_and_outputs.insert(
+                1,
+                (route + "/from_files/stream", _predict_from_files_stream, None),
+            )
+            routes_fns_and_outputs.append(
+                (route + "/from_files", _predict_from_files, output_schema)
+            )
     elif integration == INTEGRATION_SAGEMAKER:
         route = "/invocations"
         if hasattr(input_schema, "from_files"):
-            routes_and_fns.append((route, _predict_from_files))
+            routes_fns_and_outputs.append((route, _predict_from_files, output_schema))
         else:
-            routes_and_fns.append((route, _predict))
+            routes_fns_and_outputs.append((route, _predict, output_schema))
 
-    for route, endpoint_fn in routes_and_fns:
-        app.add_api_route(
+    for route, endpoint_fn, response_model in routes_fns_and_outputs:
+        app.router.add_api_route(
             route,
             endpoint_fn,
-            response_model=output_schema,
+            response_model=response_model,
             methods=["POST"],
             tags=["predict"],
+            # inputs of files are multipart, all other inputs may be binary arrays
+            route_class_override=(
+                BinaryTensorRoute if endpoint_fn is _predict else None
+            ),
         )
         _LOGGER.info(f"Added '{route}' endpoint")
+
+
+async def _stream_ndjson_results(
+    pipeline: Pipeline, files: List[UploadFile]
+) -> AsyncGenerator[str, None]:
+    # runs the files in chunks of the engine batch size and yields a json line
+    # with the outputs (or the error) of each chunk as soon as it completes,
+    # a bounded number of chunks run ahead to overlap their processing
+    async def _run_chunk(chunk: List[UploadFile]) -> str:
+        result = {"files": [file.filename for file in chunk]}
+        try:
+            inputs = await run_in_threadpool(
+                pipeline.inputs_from_files, [file.file for file in chunk]
+            )
+            result["output"] = jsonable_encoder(await pipeline.run_async(inputs))
+        except Exception as err:
+            result["error"] = f"{err.__class__.__name__}: {err}"
+        return json.dumps(result) + "\n"
+
+    batch_size = pipeline.batch_size
+    pending = deque()
+    try:
+        for start in range(0, len(files), batch_size):
+            pending.append(
+                asyncio.ensure_future(_run_chunk(files[start : start + batch_size]))
+            )
+            if len(pending) > _STREAM_CHUNKS_AHEAD:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # the client disconnected, do not run the remaining chunks
+        for task in pending:
+            task.cancel()
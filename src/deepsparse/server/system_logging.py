@@ -14,6 +14,8 @@
 
 
 import logging
+import threading
+import time
 from os import getpid
 from typing import Any, Dict, List, Optional, Union
 
@@ -26,7 +28,16 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 _LOGGER = logging.getLogger(__name__)
 
-__all__ = ["log_system_information", "SystemLoggingMiddleware"]
+__all__ = [
+    "log_system_information",
+    "SystemLoggingMiddleware",
+    "ResourceSampler",
+    "start_resource_sampler",
+]
+
+# a thread counts as active if it ran on a cpu for at least this
+# fraction of the sampling interval
+_ACTIVE_THREAD_CPU_FRACTION = 0.5
 
 
 class SystemLoggingMiddleware(BaseHTTPMiddleware):
@@ -100,6 +111,12 @@ def log_resource_utilization(
     - CPU utilization
     - Memory utilization
     - Total memory available
+    - Resident memory
+    - Number of threads, and of threads active on a cpu
+
+    The values are the latest sample of the resource sampler started by
+    `start_resource_sampler`, otherwise they are sampled on demand once the
+    latest sample is older than the sampling interval
 
     :param server_logger: the logger to log the metrics to
     :param prefix: the prefix to use for the identifier
@@ -107,19 +124,8 @@ def log_resource_utilization(
         These will be key-value pairs, where the key is the
         identifier string and the value is the value to log.
     """
-    process = psutil.Process(getpid())
-    # A float representing the current system-wide CPU utilization as a percentage
-    cpu_percent = process.cpu_percent()
-    # A float representing process memory utilization as a percentage
-    memory_percent = process.memory_percent()
-    # Total physical memory
-    total_memory_bytes = psutil.virtual_memory().total
-
-    identifier_to_value = {
-        "cpu_utilization_percent": cpu_percent,
-        "memory_utilization_percent": memory_percent,
-        "total_memory_available_bytes": total_memory_bytes,
-    }
+    # the utilization is sampled in the background, reading it is constant time
+    identifier_to_value = dict(_RESOURCE_SAMPLER.snapshot())
     if items_to_log:
         identifier_to_value.update(items_to_log)
 
@@ -128,6 +134,161 @@ def log_resource_utilization(
     )
 
 
+class ResourceSampler:
+    """
+    Samples the resource utilization of the server process on a background
+    thread at a fixed interval, so that it can be logged at a constant cost
+    from the request path. Sampling over an interval also measures the CPU
+    utilization over the interval, rather than since the previous request
+
+    :param interval_seconds: seconds between two samples. Default is 1
+    """
+
+    def __init__(self, interval_seconds: float = 1.0):
+        if interval_seconds <= 0:
+            raise ValueError(
+                f"interval_seconds must be positive, found {interval_seconds}"
+            )
+        self._interval_seconds = interval_seconds
+        self._process: Optional[psutil.Process] = None
+        self._snapshot: Optional[Dict[str, float]] = None
+        self._snapshot_time: Optional[float] = None
+        self._thread_cpu_times: Dict[int, float] = {}
+        self._last_sample_time = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def interval_seconds(self) -> float:
+        """
+        :return: seconds between two samples
+        """
+        return self._interval_seconds
+
+    @interval_seconds.setter
+    def interval_seconds(self, interval_seconds: float):
+        self._interval_seconds = interval_seconds
+
+    @property
+    def running(self) -> bool:
+        """
+        :return: True if the background sampling thread is running
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        :return: dictionary of the latest sampled resource utilization metrics,
+            sampled now if no sample was taken yet, or if the background thread
+            is not running and the latest sample is older than the interval
+        """
+        snapshot, snapshot_time = self._snapshot, self._snapshot_time
+        if snapshot is None or (
+            not self.running
+            and time.monotonic() - snapshot_time >= self._interval_seconds
+        ):
+            snapshot = self.sample()
+        return snapshot
+
+    def sample(self) -> Dict[str, float]:
+        """
+        :return: dictionary of the resource utilization metrics sampled now,
+            which also becomes the latest snapshot
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._process is None or self._process.pid != getpid():
+                # (re)created lazily, e.g. in forked server processes
+                self._process = psutil.Process(getpid())
+                self._thread_cpu_times, self._last_sample_time = {}, None
+            process = self._process
+            with process.oneshot():
+                snapshot = {
+                    # utilization of the process since the previous sample,
+                    # as a percentage of a single cpu
+                    "cpu_utilization_percent": process.cpu_percent(),
+                    # process memory utilization as a percentage
+                    "memory_utilization_percent": process.memory_percent(),
+                    "resident_memory_bytes": process.memory_info().rss,
+                    "num_threads": process.num_threads(),
+                }
+                threads = process.threads()
+            snapshot["active_threads"] = self._count_active_threads(threads, now)
+            # total physical memory
+            snapshot["total_memory_available_bytes"] = psutil.virtual_memory().total
+            # replaced as a whole, readers never see a partial snapshot, nor
+            # a snapshot without its time
+            self._snapshot_time = now
+            self._snapshot = snapshot
+            return snapshot
+
+    def start(self):
+        """
+        Starts sampling on a background thread, does nothing if already running
+        """
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="resource-sampler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background sampling thread
+        """
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception:
+                _LOGGER.exception("Unable to sample the resource utilization")
+            if self._stopped.wait(self._interval_seconds):
+                return
+
+    def _count_active_threads(self, threads: List[Any], now: float) -> int:
+        # threads that used most of the interval on a cpu, e.g. busy engine threads,
+        # threads started since the previous sample ran only during the interval
+        elapsed = now - self._last_sample_time if self._last_sample_time else None
+        cpu_times = {
+            thread.id: thread.user_time + thread.system_time for thread in threads
+        }
+        active_threads = 0
+        if elapsed:
+            active_threads = sum(
+                cpu_time - self._thread_cpu_times.get(thread_id, 0.0)
+                >= _ACTIVE_THREAD_CPU_FRACTION * elapsed
+                for thread_id, cpu_time in cpu_times.items()
+            )
+        self._thread_cpu_times = cpu_times
+        self._last_sample_time = now
+        return active_threads
+
+
+_RESOURCE_SAMPLER = ResourceSampler()
+
+
+def start_resource_sampler(interval_seconds: float = 1.0) -> ResourceSampler:
+    """
+    Starts the background sampling of the resource utilization logged by
+    `log_resource_utilization`
+
+    :param interval_seconds: seconds between two samples. Default is 1
+    :return: the started resource sampler
+    """
+    _RESOURCE_SAMPLER.interval_seconds = interval_seconds
+    _RESOURCE_SAMPLER.start()
+    return _RESOURCE_SAMPLER
+
+
 def log_request_details(
     server_logger: BaseLogger,
     prefix: str = SystemGroups.REQUEST_DETAILS,
@@ -163,11 +324,32 @@ def log_request_details(
     )
 
 
+def log_endpoint_loading(
+    server_logger: BaseLogger,
+    prefix: str = SystemGroups.ENDPOINT_LOADING,
+    **items_to_log: Dict[str, Any],
+):
+    """
+    Send to the server_logger the logs pertaining to the loads and
+    evictions of the lazily loaded endpoints. The information is to be
+    passed as kwargs (where key is the identifier and value is the value to log)
+
+    :param server_logger: the logger to log the metrics to
+    :param prefix: the prefix to use for the identifier
+    :param items_to_log: The information that is to be logged under this
+        particular system logging metric group
+    """
+    _send_information_to_logger(
+        logger=server_logger, identifier_to_value=items_to_log, prefix=prefix
+    )
+
+
 # maps the metric group name to the function that logs the information
 # pertaining to this metric group name
 _PREFIX_MAPPING = {
     SystemGroups.REQUEST_DETAILS: log_request_details,
     SystemGroups.RESOURCE_UTILIZATION: log_resource_utilization,
+    SystemGroups.ENDPOINT_LOADING: log_endpoint_loading,
 }
 
 
@@ -15,4 +15,5 @@
 # flake8: noqa
 
 from .inference_phases import *
+from .profiler import *
 from .timer import *
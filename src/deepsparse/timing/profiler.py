@@ -0,0 +1,265 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from deepsparse.timing.timer import Timer
+
+
+__all__ = ["LatencyProfiler", "MergedLatencyProfiler"]
+
+# histogram buckets grow geometrically from _MIN_SECONDS by _BUCKET_RATIO,
+# bounding the relative error of reported percentiles to about 2.5%
+_MIN_SECONDS = 1e-6
+_MAX_SECONDS = 1e4
+_BUCKET_RATIO = 1.05
+_LOG_BUCKET_RATIO = math.log(_BUCKET_RATIO)
+_NUM_BUCKETS = math.ceil(math.log(_MAX_SECONDS / _MIN_SECONDS) / _LOG_BUCKET_RATIO) + 1
+
+
+class LatencyProfiler:
+    """
+    Accumulates the durations of inference phases across calls into fixed size
+    histograms, so that latency percentiles can be reported at any time at a
+    constant memory cost. Recording a duration takes constant time.
+
+    Example flow:
+
+    ```
+    profiler = LatencyProfiler()
+
+    timer = Timer()
+    ...  # time the phases of an inference call
+    profiler.record_timer(timer, ["pre_process", "engine_forward"])
+
+    profiler.summary()
+    # {"pre_process": {"count": 1, "mean": 0.0012, ..., "p99": 0.0012}, ...}
+    ```
+
+    :param percentiles: percentiles to report in `summary`.
+        Default is (50, 90, 95, 99)
+    """
+
+    def __init__(self, percentiles: Sequence[float] = (50, 90, 95, 99)):
+        self._percentiles = tuple(percentiles)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, _PhaseHistogram] = {}
+        self._window_start = time.time()
+
+    @property
+    def phases(self) -> List[str]:
+        """
+        :return: names of the phases with recorded durations
+        """
+        return list(self._histograms)
+
+    @property
+    def window_start(self) -> float:
+        """
+        :return: unix timestamp of the creation or last reset of the profiler
+        """
+        return self._window_start
+
+    def record(self, phase_name: str, seconds: float):
+        """
+        :param phase_name: name of the phase the duration was measured for
+        :param seconds: duration of the phase in seconds
+        """
+        with self._lock:
+            histogram = self._histograms.get(phase_name)
+            if histogram is None:
+                histogram = self._histograms[phase_name] = _PhaseHistogram()
+            histogram.add(seconds)
+
+    def record_timer(self, timer: Timer, phase_names: Iterable[str]):
+        """
+        :param timer: timer with the start and stop times of the given phases
+        :param phase_names: names of the phases to record the durations of
+        """
+        for phase_name in phase_names:
+            self.record(phase_name, timer.time_delta(phase_name))
+
+    def percentile(self, phase_name: str, percentile: float) -> Optional[float]:
+        """
+        :param phase_name: name of the phase to get the percentile for
+        :param percentile: percentile to compute, in the range [0, 100]
+        :return: the approximate duration in seconds of the given percentile,
+            None if no durations were recorded for the phase
+        """
+        with self._lock:
+            histogram = self._histograms.get(phase_name)
+            return histogram.percentile(percentile) if histogram else None
+
+    def summary(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        :param reset: if True, clear the recorded durations after summarizing
+            them, starting a new window. Default is False
+        :return: dictionary of phase name to the count, mean, min, max, and
+            percentiles of the durations recorded for the phase, in seconds
+        """
+        with self._lock:
+            summary = {
+                phase_name: histogram.summary(self._percentiles)
+                for phase_name, histogram in self._histograms.items()
+            }
+            if reset:
+                self._reset()
+        return summary
+
+    def reset(self):
+        """
+        Clears all recorded durations, starting a new window
+        """
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._histograms = {}
+        self._window_start = time.time()
+
+    def _merge_into(self, histograms: Dict[str, "_PhaseHistogram"], reset: bool):
+        with self._lock:
+            for phase_name, histogram in self._histograms.items():
+                histograms.setdefault(phase_name, _PhaseHistogram()).merge(histogram)
+            if reset:
+                self._reset()
+
+
+class MergedLatencyProfiler:
+    """
+    Reports the durations recorded by several LatencyProfilers as if they were
+    recorded by a single one, e.g. the pipelines of the buckets of a
+    BucketingPipeline. Resetting it resets every profiler
+
+    :param profilers: the profilers to merge the recorded durations of
+    :param percentiles: percentiles to report in `summary`.
+        Default is (50, 90, 95, 99)
+    """
+
+    def __init__(
+        self,
+        profilers: Sequence[LatencyProfiler],
+        percentiles: Sequence[float] = (50, 90, 95, 99),
+    ):
+        self._profilers = list(profilers)
+        self._percentiles = tuple(percentiles)
+
+    @property
+    def phases(self) -> List[str]:
+        """
+        :return: names of the phases with recorded durations
+        """
+        return list(self._merged_histograms())
+
+    @property
+    def window_start(self) -> float:
+        """
+        :return: unix timestamp of the earliest creation or last reset
+            of the profilers
+        """
+        return min(profiler.window_start for profiler in self._profilers)
+
+    def percentile(self, phase_name: str, percentile: float) -> Optional[float]:
+        """
+        :param phase_name: name of the phase to get the percentile for
+        :param percentile: percentile to compute, in the range [0, 100]
+        :return: the approximate duration in seconds of the given percentile,
+            None if no durations were recorded for the phase
+        """
+        histogram = self._merged_histograms().get(phase_name)
+        return histogram.percentile(percentile) if histogram else None
+
+    def summary(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        :param reset: if True, clear the recorded durations of every profiler
+            after summarizing them, starting a new window. Default is False
+        :return: dictionary of phase name to the count, mean, min, max, and
+            percentiles of the durations recorded for the phase, in seconds
+        """
+        return {
+            phase_name: histogram.summary(self._percentiles)
+            for phase_name, histogram in self._merged_histograms(reset).items()
+        }
+
+    def reset(self):
+        """
+        Clears all recorded durations of every profiler, starting a new window
+        """
+        for profiler in self._profilers:
+            profiler.reset()
+
+    def _merged_histograms(self, reset: bool = False) -> Dict[str, "_PhaseHistogram"]:
+        histograms = {}
+        for profiler in self._profilers:
+            profiler._merge_into(histograms, reset)
+        return histograms
+
+
+class _PhaseHistogram:
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.counts[_bucket_index(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "_PhaseHistogram"):
+        self.counts = [
+            count + other_count for count, other_count in zip(self.counts, other.counts)
+        ]
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> float:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"percentile must be in [0, 100], found {percentile}")
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                # geometric center of the bucket, clamped to the observed range
+                value = _MIN_SECONDS * _BUCKET_RATIO ** (index - 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles: Sequence[float]) -> Dict[str, float]:
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+        for percentile in percentiles:
+            summary[f"p{percentile:g}"] = self.percentile(percentile)
+        return summary
+
+
+def _bucket_index(seconds: float) -> int:
+    if seconds <= _MIN_SECONDS:
+        return 0
+    index = math.ceil(math.log(seconds / _MIN_SECONDS) / _LOG_BUCKET_RATIO)
+    return min(index, _NUM_BUCKETS - 1)
@@ -28,7 +28,7 @@ import onnx
 from onnx import ModelProto
 
 from deepsparse.log import get_main_logger
-from deepsparse.utils.onnx import truncate_onnx_model
+from deepsparse.utils.onnx import cached_onnx_rewrite, truncate_onnx_model
 from sparsezoo import Model
 
 
@@ -146,11 +146,24 @@ def overwrite_transformer_onnx_model_inputs(
     :param max_length: max sequence length to set
     :param output_path: if provided, the model will be saved to the given path,
         otherwise, the model will be saved to a named temporary file that will
-        be deleted after the program exits
+        be deleted after the program exits, or to NM_ONNX_CACHE_DIR if set
     :return: if no output path, a tuple of the saved path to the model, list of
         model input names, and reference to the tempfile object will be returned
         otherwise, only the model input names will be returned
     """
+    if output_path is None:
+        cached = cached_onnx_rewrite(
+            path,
+            "overwrite_transformer_onnx_model_inputs",
+            dict(batch_size=batch_size, max_length=max_length),
+            lambda cache_path: overwrite_transformer_onnx_model_inputs(
+                path, batch_size, max_length, output_path=cache_path
+            ),
+        )
+        if cached is not None:
+            cached_path, input_names = cached
+            return cached_path, input_names, None
+
     # overwrite input shapes
     model = onnx.load(path)
     initializer_input_names = set([node.name for node in model.graph.initializer])
@@ -264,12 +277,33 @@ def truncate_transformer_onnx_model(
         in provided model. Used by deepsparse engine to optimize memory allocation
     :param output_name: name of graph output, default "embedding"
     :param output_path: path to write resulting onnx file. If not provided,
-        will create a temporary file path that will be destroyed on program end
+        will create a temporary file path that will be destroyed on program end,
+        or reuse the model persisted in NM_ONNX_CACHE_DIR if set
     :return: if no output path, a tuple of the saved path to the model, list of
         model output names, and reference to the tempfile object will be returned
         otherwise, a tuple containing the given output_path argument, the model
         output names, and None
     """
+    if output_path is None:
+        cached = cached_onnx_rewrite(
+            model_path,
+            "truncate_transformer_onnx_model",
+            dict(
+                emb_extraction_layer=emb_extraction_layer,
+                hidden_layer_size=hidden_layer_size,
+                output_name=output_name,
+            ),
+            lambda cache_path: truncate_transformer_onnx_model(
+                model_path,
+                emb_extraction_layer,
+                hidden_layer_size,
+                output_name,
+                output_path=cache_path,
+            )[1],
+        )
+        if cached is not None:
+            cached_path, output_names = cached
+            return cached_path, output_names, None
 
     # determine where to cut the model
     final_node_name = (
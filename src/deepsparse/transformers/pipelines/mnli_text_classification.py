@@ -187,8 +187,13 @@ class MnliTextClassificationPipeline(ZeroShotTextClassificationPipelineBase):
                 "must provide only one"
             )
 
-        # check batch size divides sequences * labels
-        if (len(labels) * len(sequences)) % self._batch_size != 0:
+        # check batch size divides sequences * labels, unless partial
+        # batches are padded or merged with other requests
+        if (
+            not self.pad_remainder_batches
+            and self.max_batch_wait_ms is None
+            and (len(labels) * len(sequences)) % self._batch_size != 0
+        ):
             raise ValueError(
                 "The number of sequences times the number of labels "
                 f"({len(labels) * len(sequences)}) must be divisible by batch_size "
@@ -36,7 +36,7 @@ tasks
 
 
 import warnings
-from typing import List, Type, Union
+from typing import List, Tuple, Type, Union
 
 import numpy
 from pydantic import BaseModel, Field
@@ -185,6 +185,13 @@ class TextClassificationPipeline(TransformersPipeline):
         """
         return TextClassificationOutput
 
+    def cache_batch_fields(self) -> Tuple[str, List[str]]:
+        """
+        :return: names of the batched input and output fields, used to cache
+            each sequence of a batched request separately
+        """
+        return "sequences", ["labels", "scores"]
+
     def parse_inputs(self, *args, **kwargs) -> BaseModel:
         """
         :param args: ordered arguments to pipeline, only an input_schema object
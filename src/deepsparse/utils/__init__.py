@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .cache import *
 from .cli_helpers import *
 from .data import *
 from .onnx import *
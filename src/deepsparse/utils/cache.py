@@ -0,0 +1,164 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers for caching the results of repeated inference requests
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy
+from pydantic import BaseModel
+
+
+__all__ = [
+    "LRUCache",
+    "hash_inputs",
+]
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread safe least recently used cache with an optional time to live
+    for its entries
+
+    :param max_size: maximum number of entries to keep, the least recently
+        used entry is evicted when the cache is full
+    :param ttl_seconds: optional number of seconds after which an entry expires.
+        Default is None (entries only leave the cache when evicted)
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError(f"max_size must be a positive integer, got {max_size}")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive, got {ttl_seconds}")
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expiration time)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: total number of `get` calls that found a valid entry
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: total number of `get` calls that did not find a valid entry
+        """
+        return self._misses
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        :param key: key to look up
+        :param default: value to return if the key is missing or expired
+        :return: the cached value for the key, or `default`
+        """
+        with self._lock:
+            value, expiration = self._entries.get(key, (_MISSING, None))
+            if value is not _MISSING and (
+                expiration is not None and expiration <= time.monotonic()
+            ):
+                del self._entries[key]
+                value = _MISSING
+
+            if value is _MISSING:
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        :param key: key to store the value under
+        :param value: value to cache, evicts the least recently used entry
+            if the cache is full
+        """
+        expiration = (
+            time.monotonic() + self._ttl_seconds
+            if self._ttl_seconds is not None
+            else None
+        )
+        with self._lock:
+            self._entries[key] = (value, expiration)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries from the cache
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def hash_inputs(value: Any) -> Optional[str]:
+    """
+    Content hash of (possibly nested) inputs. Supports pydantic models,
+    numpy arrays, dicts, lists, tuples, and primitive values
+
+    :param value: inputs to hash
+    :return: hex digest of the contents of the inputs, or None if the inputs
+        contain values whose contents can not be hashed (such as file objects)
+    """
+    hasher = hashlib.sha256()
+    try:
+        _update_hash(hasher, value)
+    except TypeError:
+        return None
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher: Any, value: Any):
+    if isinstance(value, BaseModel):
+        hasher.update(type(value).__qualname__.encode())
+        value = {name: getattr(value, name) for name in value.__fields__}
+
+    if isinstance(value, numpy.ndarray):
+        array = numpy.ascontiguousarray(value)
+        hasher.update(f"ndarray:{array.dtype.str}:{array.shape}:".encode())
+        hasher.update(array.tobytes())
+    elif isinstance(value, dict):
+        hasher.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif value is None or isinstance(value, (str, bytes, bool, int, float)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, numpy.generic):
+        hasher.update(f"{value.dtype.str}:{value!r};".encode())
+    else:
+        raise TypeError(f"unable to hash contents of {type(value)}")
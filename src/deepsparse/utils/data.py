@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import logging
 import re
-from typing import List
+import struct
+import threading
+import weakref
+import zipfile
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy
 
@@ -22,9 +27,12 @@ import numpy
 __all__ = [
     "arrays_to_bytes",
     "bytes_to_arrays",
+    "arrays_to_npz_bytes",
+    "npz_bytes_to_arrays",
     "verify_outputs",
     "parse_input_shapes",
     "numpy_softmax",
+    "ArrayBufferPool",
 ]
 
 
@@ -70,6 +78,124 @@ def bytes_to_arrays(serialized_arr: bytearray) -> List[numpy.array]:
     return arrays
 
 
+def arrays_to_npz_bytes(arrays: Dict[str, numpy.ndarray]) -> bytes:
+    """
+    :param arrays: mapping of names to numpy arrays to serialize
+    :return: uncompressed `.npz` archive of the arrays, as written by `numpy.savez`
+    """
+    buffer = io.BytesIO()
+    numpy.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def npz_bytes_to_arrays(
+    serialized_npz: Union[bytes, bytearray, memoryview],
+    max_uncompressed_size: Optional[int] = None,
+) -> Dict[str, numpy.ndarray]:
+    """
+    Decodes a `.npz` archive without copying the data of its uncompressed
+    entries. Arrays of such entries are views into `serialized_npz`
+    (read-only if it is immutable), arrays of compressed entries are copies
+
+    :param serialized_npz: bytes of a `.npz` archive, such as written by
+        `numpy.savez`. Arrays with object dtypes are not supported
+    :param max_uncompressed_size: if set, the maximum size in bytes of a
+        compressed entry once decompressed, larger entries raise a ValueError
+        before they are decompressed. Default is None, no maximum
+    :return: mapping of the names of the arrays in the archive to the arrays
+    """
+    arrays = {}
+    with zipfile.ZipFile(io.BytesIO(serialized_npz)) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if name.endswith(".npy"):
+                name = name[: -len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                if (
+                    max_uncompressed_size is not None
+                    and info.file_size > max_uncompressed_size
+                ):
+                    raise ValueError(
+                        f"Entry {info.filename} of {info.file_size} bytes exceeds "
+                        f"the maximum uncompressed size of {max_uncompressed_size} "
+                        "bytes"
+                    )
+                with archive.open(info) as file:
+                    arrays[name] = _npy_file_to_array(file, info.file_size)
+                continue
+
+            # local file header: 30 fixed bytes followed by the file name and extra
+            # field, the lengths of which are stored at an offset of 26 bytes
+            name_length, extra_length = struct.unpack_from(
+                "<HH", serialized_npz, info.header_offset + 26
+            )
+            data_offset = info.header_offset + 30 + name_length + extra_length
+            arrays[name] = _npy_bytes_to_array(
+                serialized_npz, data_offset, info.file_size
+            )
+    return arrays
+
+
+def _npy_bytes_to_array(
+    buffer: Union[bytes, bytearray, memoryview], offset: int, size: int
+) -> numpy.ndarray:
+    # .npy layout: magic string (6 bytes), version (2 bytes),
+    # header length (2 bytes for version 1, 4 bytes for versions 2 and 3), header
+    major_version = buffer[offset + 6]
+    length_format, length_size = ("<H", 2) if major_version == 1 else ("<I", 4)
+    (header_length,) = struct.unpack_from(length_format, buffer, offset + 8)
+    prefix_length = 8 + length_size + header_length
+    npy_prefix = io.BytesIO(bytes(buffer[offset : offset + prefix_length]))
+
+    version = numpy.lib.format.read_magic(npy_prefix)
+    if version == (1, 0):
+        header = numpy.lib.format.read_array_header_1_0(npy_prefix)
+    elif version == (2, 0):
+        header = numpy.lib.format.read_array_header_2_0(npy_prefix)
+    else:
+        # header format without a public reader, fall back to a copy
+        npy_bytes = io.BytesIO(bytes(buffer[offset : offset + size]))
+        return _npy_file_to_array(npy_bytes, size)
+
+    shape, fortran_order, dtype = header
+    _check_npy_data_size(shape, dtype, size - prefix_length)
+    array = numpy.frombuffer(
+        buffer,
+        dtype=dtype,
+        count=int(numpy.prod(shape)),
+        offset=offset + prefix_length,
+    )
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _npy_file_to_array(file, size: int) -> numpy.ndarray:
+    # the header is checked first, as numpy allocates the declared array
+    # before reading its data
+    version = numpy.lib.format.read_magic(file)
+    if version == (1, 0):
+        shape, _, dtype = numpy.lib.format.read_array_header_1_0(file)
+    else:
+        # versions 2 and 3 share the header layout
+        shape, _, dtype = numpy.lib.format.read_array_header_2_0(file)
+    _check_npy_data_size(shape, dtype, size - file.tell())
+    file.seek(0)
+    return numpy.lib.format.read_array(file, allow_pickle=False)
+
+
+def _check_npy_data_size(shape: Tuple[int, ...], dtype: numpy.dtype, size: int):
+    if dtype.hasobject:
+        raise ValueError("Arrays with object dtypes can not be decoded")
+    # python integers, a product of numpy integers may overflow
+    data_size = dtype.itemsize
+    for dimension in shape:
+        data_size *= dimension
+    if data_size > size:
+        raise ValueError(
+            f"Array of shape {shape} and dtype {dtype} declares {data_size} "
+            f"bytes of data, only {size} bytes are available"
+        )
+
+
 def verify_outputs(
     outputs: List[numpy.array],
     gt_outputs: List[numpy.array],
@@ -162,3 +288,65 @@ def numpy_softmax(x: numpy.ndarray, axis: int = 0):
     e_x_sum = numpy.sum(e_x, axis=axis, keepdims=True)
     softmax_x = e_x / e_x_sum
     return softmax_x
+
+
+class ArrayBufferPool:
+    """
+    Thread safe pool of reusable numpy arrays keyed by (shape, dtype).
+    Arrays are taken from the pool with `acquire` and handed back with `release`
+    once the caller no longer uses them, so repeated requests of the same
+    shapes do not allocate new memory. The pool only holds weak references to
+    the arrays in use, arrays that are never released (e.g. outputs of an
+    abandoned stream) are garbage collected as usual
+
+    :param max_buffers_per_key: maximum number of free arrays kept for each
+        (shape, dtype) pair, additional released arrays are dropped. Default is 2
+    """
+
+    def __init__(self, max_buffers_per_key: int = 2):
+        if max_buffers_per_key < 1:
+            raise ValueError(
+                "max_buffers_per_key must be a positive integer, "
+                f"got {max_buffers_per_key}"
+            )
+        self._max_buffers_per_key = max_buffers_per_key
+        self._lock = threading.Lock()
+        self._free: Dict[Tuple[Tuple[int, ...], str], List[numpy.ndarray]] = {}
+        self._in_use: "weakref.WeakValueDictionary[int, numpy.ndarray]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def acquire(self, shape: Tuple[int, ...], dtype: numpy.dtype) -> numpy.ndarray:
+        """
+        :param shape: shape of the array to acquire
+        :param dtype: dtype of the array to acquire
+        :return: an uninitialized array of the given shape and dtype, reused from
+            the pool if a free one is available
+        """
+        key = (tuple(shape), numpy.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            array = free.pop() if free else None
+        if array is None:
+            array = numpy.empty(key[0], dtype=key[1])
+        with self._lock:
+            self._in_use[id(array)] = array
+        return array
+
+    def release(self, array: numpy.ndarray) -> bool:
+        """
+        :param array: array, or view of an array, previously returned by `acquire`
+        :return: True if the array was returned to the pool, False if it was not
+            acquired from this pool
+        """
+        while isinstance(array.base, numpy.ndarray):
+            array = array.base
+        key = (array.shape, array.dtype.str)
+        with self._lock:
+            if self._in_use.get(id(array)) is not array:
+                return False
+            del self._in_use[id(array)]
+            free = self._free.setdefault(key, [])
+            if len(free) < self._max_buffers_per_key:
+                free.append(array)
+        return True
@@ -13,16 +13,21 @@
 # limitations under the License.
 
 import contextlib
+import fcntl
+import hashlib
+import json
 import logging
 import os
+import shutil
 import tempfile
 from tempfile import NamedTemporaryFile
-from typing import List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy
 import onnx
 
 from deepsparse.utils.extractor import Extractor
+from deepsparse.version import __version__
 
 
 try:
@@ -46,10 +51,22 @@ __all__ = [
     "override_onnx_input_shapes",
     "truncate_onnx_model",
     "truncate_onnx_embedding_model",
+    "NM_ONNX_CACHE_DIR",
+    "onnx_cache_dir",
+    "cached_onnx_rewrite",
 ]
 
 _LOGGER = logging.getLogger(__name__)
 
+# environment variable with the directory to persist rewritten ONNX models in
+NM_ONNX_CACHE_DIR = "NM_ONNX_CACHE_DIR"
+
+_CACHED_MODEL_NAME = "model.onnx"
+_CACHED_METADATA_NAME = "metadata.json"
+_EXTERNAL_DATA_INDEX_SUFFIX = ".external_data.json"
+# (path, size, mtime) of a model -> paths of its external data files
+_EXTERNAL_DATA_PATHS = {}
+
 ONNX_TENSOR_TYPE_MAP = {
     1: numpy.float32,
     2: numpy.uint8,
@@ -109,6 +126,150 @@ def save_onnx_to_temp_files(model: Model) -> str:
             os.unlink(external_data_path)
 
 
+def onnx_cache_dir() -> Optional[str]:
+    """
+    :return: directory rewritten ONNX models are cached in, set by the
+        NM_ONNX_CACHE_DIR environment variable. None if caching is disabled
+    """
+    return os.getenv(NM_ONNX_CACHE_DIR) or None
+
+
+def cached_onnx_rewrite(
+    onnx_filepath: str,
+    rewrite_name: str,
+    rewrite_params: Dict[str, Any],
+    rewrite: Callable[[str], Any],
+) -> Optional[Tuple[str, Any]]:
+    """
+    Looks up the result of rewriting an ONNX model in the persistent ONNX cache
+    directory, running and caching the rewrite if it is not found. Entries are
+    keyed by the path, size, and modification time of the model file and of its
+    external data files, the rewrite, and its parameters, so that looking up an
+    entry does not read the model. The external data files of a model are
+    listed once and recorded in the cache directory.
+    Concurrent processes populating the same entry wait on a file lock and
+    entries are moved into place atomically, so partially written models are
+    never read
+
+    :param onnx_filepath: file path to the ONNX model to rewrite
+    :param rewrite_name: name of the rewrite applied to the model
+    :param rewrite_params: JSON serializable parameters of the rewrite
+    :param rewrite: function that saves the rewritten model to the given file
+        path and returns JSON serializable metadata of the rewrite. The file
+        does not need to be written if the metadata records it is not needed
+    :return: None if the cache is disabled, otherwise a tuple of the file path
+        to the cached rewritten model and the metadata returned by `rewrite`
+    """
+    cache_dir = onnx_cache_dir()
+    if cache_dir is None:
+        return None
+
+    key = hashlib.sha256(
+        json.dumps(
+            [
+                __version__,
+                _file_stat_key(onnx_filepath),
+                [
+                    _file_stat_key(path)
+                    for path in _external_data_paths(onnx_filepath, cache_dir)
+                ],
+                rewrite_name,
+            ],
+            sort_keys=True,
+        ).encode()
+        + json.dumps(rewrite_params, sort_keys=True).encode()
+    ).hexdigest()
+    entry_dir = os.path.join(cache_dir, key)
+    model_path = os.path.join(entry_dir, _CACHED_MODEL_NAME)
+    metadata_path = os.path.join(entry_dir, _CACHED_METADATA_NAME)
+
+    if not os.path.exists(entry_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{key}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if not os.path.exists(entry_dir):
+                    _populate_onnx_cache_entry(entry_dir, rewrite)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        _LOGGER.debug(f"Found cached {rewrite_name} rewrite of {onnx_filepath}")
+
+    with open(metadata_path) as metadata_file:
+        return model_path, json.load(metadata_file)
+
+
+def _populate_onnx_cache_entry(entry_dir: str, rewrite: Callable[[str], Any]):
+    # write the entry to a staging directory and move it into place
+    # once complete so that readers only ever see finished entries
+    staging_dir = tempfile.mkdtemp(
+        dir=os.path.dirname(entry_dir), prefix=f".{os.path.basename(entry_dir)}-"
+    )
+    try:
+        metadata = rewrite(os.path.join(staging_dir, _CACHED_MODEL_NAME))
+        with open(os.path.join(staging_dir, _CACHED_METADATA_NAME), "w") as file:
+            json.dump(metadata, file)
+        os.rename(staging_dir, entry_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+
+def _file_stat_key(file_path: str) -> Tuple[str, int, int]:
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def _external_data_paths(onnx_filepath: str, cache_dir: str) -> List[str]:
+    # the model is only parsed (without its external data) the first time it
+    # is seen, the paths are then read from an index file in the cache directory
+    stat_key = _file_stat_key(onnx_filepath)
+    if stat_key in _EXTERNAL_DATA_PATHS:
+        return _EXTERNAL_DATA_PATHS[stat_key]
+
+    index_path = os.path.join(
+        cache_dir,
+        hashlib.sha256(json.dumps(stat_key).encode()).hexdigest()
+        + _EXTERNAL_DATA_INDEX_SUFFIX,
+    )
+    if os.path.exists(index_path):
+        with open(index_path) as index_file:
+            paths = json.load(index_file)
+    else:
+        model = onnx.load(onnx_filepath, load_external_data=False)
+        model_dir = os.path.dirname(stat_key[0])
+        locations = {
+            entry.value
+            for tensor in _graph_tensors(model.graph)
+            if tensor.data_location == onnx.TensorProto.EXTERNAL
+            for entry in tensor.external_data
+            if entry.key == "location"
+        }
+        paths = sorted(os.path.join(model_dir, location) for location in locations)
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=cache_dir, suffix=".tmp", delete=False
+        ) as index_file:
+            json.dump(paths, index_file)
+        os.replace(index_file.name, index_path)
+    _EXTERNAL_DATA_PATHS[stat_key] = paths
+    return paths
+
+
+def _graph_tensors(graph: onnx.GraphProto):
+    # tensors of the initializers and node attributes, including subgraphs
+    yield from graph.initializer
+    for node in graph.node:
+        for attribute in node.attribute:
+            if attribute.HasField("t"):
+                yield attribute.t
+            yield from attribute.tensors
+            if attribute.HasField("g"):
+                yield from _graph_tensors(attribute.g)
+            for subgraph in attribute.graphs:
+                yield from _graph_tensors(subgraph)
+
+
 def translate_onnx_type_to_numpy(tensor_type: int):
     """
     Translates ONNX types to numpy types
@@ -230,10 +391,29 @@ def generate_random_inputs(
 def override_onnx_batch_size(onnx_filepath: str, batch_size: int) -> str:
     """
     Rewrite batch sizes of ONNX model, saving the modified model and returning its path
+    (if NM_ONNX_CACHE_DIR is set, the modified model is persisted there and reused)
     :param onnx_filepath: File path to ONNX model
     :param batch_size: Override for the batch size dimension
     :return: File path to modified ONNX model
     """
+    cached = cached_onnx_rewrite(
+        onnx_filepath,
+        "override_onnx_batch_size",
+        dict(batch_size=batch_size),
+        lambda output_path: save_onnx(
+            _override_onnx_batch_size(onnx_filepath, batch_size),
+            output_path,
+            "external_data",
+        ),
+    )
+    if cached is not None:
+        return contextlib.nullcontext(cached[0])
+
+    # Save modified model, this will be cleaned up when context is exited
+    return save_onnx_to_temp_files(_override_onnx_batch_size(onnx_filepath, batch_size))
+
+
+def _override_onnx_batch_size(onnx_filepath: str, batch_size: int) -> Model:
     model = onnx.load(onnx_filepath)
     all_inputs = model.graph.input
     initializer_input_names = [node.name for node in model.graph.initializer]
@@ -242,9 +422,7 @@ def override_onnx_batch_size(onnx_filepath: str, batch_size: int) -> str:
     ]
     for external_input in external_inputs:
         external_input.type.tensor_type.shape.dim[0].dim_value = batch_size
-
-    # Save modified model, this will be cleaned up when context is exited
-    return save_onnx_to_temp_files(model)
+    return model
 
 
 def override_onnx_input_shapes(
@@ -252,6 +430,7 @@ def override_onnx_input_shapes(
 ) -> str:
     """
     Rewrite input shapes of ONNX model, saving the modified model and returning its path
+    (if NM_ONNX_CACHE_DIR is set, the modified model is persisted there and reused)
     :param onnx_filepath: File path to ONNX model
     :param input_shapes: Override for model's input shapes
     :return: File path to modified ONNX model
@@ -260,6 +439,28 @@ def override_onnx_input_shapes(
     if input_shapes is None:
         return onnx_filepath
 
+    cached = cached_onnx_rewrite(
+        onnx_filepath,
+        "override_onnx_input_shapes",
+        dict(input_shapes=input_shapes),
+        lambda output_path: save_onnx(
+            _override_onnx_input_shapes(onnx_filepath, input_shapes),
+            output_path,
+            "external_data",
+        ),
+    )
+    if cached is not None:
+        return contextlib.nullcontext(cached[0])
+
+    # Save modified model, this will be cleaned up when context is exited
+    return save_onnx_to_temp_files(
+        _override_onnx_input_shapes(onnx_filepath, input_shapes)
+    )
+
+
+def _override_onnx_input_shapes(
+    onnx_filepath: str, input_shapes: Union[List[int], List[List[int]]]
+) -> Model:
     model = onnx.load(onnx_filepath)
     all_inputs = model.graph.input
     initializer_input_names = [node.name for node in model.graph.initializer]
@@ -294,9 +495,7 @@ def override_onnx_input_shapes(
         )
         for dim_idx, dim in enumerate(external_input.type.tensor_type.shape.dim):
             dim.dim_value = input_shapes[input_idx][dim_idx]
-
-    # Save modified model, this will be cleaned up when context is exited
-    return save_onnx_to_temp_files(model)
+    return model
 
 
 def truncate_onnx_model(
@@ -390,13 +589,28 @@ def truncate_onnx_embedding_model(
         string, then the name of the last node in the truncated graph.
         default is None.
     :param output_filepath: path to write resulting onnx file. If not provided,
-        will create a temporary file path that will be destroyed on program end
+        will create a temporary file path that will be destroyed on program end,
+        or reuse the model persisted in NM_ONNX_CACHE_DIR if set
     :return: if no output path, a tuple of the saved path to the model, list of
         model output names, and reference to the tempfile object will be returned
         otherwise, a tuple containing the given output_path argument, the model
         output names, and None
     """
 
+    if output_filepath is None:
+
+        def _truncate(output_path: str):
+            truncate_onnx_embedding_model(model_path, emb_extraction_layer, output_path)
+
+        cached = cached_onnx_rewrite(
+            model_path,
+            "truncate_onnx_embedding_model",
+            dict(emb_extraction_layer=emb_extraction_layer),
+            _truncate,
+        )
+        if cached is not None:
+            return cached[0], None
+
     tmp_file = None
     if output_filepath is None:
         tmp_file = NamedTemporaryFile()
@@ -19,7 +19,7 @@ import numpy
 
 import torch
 from deepsparse import Pipeline
-from deepsparse.utils import model_to_path
+from deepsparse.utils import ArrayBufferPool, model_to_path
 from deepsparse.yolact.schemas import YOLACTInputSchema, YOLACTOutputSchema
 from deepsparse.yolact.utils import (
     decode,
@@ -169,10 +169,18 @@ class YOLACTPipeline(Pipeline):
     @staticmethod
     def join_engine_outputs(
         batch_outputs: List[List[numpy.ndarray]],
+        orig_batch_size: Optional[int] = None,
+        buffer_pool: Optional[ArrayBufferPool] = None,
     ) -> List[numpy.ndarray]:
         boxes, confidence, masks, priors, protos = Pipeline.join_engine_outputs(
-            batch_outputs
+            batch_outputs, buffer_pool=buffer_pool
         )
+        if orig_batch_size is not None:
+            # remove padded rows from the outputs with a batch dimension
+            boxes, confidence, masks, protos = (
+                output[:orig_batch_size]
+                for output in (boxes, confidence, masks, protos)
+            )
 
         # priors never has a batch dimension
         # so the above step doesn't concat along a batch dimension
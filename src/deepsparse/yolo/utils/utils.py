@@ -29,6 +29,7 @@ import torchvision
 import yaml
 
 import torch
+from deepsparse.utils.onnx import cached_onnx_rewrite
 from deepsparse.yolo.schemas import YOLOOutput
 
 
@@ -351,8 +352,40 @@ def modify_yolo_onnx_input_shape(
     :param image_shape: 2-tuple of the image shape to resize this yolo model to
     :return: filepath to an onnx model reshaped to the given input shape will be the
         original path if the shape is the same.  Additionally returns the
-        NamedTemporaryFile for managing the scope of the object for file deletion
+        NamedTemporaryFile for managing the scope of the object for file deletion,
+        None if the model is persisted in NM_ONNX_CACHE_DIR
     """
+
+    def _reshape_and_save(output_path: str) -> bool:
+        model = _reshape_yolo_onnx_model(model_path, image_shape)
+        if model is not None:
+            onnx.save(model, output_path)
+        return model is not None
+
+    cached = cached_onnx_rewrite(
+        model_path,
+        "modify_yolo_onnx_input_shape",
+        dict(image_shape=list(image_shape)),
+        _reshape_and_save,
+    )
+    if cached is not None:
+        cached_path, reshaped = cached
+        return (cached_path if reshaped else model_path), None
+
+    model = _reshape_yolo_onnx_model(model_path, image_shape)
+    if model is None:
+        return model_path, None
+
+    tmp_file = NamedTemporaryFile()  # file will be deleted after program exit
+    onnx.save(model, tmp_file.name)
+
+    return tmp_file.name, tmp_file
+
+
+def _reshape_yolo_onnx_model(
+    model_path: str, image_shape: Tuple[int, int]
+) -> Optional[onnx.ModelProto]:
+    # returns None if the model does not need to be reshaped
     has_postprocessing = yolo_onnx_has_postprocessing(model_path)
 
     model = onnx.load(model_path)
@@ -361,10 +394,10 @@ def modify_yolo_onnx_input_shape(
     initial_x, initial_y = get_onnx_expected_image_shape(model)
 
     if not (isinstance(initial_x, int) and isinstance(initial_y, int)):
-        return model_path, None  # model graph does not have static integer input shape
+        return None  # model graph does not have static integer input shape
 
     if (initial_x, initial_y) == tuple(image_shape):
-        return model_path, None  # no shape modification needed
+        return None  # no shape modification needed
 
     # override input shape
     model_input.type.tensor_type.shape.dim[2].dim_value = image_shape[0]
@@ -396,10 +429,7 @@ def modify_yolo_onnx_input_shape(
         )
         set_tensor_dim_shape(model.graph.output[0], 1, num_predictions)
 
-    tmp_file = NamedTemporaryFile()  # file will be deleted after program exit
-    onnx.save(model, tmp_file.name)
-
-    return tmp_file.name, tmp_file
+    return model
 
 
 def get_tensor_dim_shape(tensor: onnx.TensorProto, dim: int) -> int:
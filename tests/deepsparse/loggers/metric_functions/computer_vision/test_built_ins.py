@@ -25,6 +25,9 @@ from deepsparse.loggers.metric_functions import (
     std_pixels_per_channel,
     std_score_per_detection,
 )
+from deepsparse.loggers.metric_functions.computer_vision import (
+    built_ins as computer_vision_built_ins,
+)
 
 
 def _generate_array_and_fill_with_n_zeros(fill_value, shape, n_zeros):
@@ -210,3 +213,20 @@ def test_mean_score_per_detection(scores, expected_mean_score):
 def test_std_score_per_detection(scores, expected_std_score):
     result = std_score_per_detection(scores)
     numpy.testing.assert_allclose(result, expected_std_score, atol=1e-5)
+
+
+@pytest.mark.parametrize("dtype", [numpy.uint8, numpy.int8, numpy.uint16])
+@pytest.mark.parametrize(
+    "shape, channel_dim",
+    [((4, 3, 32, 32), 1), ((4, 32, 32, 3), 3), ((3, 32, 32), 0), ((32, 32, 3), 2)],
+)
+def test_std_pixels_per_channel_integer(shape, channel_dim, dtype, monkeypatch):
+    # small chunks to exercise accumulating the histograms of the chunks
+    monkeypatch.setattr(computer_vision_built_ins, "_MAX_CHUNK_ELEMENTS", 1000)
+    info = numpy.iinfo(dtype)
+    image = numpy.random.randint(info.min, info.max + 1, size=shape).astype(dtype)
+
+    axes = tuple(dim for dim in range(len(shape)) if dim != channel_dim)
+    expected_stds = image.astype(numpy.float64).std(axis=axes)
+    result = std_pixels_per_channel(image)
+    numpy.testing.assert_allclose(list(result.values()), expected_stds)
@@ -0,0 +1,40 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy
+
+import pytest
+from deepsparse.loggers.metric_functions.utils import segment_means, segment_stds
+
+
+@pytest.mark.parametrize(
+    "segments",
+    [
+        [[0.5, 0.5, 0.5], [0.6, 0.7, 0.8], [1.0]],
+        [[], [0.1, 0.2], [], [], [0.3]],
+        [[0.9], []],
+    ],
+)
+def test_segment_statistics(segments):
+    values = numpy.array([value for segment in segments for value in segment])
+    lengths = [len(segment) for segment in segments]
+
+    expected_means = [
+        numpy.mean(segment) if segment else numpy.nan for segment in segments
+    ]
+    expected_stds = [
+        numpy.std(segment) if segment else numpy.nan for segment in segments
+    ]
+    numpy.testing.assert_allclose(segment_means(values, lengths), expected_means)
+    numpy.testing.assert_allclose(segment_stds(values, lengths), expected_stds)
@@ -14,13 +14,19 @@
 
 
 import logging
+import threading
 import time
 from pathlib import Path
 
 import numpy
 
 import pytest
-from deepsparse.loggers import AsyncLogger, FunctionLogger, MetricCategories
+from deepsparse.loggers import (
+    AsyncLogger,
+    BaseLogger,
+    FunctionLogger,
+    MetricCategories,
+)
 from tests.deepsparse.loggers.helpers import (
     ErrorLogger,
     FileLogger,
@@ -98,6 +104,78 @@ def test_async_logger_error_propagation(caplog):
     assert "RuntimeError('Raising for testing purposes')" in caplog.messages[0]
 
 
+class _BlockingListLogger(BaseLogger):
+    # records logged values once released, so that the queue can be filled
+    def __init__(self):
+        self.released = threading.Event()
+        self.values = []
+        self.num_dropped_values = []
+
+    def log(self, identifier, value, category, **kwargs):
+        self.released.wait()
+        if identifier == "async_logging/num_dropped_entries":
+            self.num_dropped_values.append(value)
+        else:
+            self.values.append(value)
+
+
+@pytest.mark.parametrize(
+    "overflow_policy,expected_values",
+    [
+        ("drop_oldest", [0, 7, 8, 9]),
+        ("drop_newest", [0, 1, 2, 3]),
+    ],
+)
+def test_async_logger_overflow_policy(overflow_policy, expected_values):
+    wrapped_logger = _BlockingListLogger()
+    logger = AsyncLogger(
+        logger=wrapped_logger, max_queue_size=3, overflow_policy=overflow_policy
+    )
+
+    logger.log("test_log", 0, MetricCategories.SYSTEM)
+    # wait for the worker to take the first entry and block on it
+    while logger.queue_size:
+        time.sleep(0.01)
+    for value in range(1, 10):
+        logger.log("test_log", value, MetricCategories.SYSTEM)
+
+    assert logger.queue_size == 3
+    assert logger.num_dropped == 6
+
+    wrapped_logger.released.set()
+    time.sleep(0.2)
+    assert wrapped_logger.values == expected_values
+    # the number of dropped entries is logged once it changes
+    assert wrapped_logger.num_dropped_values == [6]
+
+
+def test_async_logger_sample_overflow():
+    wrapped_logger = _BlockingListLogger()
+    logger = AsyncLogger(
+        logger=wrapped_logger, max_queue_size=10, overflow_policy="sample"
+    )
+
+    logger.log("test_log", 0, MetricCategories.SYSTEM)
+    while logger.queue_size:
+        time.sleep(0.01)
+    for value in range(1, 1000):
+        logger.log("test_log", value, MetricCategories.SYSTEM)
+    assert logger.num_dropped == 989
+
+    wrapped_logger.released.set()
+    time.sleep(0.2)
+
+    # the queue holds a uniform sample of all entries logged while it was full
+    sampled_values = wrapped_logger.values[1:]
+    assert len(set(sampled_values)) == 10
+    assert max(sampled_values) > 100
+
+
+def test_async_logger_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        AsyncLogger(logger=NullLogger(), overflow_policy="block")
+
+
 def _log_and_test_time_elasped(logger, logged_value, max_time_elapsed_ms):
     log_call_start = time.time()
     logger.log("test_log", logged_value, MetricCategories.SYSTEM)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 import yaml
 
 import pytest
@@ -22,12 +24,17 @@ from deepsparse import (
     default_logger,
     logger_from_config,
 )
+from deepsparse.loggers import MetricCategories
 from deepsparse.loggers.build_logger import (
     build_logger,
     build_system_loggers,
     system_logging_config_to_groups,
 )
-from deepsparse.loggers.config import MetricFunctionConfig, PipelineSystemLoggingConfig
+from deepsparse.loggers.config import (
+    AsyncLoggingConfig,
+    MetricFunctionConfig,
+    PipelineSystemLoggingConfig,
+)
 from tests.deepsparse.loggers.helpers import ListLogger, fetch_leaf_logger
 from tests.helpers import find_free_port
 from tests.utils import mock_engine
@@ -220,6 +227,48 @@ def test_build_system_loggers(
     ] == number_leaf_loggers_per_system_logger
 
 
+def test_logger_from_config_async_logging():
+    logger = logger_from_config(
+        """
+async_logging:
+    max_queue_size: 16
+    overflow_policy: drop_newest"""
+    )
+    assert logger.max_queue_size == 16
+    assert logger.overflow_policy == "drop_newest"
+
+    with pytest.raises(ValueError):
+        logger_from_config(
+            """
+async_logging:
+    overflow_policy: block"""
+        )
+
+
+def test_num_dropped_entries_system_logging():
+    system_logging_config = system_logging_config_to_groups(
+        PipelineSystemLoggingConfig(async_logging={"enable": True})
+    )
+    logger = build_logger(
+        system_logging_config=system_logging_config,
+        loggers_config={
+            "list_logger": {"path": "tests/deepsparse/loggers/helpers.py:ListLogger"}
+        },
+        async_logging_config=AsyncLoggingConfig(max_queue_size=1),
+    )
+    leaf_logger = fetch_leaf_logger(logger)
+    for value in range(1000):
+        logger.log("prediction_latency/total", value, MetricCategories.SYSTEM)
+    time.sleep(0.2)
+
+    assert logger.num_dropped > 0
+    num_dropped_calls = [
+        call for call in leaf_logger.calls if "async_logging/num_dropped" in call
+    ]
+    assert num_dropped_calls
+    assert f"value:{logger.num_dropped}," in num_dropped_calls[-1]
+
+
 def test_default_logger(tmp_path):
     assert isinstance(default_logger()["python"], PythonLogger)
 
@@ -0,0 +1,85 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from deepsparse.loggers import (
+    AsyncLogger,
+    FunctionLogger,
+    MetricCategories,
+    MultiLogger,
+    helpers,
+)
+from tests.deepsparse.loggers.helpers import ListLogger
+
+
+def _function_logger(target_identifier):
+    return FunctionLogger(
+        logger=ListLogger(),
+        target_identifier=target_identifier,
+        function=lambda value: value,
+        function_name="identity",
+    )
+
+
+def test_multi_logger_dispatches_to_subscribers():
+    engine_logger = _function_logger("pipeline/engine_inputs")
+    regex_logger = _function_logger("re:.*/pipeline_inputs")
+    logger = MultiLogger([engine_logger, regex_logger])
+
+    assert logger.is_subscribed("pipeline/engine_inputs")
+    assert logger.is_subscribed("pipeline/pipeline_inputs")
+    assert not logger.is_subscribed("pipeline/pipeline_outputs")
+
+    for identifier in ["pipeline/engine_inputs", "pipeline/pipeline_outputs"]:
+        logger.log(identifier, 1, MetricCategories.DATA)
+
+    assert len(engine_logger.logger.calls) == 1
+    assert len(regex_logger.logger.calls) == 0
+
+
+def test_identifier_matching_is_memoized():
+    logger = _function_logger("pipeline/engine_inputs")
+    with mock.patch(
+        "deepsparse.loggers.function_logger.check_identifier_match",
+        wraps=helpers.check_identifier_match,
+    ) as check_identifier_match:
+        for _ in range(3):
+            logger.log("pipeline/engine_inputs", 1, MetricCategories.DATA)
+            logger.log("pipeline/pipeline_outputs", 1, MetricCategories.DATA)
+
+    assert check_identifier_match.call_count == 2
+    assert len(logger.logger.calls) == 3
+
+
+def test_recently_logged_identifiers_stay_memoized(monkeypatch):
+    monkeypatch.setattr("deepsparse.loggers.function_logger._MAX_CACHED_IDENTIFIERS", 4)
+    logger = _function_logger("pipeline/engine_inputs")
+    with mock.patch(
+        "deepsparse.loggers.function_logger.check_identifier_match",
+        wraps=helpers.check_identifier_match,
+    ) as check_identifier_match:
+        for index in range(10):
+            # a hot identifier between many distinct ones is not evicted
+            logger.log("pipeline/engine_inputs", 1, MetricCategories.DATA)
+            logger.log(f"pipeline/other_{index}", 1, MetricCategories.DATA)
+
+    assert check_identifier_match.call_count == 11
+    assert len(logger.logger.calls) == 10
+
+
+def test_leaf_loggers_are_subscribed_to_all_identifiers():
+    logger = AsyncLogger(MultiLogger([ListLogger()]))
+    assert logger.is_subscribed("any/identifier")
+    assert not AsyncLogger(MultiLogger([])).is_subscribed("any/identifier")
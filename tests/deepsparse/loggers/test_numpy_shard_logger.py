@@ -0,0 +1,144 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+
+import numpy
+
+from deepsparse.loggers import (
+    MetricCategories,
+    NumpyShardLogger,
+    load_numpy_shards,
+)
+from deepsparse.loggers.build_logger import build_logger
+from deepsparse.loggers.config import MetricFunctionConfig
+from tests.deepsparse.loggers.helpers import fetch_leaf_logger
+
+
+def test_shards_round_trip(tmp_path):
+    logger = NumpyShardLogger(str(tmp_path), max_rows_per_shard=4)
+    values = [numpy.full((2, 3), index, dtype=numpy.float32) for index in range(10)]
+    for value in values:
+        logger.log("pipeline/pipeline_inputs.images", value, MetricCategories.DATA)
+    # not recorded
+    logger.log("pipeline/prediction_latency", 1.0, MetricCategories.SYSTEM)
+    logger.flush()
+
+    shards = load_numpy_shards(str(tmp_path), "pipeline/pipeline_inputs.images")
+    assert [len(shard_values) for shard_values, _ in shards] == [4, 4, 2]
+    assert all(isinstance(shard_values, numpy.memmap) for shard_values, _ in shards)
+
+    loaded_values = numpy.concatenate([shard_values for shard_values, _ in shards])
+    timestamps = numpy.concatenate([shard_timestamps for _, shard_timestamps in shards])
+    numpy.testing.assert_array_equal(loaded_values, numpy.stack(values))
+    assert len(timestamps) == 10 and numpy.all(numpy.diff(timestamps) >= 0)
+    assert not os.path.exists(tmp_path / "pipeline" / "prediction_latency")
+
+
+def test_batched_values_and_shape_changes(tmp_path):
+    logger = NumpyShardLogger(str(tmp_path), batched=True)
+    logger.log("outputs", numpy.zeros((2, 5)), MetricCategories.DATA)
+    logger.log("outputs", numpy.ones((3, 5)), MetricCategories.DATA)
+    # a new row shape starts a new shard
+    logger.log("outputs", numpy.ones((1, 7)), MetricCategories.DATA)
+    logger.log("sequences", ["foo", "bar"], MetricCategories.DATA)
+    logger.close()
+
+    shapes = [values.shape for values, _ in load_numpy_shards(str(tmp_path), "outputs")]
+    assert shapes == [(5, 5), (1, 7)]
+    ((sequences, _),) = load_numpy_shards(str(tmp_path), "sequences")
+    assert sequences.tolist() == ["foo", "bar"]
+
+
+def test_dtype_changes(tmp_path):
+    logger = NumpyShardLogger(str(tmp_path))
+    logger.log("values", 1, MetricCategories.DATA)
+    # a new dtype starts a new shard instead of promoting the buffered rows
+    logger.log("values", "foo", MetricCategories.DATA)
+    logger.close()
+
+    shards = load_numpy_shards(str(tmp_path), "values")
+    assert [values.dtype.kind for values, _ in shards] == ["i", "U"]
+    assert [values.tolist() for values, _ in shards] == [[1], ["foo"]]
+
+
+def test_values_copied_when_buffered(tmp_path):
+    logger = NumpyShardLogger(str(tmp_path))
+    value = numpy.zeros(3)
+    logger.log("values", value, MetricCategories.DATA)
+    # e.g. a reused output buffer
+    value[:] = 1
+    logger.close()
+
+    ((values, _),) = load_numpy_shards(str(tmp_path), "values")
+    assert values.tolist() == [[0, 0, 0]]
+
+
+def test_flushed_at_exit(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(
+        "deepsparse.loggers.numpy_shard_logger.atexit.register", registered.append
+    )
+    logger = NumpyShardLogger(str(tmp_path))
+    logger.log("values", 1.0, MetricCategories.DATA)
+    assert registered == [logger.close]
+
+    registered[0]()
+    assert len(load_numpy_shards(str(tmp_path), "values")) == 1
+
+
+def test_rolling_shards(tmp_path):
+    for _ in range(2):
+        # shards of previous runs are kept and count towards the maximum
+        logger = NumpyShardLogger(str(tmp_path), max_rows_per_shard=1, max_shards=3)
+        for value in range(2):
+            logger.log("values", value, MetricCategories.DATA)
+        logger.close()
+
+    shards = load_numpy_shards(str(tmp_path), "values")
+    assert [int(values[0]) for values, _ in shards] == [1, 0, 1]
+    assert len(os.listdir(tmp_path / "values")) == 6
+
+
+def test_periodic_flush(tmp_path):
+    logger = NumpyShardLogger(str(tmp_path), flush_interval_seconds=0.1)
+    logger.log("values", 1.0, MetricCategories.DATA)
+    time.sleep(0.5)
+    assert len(load_numpy_shards(str(tmp_path), "values")) == 1
+    logger.close()
+
+
+def test_unsupported_values_skipped(tmp_path, caplog):
+    logger = NumpyShardLogger(str(tmp_path))
+    for _ in range(2):
+        logger.log("values", {"foo": object()}, MetricCategories.DATA)
+    logger.flush()
+    assert load_numpy_shards(str(tmp_path), "values") == []
+    assert len([record for record in caplog.records if "values" in record.message]) == 1
+
+
+def test_build_numpy_logger(tmp_path):
+    logger = build_logger(
+        data_logging_config={"identifier": [MetricFunctionConfig(func="identity")]},
+        loggers_config={"numpy": {"directory": str(tmp_path)}},
+    )
+    leaf_logger = fetch_leaf_logger(logger)
+    assert isinstance(leaf_logger, NumpyShardLogger)
+
+    logger.log("identifier", numpy.arange(3), MetricCategories.DATA)
+    time.sleep(0.2)
+    leaf_logger.flush()
+    ((values, _),) = load_numpy_shards(str(tmp_path), "identifier__identity")
+    assert values.tolist() == [[0, 1, 2]]
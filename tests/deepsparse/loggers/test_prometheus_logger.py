@@ -13,6 +13,9 @@
 # limitations under the License.
 
 
+import os
+import time
+
 import requests
 
 import pytest
@@ -172,3 +175,52 @@ def test_using_labels(engine, identifier, additional_args, expected_logs):
     response = requests.get(f"http://0.0.0.0:{port}").text
     request_log_lines = response.split("\n")
     assert set(request_log_lines).issuperset(expected_logs)
+
+
+@mock_engine(rng_seed=0)
+def test_background_textfile_export(engine, tmp_path):
+    logger = PrometheusLogger(
+        port=find_free_port(),
+        text_log_save_dir=tmp_path,
+        text_log_save_interval_seconds=0.01,
+    )
+    for _ in range(5):
+        logger.log("dummy_pipeline/background_export", 1.0, MetricCategories.DATA)
+
+    expected_line = "deepsparse_dummy_pipeline__background_export_count 5.0\n"
+    for _ in range(100):
+        if os.path.exists(logger.text_log_file_path):
+            with open(logger.text_log_file_path) as f:
+                if expected_line in f.readlines():
+                    break
+        time.sleep(0.01)
+    logger.close()
+    with open(logger.text_log_file_path) as f:
+        assert expected_line in f.readlines()
+
+
+@mock_engine(rng_seed=0)
+def test_system_metric_types(engine, tmp_path):
+    port = find_free_port()
+    logger = PrometheusLogger(port=port, text_log_save_dir=tmp_path)
+    for value in (10.0, 30.0):
+        logger.log(
+            "resource_utilization/test_memory_percent",
+            value,
+            MetricCategories.SYSTEM,
+        )
+    for value in (1, 0, 1):
+        logger.log(
+            "request_details/successful_request_test",
+            value,
+            MetricCategories.SYSTEM,
+        )
+    response_lines = set(requests.get(f"http://0.0.0.0:{port}").text.split("\n"))
+    # gauges hold the last value, counters the sum of the values
+    assert "deepsparse_resource_utilization__test_memory_percent 30.0" in (
+        response_lines
+    )
+    assert (
+        "deepsparse_request_details__successful_request_test_total 2.0"
+        in response_lines
+    )
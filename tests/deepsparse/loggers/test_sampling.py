@@ -0,0 +1,116 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+from deepsparse.loggers import (
+    FrequencySampler,
+    FunctionLogger,
+    MetricCategories,
+    ProbabilitySampler,
+    RateLimitSampler,
+    ReservoirSampler,
+)
+from deepsparse.loggers.build_logger import build_logger
+from deepsparse.loggers.config import MetricFunctionConfig
+from tests.deepsparse.loggers.helpers import ListLogger, fetch_leaf_logger
+
+
+def _sample_all(sampler, items):
+    return [sampled for item in items for sampled in sampler.sample(item)]
+
+
+def test_frequency_sampler():
+    assert _sample_all(FrequencySampler(3), range(10)) == [0, 3, 6, 9]
+
+
+def test_rate_limit_sampler():
+    sampler = RateLimitSampler(max_per_second=5)
+    # the initial burst is bounded by the rate
+    assert len(_sample_all(sampler, range(100))) == 5
+    time.sleep(0.25)
+    assert len(_sample_all(sampler, range(100))) == 1
+
+
+def test_probability_sampler():
+    sampled = _sample_all(ProbabilitySampler(0.1), range(10000))
+    assert 800 < len(sampled) < 1200
+
+
+def test_reservoir_sampler():
+    sampler = ReservoirSampler(size=10, window_seconds=0.2)
+    assert _sample_all(sampler, range(1000)) == []
+    time.sleep(0.25)
+
+    # the sample of the previous window is returned by the next call
+    sampled = sampler.sample(1000)
+    assert len(set(sampled)) == 10
+    assert all(value < 1000 for value in sampled)
+    assert max(sampled) > 100
+
+
+@pytest.mark.parametrize(
+    "sampler_class,args",
+    [
+        (FrequencySampler, (0,)),
+        (RateLimitSampler, (0,)),
+        (ProbabilitySampler, (1.5,)),
+        (ReservoirSampler, (0, 1.0)),
+    ],
+)
+def test_sampler_invalid_arguments(sampler_class, args):
+    with pytest.raises(ValueError):
+        sampler_class(*args)
+
+
+def test_multiple_sampling_strategies_rejected():
+    with pytest.raises(ValueError):
+        MetricFunctionConfig(func="identity", frequency=2, sample_probability=0.5)
+
+
+def test_function_logger_run_async():
+    leaf_logger = ListLogger()
+    logger = FunctionLogger(
+        logger=leaf_logger,
+        target_identifier="identifier",
+        function=lambda value: value * 2,
+        function_name="double",
+        sampler=FrequencySampler(2),
+        run_async=True,
+    )
+    for value in range(4):
+        logger.log("identifier", value, MetricCategories.DATA)
+    time.sleep(0.2)
+
+    assert leaf_logger.calls == [
+        "identifier:identifier__double, value:0, category:MetricCategories.DATA",
+        "identifier:identifier__double, value:4, category:MetricCategories.DATA",
+    ]
+
+
+def test_build_logger_with_sampling():
+    logger = build_logger(
+        data_logging_config={
+            "identifier": [MetricFunctionConfig(func="identity", max_logs_per_second=2)]
+        },
+        loggers_config={
+            "list_logger": {"path": "tests/deepsparse/loggers/helpers.py:ListLogger"}
+        },
+    )
+    for value in range(10):
+        logger.log("identifier", value, MetricCategories.DATA)
+    time.sleep(0.2)
+
+    assert len(fetch_leaf_logger(logger).calls) == 2
@@ -14,6 +14,7 @@
 
 import pytest
 from deepsparse import BucketingPipeline, Pipeline
+from tests.helpers import BucketedAddPipeline, ValuesSchema
 from tests.utils import mock_engine
 
 
@@ -60,3 +61,45 @@ def test_text_choose_bucket(engine_mock, task):
 
     bucket, _ = pipeline._choose_bucket(["a " * 10, "a " * 12])
     assert bucket is pipeline20
+
+
+def test_bucketing_latency_profiler_merges_buckets():
+    buckets = [BucketedAddPipeline(max_values=2), BucketedAddPipeline(max_values=4)]
+    pipeline = BucketingPipeline(buckets)
+    pipeline(values=[1.0])
+    pipeline(values=[1.0, 2.0, 3.0])
+    pipeline(values=[1.0, 2.0, 3.0])
+
+    assert [
+        bucket.latency_profiler.summary()["total_inference"]["count"]
+        for bucket in buckets
+    ] == [1, 2]
+    summary = pipeline.latency_profiler.summary(reset=True)
+    assert summary["total_inference"]["count"] == 3
+
+    # resets the profilers of every bucket
+    assert all(bucket.latency_profiler.summary() == {} for bucket in buckets)
+    assert pipeline.latency_profiler.summary() == {}
+
+
+def test_bucketing_run_batch():
+    pipeline = BucketingPipeline(
+        [
+            BucketedAddPipeline(max_values=2, offset=1.0),
+            BucketedAddPipeline(max_values=4, offset=2.0),
+        ]
+    )
+    results = pipeline.run_batch(
+        [
+            dict(values=[1.0, 2.0, 3.0]),
+            dict(values=[1.0]),
+            dict(not_values=[1.0]),
+            ValuesSchema(values=[2.0, 3.0]),
+        ]
+    )
+
+    # each input runs on its bucket, in the order of the inputs
+    assert results[0].values == [3.0, 4.0, 5.0]
+    assert results[1].values == [2.0]
+    assert isinstance(results[2], Exception)
+    assert results[3].values == [3.0, 4.0]
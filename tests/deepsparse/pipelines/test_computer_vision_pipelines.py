@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from pathlib import Path
+
 import numpy
 from PIL import Image
 
 import pytest
-from deepsparse.pipelines.computer_vision import ComputerVisionSchema
+from deepsparse.pipelines.computer_vision import (
+    ComputerVisionSchema,
+    decode_image,
+    resize_and_center_crop,
+)
 from tests.deepsparse.pipelines.data_helpers import computer_vision
 
 
@@ -49,3 +55,40 @@ def test_from_files(schema_cls, image_files):
 
     for actual_img, expected_img in zip(actual.images, expected.images):
         assert actual_img.shape == expected_img.shape
+
+
+_BASILICA_PATH = str(Path(__file__).parents[0] / "sample_images" / "basilica.jpg")
+
+
+def test_decode_image():
+    with open(_BASILICA_PATH, "rb") as file:
+        data = file.read()
+    expected = numpy.asarray(Image.open(_BASILICA_PATH).convert("RGB"))
+
+    image = decode_image(data)
+    assert image.dtype == numpy.uint8
+    assert image.shape == expected.shape
+    # decoders may differ slightly in their rounding
+    assert numpy.abs(image.astype(int) - expected).mean() < 2
+
+
+@pytest.mark.parametrize("min_size", [(100, 100), (224, 224), (300, 200)])
+def test_decode_image_reduced_resolution(min_size):
+    with open(_BASILICA_PATH, "rb") as file:
+        image = decode_image(file.read(), min_size=min_size)
+    height, width, channels = image.shape
+    assert channels == 3
+    assert height >= min_size[0] and width >= min_size[1]
+    # 635 x 960 images cover these sizes at a half or less of their resolution
+    assert height <= 635 // 2 + 1 and width <= 960 // 2
+
+
+def test_resize_and_center_crop():
+    image = numpy.arange(8 * 6 * 3, dtype=numpy.uint8).reshape(8, 6, 3)
+    cropped = resize_and_center_crop(image, (8, 6), (4, 2))
+    numpy.testing.assert_array_equal(cropped, image[2:6, 2:4])
+
+    resized = resize_and_center_crop(
+        numpy.zeros((500, 300, 3), dtype=numpy.uint8), (256, 256), (224, 224)
+    )
+    assert resized.shape == (224, 224, 3)
@@ -12,17 +12,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import gc
 import time
+import weakref
 from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from unittest import mock
 
 import numpy
+from pydantic import BaseModel, ValidationError
 
 import pytest
-from deepsparse.pipeline import Pipeline, _initialize_executor_and_workers
+from deepsparse.pipeline import (
+    Pipeline,
+    _EngineInputsBatcher,
+    _initialize_executor_and_workers,
+)
+from deepsparse.utils.cache import LRUCache, hash_inputs
+from deepsparse.utils.data import ArrayBufferPool
 from tests.utils import mock_engine
 
 
+class _ValuesSchema(BaseModel):
+    values: List[float]
+
+
+class _AddOnePipeline(Pipeline):
+    # minimal pipeline that adds one to each value without compiling a model
+    def __init__(self, **kwargs):
+        super().__init__(model_path="", _delay_engine_initialize=True, **kwargs)
+
+    def setup_onnx_file_path(self):
+        return ""
+
+    def process_inputs(self, inputs):
+        return [numpy.array(inputs.values, dtype=numpy.float32).reshape(-1, 1)]
+
+    def engine_forward(self, engine_inputs):
+        return [engine_inputs[0] + 1]
+
+    def process_engine_outputs(self, engine_outputs, **kwargs):
+        return _ValuesSchema(values=engine_outputs[0].reshape(-1).tolist())
+
+    @property
+    def input_schema(self):
+        return _ValuesSchema
+
+    @property
+    def output_schema(self):
+        return _ValuesSchema
+
+
+class _CachedAddOnePipeline(_AddOnePipeline):
+    def cache_batch_fields(self):
+        return "values", ["values"]
+
+
 def test_split_engine_inputs():
     inp = [numpy.zeros((4, 28)) for _ in range(3)]
 
@@ -60,6 +106,65 @@ def test_split_engine_inputs_uneven_raises_error():
         Pipeline.split_engine_inputs([numpy.zeros((3, 28))], batch_size=2)
 
 
+def test_split_engine_inputs_pad_remainder():
+    inp = [numpy.random.rand(5, 28), numpy.random.rand(5, 4)]
+
+    out = Pipeline.split_engine_inputs(inp, batch_size=2, pad_remainder=True)
+    assert len(out) == 3
+    assert all(batch[0].shape == (2, 28) for batch in out)
+    assert all(batch[1].shape == (2, 4) for batch in out)
+    assert (out[-1][0][0] == inp[0][-1]).all()
+    assert not out[-1][0][1].any()
+
+
+def test_join_trims_padded_split():
+    inp = [numpy.random.rand(5, 28) for _ in range(3)]
+
+    out = Pipeline.split_engine_inputs(inp, batch_size=4, pad_remainder=True)
+    joined = Pipeline.join_engine_outputs(out, orig_batch_size=5)
+    assert numpy.array(joined).shape == (3, 5, 28)
+
+    for i, j in zip(inp, joined):
+        assert (i == j).all()
+
+
+def test_join_into_pooled_buffers():
+    pool = ArrayBufferPool(max_buffers_per_key=3)
+    inp = [numpy.random.rand(6, 28) for _ in range(3)]
+
+    out = Pipeline.split_engine_inputs(inp, batch_size=4, pad_remainder=True)
+    joined = Pipeline.join_engine_outputs(out, orig_batch_size=6, buffer_pool=pool)
+    for i, j in zip(inp, joined):
+        assert (i == j).all()
+
+    buffers = [output.base for output in joined]
+    for output in joined:
+        assert pool.release(output)
+    # released buffers of the same shape and dtype are reused
+    joined = Pipeline.join_engine_outputs(out, buffer_pool=pool)
+    assert {id(output) for output in joined} == {id(buffer) for buffer in buffers}
+    assert not pool.release(numpy.zeros(3))
+
+
+def test_unreleased_pooled_buffers_garbage_collected():
+    pool = ArrayBufferPool()
+    array = pool.acquire((4, 4), numpy.float32)
+    array_ref = weakref.ref(array)
+    # e.g. the outputs of an abandoned stream, never released
+    del array
+    gc.collect()
+    assert array_ref() is None
+
+
+def test_reuse_output_buffers():
+    pipeline = _AddOnePipeline(batch_size=2, reuse_output_buffers=True)
+    assert pipeline.reuse_output_buffers
+
+    for _ in range(3):
+        assert pipeline(values=[1.0, 2.0, 3.0, 4.0]).values == [2.0, 3.0, 4.0, 5.0]
+    assert pipeline(values=[5.0, 6.0]).values == [6.0, 7.0]
+
+
 @mock_engine(rng_seed=0)
 def test_split_interaction_with_forward_batch_size_1(engine_mock):
     pipeline = Pipeline.create("token_classification", batch_size=1)
@@ -147,3 +252,305 @@ def test_pipeline_call_is_async(engine_mock):
         # instead of doing a hard comparison of timing for each separate
         # duration, do relative comparison of timing
         assert numpy.allclose(dur_1_worker / dur_2_worker, 2, atol=0.1)
+
+
+def test_engine_inputs_batcher_merges_concurrent_requests():
+    batch_size = 4
+    forward_batches = []
+
+    def engine_forward(inputs):
+        assert all(inp.shape[0] == batch_size for inp in inputs)
+        forward_batches.append(inputs)
+        return [inputs[0] * 2, numpy.ones((3, 2))]
+
+    batcher = _EngineInputsBatcher(
+        engine_forward=engine_forward,
+        batch_size=batch_size,
+        max_wait_seconds=0.5,
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    requests = [[numpy.full((1, 8), float(i))] for i in range(batch_size)]
+    with ThreadPoolExecutor(max_workers=batch_size) as callers:
+        results = list(callers.map(batcher, requests))
+
+    # all four single item requests fit in one engine batch
+    assert len(forward_batches) == 1
+    for request, outputs in zip(requests, results):
+        assert len(outputs) == 1
+        scaled, shared = outputs[0]
+        assert (scaled == request[0] * 2).all()
+        # outputs without a batch dimension are shared by all callers
+        assert shared.shape == (3, 2)
+
+
+def test_engine_inputs_batcher_pads_partial_batch_after_timeout():
+    batch_size = 4
+
+    def engine_forward(inputs):
+        assert inputs[0].shape[0] == batch_size
+        return [inputs[0] + 1]
+
+    batcher = _EngineInputsBatcher(
+        engine_forward=engine_forward,
+        batch_size=batch_size,
+        max_wait_seconds=0.002,
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    inp = numpy.random.rand(6, 3)
+    batch_outputs = batcher([inp])
+    assert [out[0].shape[0] for out in batch_outputs] == [4, 2]
+
+    joined = Pipeline.join_engine_outputs(batch_outputs)
+    assert numpy.allclose(joined[0], inp + 1)
+
+
+def test_engine_inputs_batcher_forwards_exceptions():
+    def engine_forward(inputs):
+        raise RuntimeError("engine failure")
+
+    batcher = _EngineInputsBatcher(
+        engine_forward=engine_forward,
+        batch_size=2,
+        max_wait_seconds=0.002,
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    with pytest.raises(RuntimeError, match="engine failure"):
+        batcher([numpy.zeros((1, 3))])
+
+
+def test_engine_inputs_batcher_close_fails_pending_requests():
+    batcher = _EngineInputsBatcher(
+        engine_forward=lambda inputs: inputs,
+        batch_size=4,
+        max_wait_seconds=10.0,
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    # waits for the batch to fill up until closed
+    (future,) = batcher.submit([numpy.zeros((1, 3))])
+    batcher.close()
+
+    assert not batcher._thread.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        future.result(timeout=1)
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit([numpy.zeros((1, 3))])
+
+
+def test_engine_inputs_batcher_survives_failed_batches():
+    executor = ThreadPoolExecutor(max_workers=1)
+    batcher = _EngineInputsBatcher(
+        engine_forward=lambda inputs: inputs,
+        batch_size=2,
+        max_wait_seconds=0.002,
+        executor=executor,
+    )
+    executor.shutdown()
+    # the batches fail instead of leaving their callers blocked
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="shutdown"):
+            batcher([numpy.zeros((1, 3))])
+    assert batcher._thread.is_alive()
+    batcher.close()
+
+
+def test_pipeline_close_stops_engine_batcher():
+    pipeline = _AddOnePipeline(batch_size=4, max_batch_wait_ms=1)
+    assert pipeline(values=[1.0]).values == [2.0]
+    batcher_thread = pipeline._engine_batcher._thread
+
+    pipeline.close()
+    assert not batcher_thread.is_alive()
+    assert pipeline.engine is None
+    # a new batcher is started if the pipeline is used again
+    assert pipeline(values=[2.0]).values == [3.0]
+    pipeline.close()
+
+
+def test_run_stream_preserves_order():
+    pipeline = _AddOnePipeline()
+    inputs = [_ValuesSchema(values=[float(i)]) for i in range(20)]
+    # dictionaries of keyword arguments are also accepted
+    inputs.append(dict(values=[20.0]))
+
+    outputs = list(pipeline.run_stream(inputs, prefetch=3))
+    assert [output.values for output in outputs] == [[i + 1.0] for i in range(21)]
+
+
+def test_run_stream_raises_pre_process_errors():
+    pipeline = _AddOnePipeline()
+    inputs = [dict(values=[1.0]), dict(values="not a list")]
+
+    stream = pipeline.run_stream(inputs)
+    assert next(stream).values == [2.0]
+    with pytest.raises(ValidationError):
+        next(stream)
+
+
+def test_run_stream_stops_early():
+    pipeline = _AddOnePipeline()
+    stream = pipeline.run_stream(
+        (dict(values=[float(i)]) for i in range(1000)), prefetch=1
+    )
+    assert next(stream).values == [1.0]
+    stream.close()
+
+
+def test_run_async_gather():
+    pipeline = _AddOnePipeline(executor=2)
+
+    async def _run_all():
+        return await asyncio.gather(
+            *(pipeline.run_async(values=[float(i), -float(i)]) for i in range(10))
+        )
+
+    outputs = asyncio.run(_run_all())
+    assert [output.values for output in outputs] == [
+        [i + 1.0, 1.0 - i] for i in range(10)
+    ]
+
+
+def test_run_async_with_batching():
+    pipeline = _AddOnePipeline(batch_size=4, max_batch_wait_ms=10)
+
+    async def _run_all():
+        return await asyncio.gather(
+            *(pipeline.run_async(values=[float(i)]) for i in range(6))
+        )
+
+    outputs = asyncio.run(_run_all())
+    assert [output.values for output in outputs] == [[i + 1.0] for i in range(6)]
+
+
+def test_run_batch_merges_engine_batches():
+    pipeline = _AddOnePipeline(batch_size=4, reuse_output_buffers=True)
+    inputs = [
+        dict(values=[0.0]),
+        _ValuesSchema(values=[1.0, 2.0, 3.0]),
+        dict(values="not a list"),
+        dict(values=[4.0, 5.0]),
+        dict(values=[6.0, 7.0]),
+    ]
+    with mock.patch.object(
+        _AddOnePipeline, "engine_forward", wraps=pipeline.engine_forward
+    ) as engine_forward:
+        results = pipeline.run_batch(inputs)
+
+    # 8 valid rows run in 2 engine batches of 4
+    assert engine_forward.call_count == 2
+    assert isinstance(results[2], ValidationError)
+    assert [result.values for i, result in enumerate(results) if i != 2] == [
+        [1.0],
+        [2.0, 3.0, 4.0],
+        [5.0, 6.0],
+        [7.0, 8.0],
+    ]
+
+
+def test_run_batch_runs_remainder_on_its_own():
+    pipeline = _AddOnePipeline(batch_size=2)
+    results = pipeline.run_batch([dict(values=[float(i)]) for i in range(3)])
+
+    assert [result.values for result in results[:2]] == [[1.0], [2.0]]
+    # the last item can not fill a batch of 2 by itself
+    assert isinstance(results[2], RuntimeError)
+
+
+def test_result_cache_skips_repeated_items():
+    pipeline = _CachedAddOnePipeline(result_cache={"max_size": 8})
+    with mock.patch.object(
+        _AddOnePipeline, "process_inputs", wraps=pipeline.process_inputs
+    ) as process_inputs:
+        assert pipeline(values=[1.0, 2.0]).values == [2.0, 3.0]
+        assert process_inputs.call_count == 1
+
+        # only the missing item is run
+        assert pipeline(values=[2.0, 3.0, 1.0]).values == [3.0, 4.0, 2.0]
+        assert process_inputs.call_count == 2
+        assert process_inputs.call_args[0][0].values == [3.0]
+
+        # full hits skip the pipeline entirely
+        assert pipeline(values=[3.0, 1.0]).values == [4.0, 2.0]
+        assert process_inputs.call_count == 2
+
+    assert pipeline.result_cache.hits == 4
+    assert pipeline.result_cache.misses == 3
+
+
+def test_result_cache_whole_requests():
+    pipeline = _AddOnePipeline(result_cache={"max_size": 1})
+    with mock.patch.object(
+        _AddOnePipeline, "process_inputs", wraps=pipeline.process_inputs
+    ) as process_inputs:
+        outputs = pipeline(values=[1.0, 2.0])
+        outputs.values.append(5.0)
+        assert pipeline(values=[1.0, 2.0]).values == [2.0, 3.0]
+        assert process_inputs.call_count == 1
+
+        # least recently used entry is evicted
+        pipeline(values=[3.0])
+        pipeline(values=[1.0, 2.0])
+        assert process_inputs.call_count == 3
+
+    assert asyncio.run(pipeline.run_async(values=[1.0, 2.0])).values == [2.0, 3.0]
+    assert process_inputs.call_count == 3
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(max_size=2, ttl_seconds=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_hash_inputs():
+    assert hash_inputs(_ValuesSchema(values=[1.0])) == hash_inputs(
+        _ValuesSchema(values=[1.0])
+    )
+    assert hash_inputs(_ValuesSchema(values=[1.0])) != hash_inputs(
+        _ValuesSchema(values=[2.0])
+    )
+    assert hash_inputs(numpy.zeros(3)) != hash_inputs(numpy.zeros(3, dtype="int8"))
+    assert hash_inputs([object()]) is None
+
+
+def test_latency_profiler_accumulates_calls():
+    pipeline = _AddOnePipeline()
+    for _ in range(3):
+        pipeline(values=[1.0])
+
+    summary = pipeline.latency_profiler.summary()
+    assert set(summary) == {
+        "pre_process",
+        "engine_forward",
+        "post_process",
+        "total_inference",
+    }
+    assert all(phase["count"] == 3 for phase in summary.values())
+    assert summary["total_inference"]["max"] >= summary["engine_forward"]["max"]
+
+
+def test_warmup_with_sample_input():
+    pipeline = _AddOnePipeline()
+    with mock.patch.object(
+        pipeline, "engine_forward", wraps=pipeline.engine_forward
+    ) as engine_forward:
+        pipeline.warmup(2, sample_input=dict(values=[1.0]))
+    assert engine_forward.call_count == 2
+    # warmup latencies are not reported
+    assert pipeline.latency_profiler.summary() == {}
+
+
+def test_warmup_with_random_inputs():
+    pipeline = _AddOnePipeline(batch_size=4)
+    random_inputs = [numpy.zeros((4, 1), dtype=numpy.float32)]
+    with mock.patch(
+        "deepsparse.pipeline.generate_random_inputs", return_value=random_inputs
+    ) as generate_random_inputs, mock.patch.object(
+        pipeline, "engine_forward", wraps=pipeline.engine_forward
+    ) as engine_forward:
+        pipeline.warmup(3)
+    generate_random_inputs.assert_called_once_with(pipeline.onnx_file_path, 4)
+    assert engine_forward.call_count == 3
+    engine_forward.assert_called_with(random_inputs)
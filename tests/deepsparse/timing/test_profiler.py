@@ -0,0 +1,83 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from deepsparse.timing import LatencyProfiler, MergedLatencyProfiler, Timer
+
+
+def test_percentiles_within_bucket_error():
+    profiler = LatencyProfiler()
+    for millis in range(1, 1001):
+        profiler.record("engine_forward", millis / 1000)
+
+    for percentile in [1, 50, 90, 99]:
+        assert profiler.percentile("engine_forward", percentile) == pytest.approx(
+            percentile / 100, rel=0.05
+        )
+    assert profiler.percentile("engine_forward", 100) == pytest.approx(1.0)
+    assert profiler.percentile("pre_process", 50) is None
+
+
+def test_summary_and_reset():
+    profiler = LatencyProfiler(percentiles=(50, 99.9))
+    for seconds in [0.1, 0.2, 0.3]:
+        profiler.record("pre_process", seconds)
+
+    summary = profiler.summary(reset=True)
+    assert list(summary) == ["pre_process"]
+    assert set(summary["pre_process"]) == {
+        "count",
+        "mean",
+        "min",
+        "max",
+        "p50",
+        "p99.9",
+    }
+    assert summary["pre_process"]["count"] == 3
+    assert summary["pre_process"]["mean"] == pytest.approx(0.2)
+    assert summary["pre_process"]["min"] == 0.1
+    assert summary["pre_process"]["max"] == 0.3
+
+    # reset starts a new window
+    assert profiler.summary() == {}
+
+
+def test_record_timer():
+    profiler = LatencyProfiler()
+    timer = Timer()
+    for phase in ["pre_process", "post_process"]:
+        timer.start(phase)
+        timer.stop(phase)
+
+    profiler.record_timer(timer, ["pre_process", "post_process"])
+    assert profiler.phases == ["pre_process", "post_process"]
+    assert profiler.summary()["post_process"]["count"] == 1
+
+
+def test_merged_profiler():
+    profilers = [LatencyProfiler(), LatencyProfiler()]
+    profilers[0].record("engine_forward", 0.1)
+    profilers[1].record("engine_forward", 0.3)
+    profilers[1].record("pre_process", 0.2)
+
+    merged = MergedLatencyProfiler(profilers)
+    assert set(merged.phases) == {"engine_forward", "pre_process"}
+    assert merged.percentile("engine_forward", 100) == pytest.approx(0.3)
+    summary = merged.summary(reset=True)
+    assert summary["engine_forward"]["count"] == 2
+    assert summary["engine_forward"]["mean"] == pytest.approx(0.2)
+    assert summary["engine_forward"]["min"] == 0.1
+
+    # resetting the merged profiler resets every profiler
+    assert all(profiler.summary() == {} for profiler in profilers)
@@ -0,0 +1,173 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy
+import onnx
+import onnx.numpy_helper
+
+import pytest
+from deepsparse.utils import onnx as onnx_utils
+from deepsparse.utils.onnx import (
+    NM_ONNX_CACHE_DIR,
+    cached_onnx_rewrite,
+    override_onnx_input_shapes,
+)
+
+
+@pytest.fixture
+def identity_model_path(tmp_path):
+    graph = onnx.helper.make_graph(
+        nodes=[onnx.helper.make_node("Identity", ["input"], ["output"])],
+        name="identity",
+        inputs=[
+            onnx.helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, [1, 3])
+        ],
+        outputs=[
+            onnx.helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, [1, 3])
+        ],
+    )
+    model_path = str(tmp_path / "model.onnx")
+    onnx.save(onnx.helper.make_model(graph), model_path)
+    return model_path
+
+
+def _input_shape(model_path):
+    dims = onnx.load(model_path).graph.input[0].type.tensor_type.shape.dim
+    return [dim.dim_value for dim in dims]
+
+
+def test_override_input_shapes_cached(identity_model_path, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv(NM_ONNX_CACHE_DIR, cache_dir)
+
+    with override_onnx_input_shapes(identity_model_path, [4, 3]) as model_path:
+        assert model_path.startswith(cache_dir)
+        assert _input_shape(model_path) == [4, 3]
+
+    with mock.patch.object(onnx_utils.onnx, "load") as load:
+        with override_onnx_input_shapes(identity_model_path, [4, 3]) as cached_path:
+            assert cached_path == model_path
+        load.assert_not_called()
+
+    # cached models persist and new parameters create new entries
+    assert os.path.exists(model_path)
+    with override_onnx_input_shapes(identity_model_path, [8, 3]) as model_path:
+        assert _input_shape(model_path) == [8, 3]
+
+
+def test_override_input_shapes_without_cache(identity_model_path, monkeypatch):
+    monkeypatch.delenv(NM_ONNX_CACHE_DIR, raising=False)
+    with override_onnx_input_shapes(identity_model_path, [2, 3]) as model_path:
+        assert _input_shape(model_path) == [2, 3]
+    assert not os.path.exists(model_path)
+
+
+def test_cached_rewrite_concurrent_population(
+    identity_model_path, tmp_path, monkeypatch
+):
+    monkeypatch.setenv(NM_ONNX_CACHE_DIR, str(tmp_path / "cache"))
+
+    def _copy_model(path):
+        onnx.save(onnx.load(identity_model_path), path)
+        return {"rewritten": True}
+
+    rewrite = mock.Mock(side_effect=_copy_model)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(
+            executor.map(
+                lambda _: cached_onnx_rewrite(identity_model_path, "copy", {}, rewrite),
+                range(8),
+            )
+        )
+
+    assert rewrite.call_count == 1
+    assert len({path for path, _ in results}) == 1
+    assert all(metadata == {"rewritten": True} for _, metadata in results)
+
+
+def test_cached_rewrite_failure_not_cached(identity_model_path, tmp_path, monkeypatch):
+    monkeypatch.setenv(NM_ONNX_CACHE_DIR, str(tmp_path / "cache"))
+    with pytest.raises(RuntimeError):
+        cached_onnx_rewrite(
+            identity_model_path, "fail", {}, mock.Mock(side_effect=RuntimeError)
+        )
+    # only the lock and external data index files remain, no partially
+    # written entries
+    assert all(
+        name.endswith((".lock", ".external_data.json"))
+        for name in os.listdir(tmp_path / "cache")
+    )
+
+
+def test_cached_rewrite_hit_does_not_read_model(
+    identity_model_path, tmp_path, monkeypatch
+):
+    monkeypatch.setenv(NM_ONNX_CACHE_DIR, str(tmp_path / "cache"))
+    rewrite = mock.Mock(return_value={})
+    cached_onnx_rewrite(identity_model_path, "copy", {}, rewrite)
+
+    # e.g. a new process, the external data files are read from the index
+    monkeypatch.setattr(onnx_utils, "_EXTERNAL_DATA_PATHS", {})
+    with mock.patch.object(onnx_utils.onnx, "load") as load, mock.patch(
+        "builtins.open", wraps=open
+    ) as open_file:
+        cached_onnx_rewrite(identity_model_path, "copy", {}, rewrite)
+    load.assert_not_called()
+    assert identity_model_path not in [call.args[0] for call in open_file.call_args_list]
+    assert rewrite.call_count == 1
+
+
+def test_cached_rewrite_keyed_by_external_data(tmp_path, monkeypatch):
+    monkeypatch.setenv(NM_ONNX_CACHE_DIR, str(tmp_path / "cache"))
+    weights = onnx.numpy_helper.from_array(
+        numpy.zeros((1, 3), dtype=numpy.float32), name="weights"
+    )
+    graph = onnx.helper.make_graph(
+        nodes=[onnx.helper.make_node("Add", ["input", "weights"], ["output"])],
+        name="add",
+        inputs=[
+            onnx.helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, [1, 3])
+        ],
+        outputs=[
+            onnx.helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, [1, 3])
+        ],
+        initializer=[weights],
+    )
+    model_path = str(tmp_path / "model.onnx")
+    onnx.save_model(
+        onnx.helper.make_model(graph),
+        model_path,
+        save_as_external_data=True,
+        location="weights.bin",
+        size_threshold=0,
+    )
+    rewrite = mock.Mock(return_value={})
+
+    cached_onnx_rewrite(model_path, "copy", {}, rewrite)
+    cached_onnx_rewrite(model_path, "copy", {}, rewrite)
+    assert rewrite.call_count == 1
+
+    # swap the weights next to the unchanged graph file
+    weights_path = tmp_path / "weights.bin"
+    weights_path.write_bytes(numpy.ones((1, 3), dtype=numpy.float32).tobytes())
+    # a later modification time, not guaranteed within a clock tick
+    stat = os.stat(weights_path)
+    os.utime(weights_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cached_onnx_rewrite(model_path, "copy", {}, rewrite)
+    assert rewrite.call_count == 2
@@ -18,8 +18,11 @@ import time
 from subprocess import PIPE, STDOUT, CompletedProcess, run
 from typing import List
 
+import numpy
 import requests
+from pydantic import BaseModel
 
+from deepsparse import Bucketable, Pipeline
 from sparsezoo import Model
 
 
@@ -86,3 +89,57 @@ def find_free_port():
     s.close()
 
     return portnum
+
+
+class ValuesSchema(BaseModel):
+    values: List[float]
+
+
+class BucketedAddPipeline(Pipeline, Bucketable):
+    """
+    Minimal bucketable pipeline that adds `offset` to each value without
+    compiling a model, inputs are routed to the first bucket that accepts
+    their number of values
+    """
+
+    def __init__(self, max_values: int, offset: float = 0.0, **kwargs):
+        self.max_values = max_values
+        self.offset = offset
+        super().__init__(model_path="", _delay_engine_initialize=True, **kwargs)
+
+    def setup_onnx_file_path(self):
+        return ""
+
+    def process_inputs(self, inputs):
+        if len(inputs.values) > self.max_values:
+            raise ValueError(f"Expected at most {self.max_values} values")
+        return [numpy.array(inputs.values, dtype=numpy.float32).reshape(-1, 1)]
+
+    def engine_forward(self, engine_inputs):
+        return [engine_inputs[0] + self.offset]
+
+    def process_engine_outputs(self, engine_outputs, **kwargs):
+        return ValuesSchema(values=engine_outputs[0].reshape(-1).tolist())
+
+    @property
+    def input_schema(self):
+        return ValuesSchema
+
+    @property
+    def output_schema(self):
+        return ValuesSchema
+
+    @staticmethod
+    def should_bucket(*args, **kwargs):
+        return True
+
+    @staticmethod
+    def create_pipeline_buckets(*args, **kwargs):
+        return []
+
+    @staticmethod
+    def route_input_to_bucket(*args, input_schema, pipelines, **kwargs):
+        for pipeline in pipelines:
+            if len(input_schema.values) <= pipeline.max_values:
+                return pipeline
+        return pipelines[-1]
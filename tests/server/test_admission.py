@@ -0,0 +1,169 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+from deepsparse.server.admission import AdmissionController, PriorityScheduler
+from fastapi import HTTPException
+
+
+def test_admission_without_limit():
+    admission_controller = AdmissionController()
+
+    async def _enter_many():
+        async with admission_controller, admission_controller:
+            return admission_controller.in_flight
+
+    assert asyncio.run(_enter_many()) == 2
+    assert admission_controller.in_flight == 0
+
+
+def test_admission_queues_and_rejects():
+    admission_controller = AdmissionController(
+        max_concurrent_requests=1, max_queued_requests=1
+    )
+    order = []
+
+    async def _request(name, release):
+        async with admission_controller:
+            order.append(name)
+            await release.wait()
+
+    async def _run():
+        release = asyncio.Event()
+        first = asyncio.create_task(_request("first", release))
+        second = asyncio.create_task(_request("second", release))
+        await asyncio.sleep(0)
+        assert admission_controller.in_flight == 1
+        assert admission_controller.queued == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await _request("third", release)
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(_run())
+    assert order == ["first", "second"]
+    assert admission_controller.in_flight == 0
+    assert admission_controller.queued == 0
+    assert admission_controller.num_rejected == 1
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    admission_controller = AdmissionController(
+        max_concurrent_requests=1, max_queued_requests=2
+    )
+
+    async def _run():
+        release = asyncio.Event()
+
+        async def _request():
+            async with admission_controller:
+                await release.wait()
+
+        first = asyncio.create_task(_request())
+        cancelled = asyncio.create_task(_request())
+        last = asyncio.create_task(_request())
+        await asyncio.sleep(0)
+        assert admission_controller.queued == 2
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert admission_controller.queued == 1
+
+        release.set()
+        await asyncio.gather(first, last)
+        assert cancelled.cancelled()
+
+    asyncio.run(_run())
+    assert admission_controller.in_flight == 0
+
+
+def test_acquire_and_release():
+    admission_controller = AdmissionController(max_concurrent_requests=1)
+
+    async def _run():
+        await admission_controller.acquire()
+        with pytest.raises(HTTPException):
+            await admission_controller.acquire()
+        admission_controller.release()
+        await admission_controller.acquire()
+
+    asyncio.run(_run())
+    assert admission_controller.in_flight == 1
+
+
+def test_priority_scheduler_serves_high_priority_first():
+    scheduler = PriorityScheduler(num_slots=1)
+    order = []
+
+    async def _request(name, priority, release):
+        await scheduler.acquire(priority)
+        try:
+            order.append(name)
+            await release.wait()
+        finally:
+            scheduler.release()
+
+    async def _run():
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_request("running", 0, release))]
+        await asyncio.sleep(0)
+        for name, priority in [("low", 0), ("high", 10), ("low-2", 0), ("mid", 5)]:
+            tasks.append(asyncio.create_task(_request(name, priority, release)))
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 1
+        assert scheduler.queued == 4
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_run())
+    assert order == ["running", "high", "mid", "low", "low-2"]
+    assert scheduler.in_flight == 0
+
+
+def test_admission_waits_for_scheduler_slot():
+    scheduler = PriorityScheduler(num_slots=1)
+    heavy = AdmissionController(scheduler=scheduler)
+    critical = AdmissionController(scheduler=scheduler, priority=10)
+    order = []
+
+    async def _request(name, admission_controller, release):
+        async with admission_controller:
+            order.append(name)
+            await release.wait()
+
+    async def _run():
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_request(f"heavy-{index}", heavy, release))
+            for index in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_request("critical", critical, release)))
+        await asyncio.sleep(0)
+        # admitted by their endpoints, waiting for the shared slot
+        assert heavy.in_flight == 3
+        assert scheduler.queued == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_run())
+    assert order == ["heavy-0", "critical", "heavy-1", "heavy-2"]
+    assert heavy.in_flight == critical.in_flight == scheduler.in_flight == 0
@@ -97,6 +97,28 @@ def test_endpoint_config_to_pipeline_copy_fields():
     cfg = EndpointConfig(task="", model="", batch_size=64).to_pipeline_config()
     assert cfg.batch_size == 64
 
+    cfg = EndpointConfig(
+        task="", model="", result_cache={"max_size": 8}
+    ).to_pipeline_config()
+    assert cfg.result_cache.max_size == 8
+    assert cfg.result_cache.ttl_seconds is None
+
+
+def test_endpoint_config_admission_control():
+    cfg = EndpointConfig(task="", model="")
+    assert cfg.max_concurrent_requests is None
+    assert cfg.overload_status_code == 503
+
+    cfg = EndpointConfig(
+        task="", model="", max_concurrent_requests=4, overload_status_code=429
+    )
+    assert cfg.max_concurrent_requests == 4
+
+    with pytest.raises(ValueError):
+        EndpointConfig(task="", model="", max_concurrent_requests=0)
+    with pytest.raises(ValueError):
+        EndpointConfig(task="", model="", overload_status_code=500)
+
 
 def test_yaml_load_config(tmp_path):
     server_config = ServerConfig(
@@ -12,17 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
-from unittest.mock import Mock
-
-from pydantic import BaseModel
+import asyncio
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy
+from pydantic import BaseModel, ValidationError
 
 import pytest
+from deepsparse import BucketingPipeline, Pipeline
 from deepsparse.loggers import MultiLogger
+from deepsparse.server.admission import AdmissionController
+from deepsparse.server.binary_format import NPZ_MEDIA_TYPE, BinaryTensorRoute
 from deepsparse.server.config import EndpointConfig, ServerConfig, SystemLoggingConfig
 from deepsparse.server.server import _add_pipeline_endpoint, _build_app
+from deepsparse.timing import LatencyProfiler
+from deepsparse.utils import arrays_to_npz_bytes, npz_bytes_to_arrays
 from fastapi import FastAPI, UploadFile
 from fastapi.testclient import TestClient
+from tests.helpers import BucketedAddPipeline
 from tests.utils import mock_engine
 
 
@@ -36,10 +49,41 @@ class StrSchema(BaseModel):
     value: str
 
 
+class StrFilesSchema(BaseModel):
+    values: List[str]
+
+    @classmethod
+    def from_files(cls, files, from_server=False):
+        return cls(values=[file.read().decode() for file in files])
+
+
+class IntsSchema(BaseModel):
+    values: List[int]
+
+
+async def parse_all(v: StrFilesSchema) -> IntsSchema:
+    return IntsSchema(values=[int(value) for value in v.values])
+
+
 def parse(v: StrSchema) -> int:
     return int(v.value)
 
 
+class ArraySchema(BaseModel):
+    values: Any
+
+
+class ArrayStatsSchema(BaseModel):
+    sums: List[float]
+    labels: List[Any]
+
+
+def array_stats(v: ArraySchema) -> ArrayStatsSchema:
+    values = numpy.asarray(v.values)
+    labels = [[0], [1, 2]] if values.shape[0] == 2 else list(range(values.shape[0]))
+    return ArrayStatsSchema(sums=values.sum(axis=1).tolist(), labels=labels)
+
+
 class TestStatusEndpoints:
     @pytest.fixture(scope="class")
     def server_config(self):
@@ -63,6 +107,11 @@ class TestStatusEndpoints:
         assert response.status_code == 200
         assert response.json() is True
 
+    def test_latency_metrics_without_endpoints(self, client):
+        response = client.get("/metrics/latency")
+        assert response.status_code == 200
+        assert response.json() == {}
+
     def test_docs_exist(self, client):
         assert client.get("/docs").status_code == 200
 
@@ -92,7 +141,7 @@ class TestMockEndpoints:
 
     def test_add_model_endpoint(self, app: FastAPI, client: TestClient):
         mock_pipeline = Mock(
-            side_effect=parse,
+            run_async=AsyncMock(side_effect=parse),
             input_schema=StrSchema,
             output_schema=int,
             logger=MultiLogger([]),
@@ -113,6 +162,218 @@ class TestMockEndpoints:
             assert response.status_code == 200
             assert response.json() == int(v)
 
+    @pytest.mark.parametrize("status_code", [429, 503])
+    def test_overloaded_endpoint_rejects_requests(self, app, client, status_code):
+        release = threading.Event()
+
+        async def _blocking_parse(request):
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            return parse(request)
+
+        admission_controller = AdmissionController(
+            max_concurrent_requests=1, overload_status_code=status_code
+        )
+        _add_pipeline_endpoint(
+            app,
+            system_logging_config=SystemLoggingConfig(),
+            endpoint_config=Mock(route=f"/predict/limited_{status_code}"),
+            pipeline=Mock(
+                run_async=AsyncMock(side_effect=_blocking_parse),
+                input_schema=StrSchema,
+                output_schema=int,
+                logger=None,
+            ),
+            admission_controller=admission_controller,
+        )
+
+        with ThreadPoolExecutor(1) as executor:
+            admitted = executor.submit(
+                client.post, f"/predict/limited_{status_code}", json=dict(value="1")
+            )
+            while admission_controller.in_flight == 0:
+                assert not admitted.done()
+
+            rejected = client.post(
+                f"/predict/limited_{status_code}", json=dict(value="2")
+            )
+            assert rejected.status_code == status_code
+            assert rejected.headers["Retry-After"] == "1"
+
+            release.set()
+            assert admitted.result().status_code == 200
+            assert admitted.result().json() == 1
+
+        assert admission_controller.in_flight == 0
+        assert admission_controller.num_rejected == 1
+
+    def test_binary_tensor_requests(self, app, client):
+        run_async = AsyncMock(side_effect=array_stats)
+        _add_pipeline_endpoint(
+            app,
+            system_logging_config=SystemLoggingConfig(),
+            endpoint_config=Mock(route="/predict/array_stats"),
+            pipeline=Mock(
+                run_async=run_async,
+                input_schema=ArraySchema,
+                output_schema=ArrayStatsSchema,
+                logger=None,
+            ),
+        )
+        values = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+        npz_body = arrays_to_npz_bytes({"values": values})
+
+        # binary request, json response
+        response = client.post(
+            "/predict/array_stats",
+            data=npz_body,
+            headers={"Content-Type": NPZ_MEDIA_TYPE},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"sums": [6, 22, 38], "labels": [0, 1, 2]}
+        passed_values = run_async.call_args[0][0].values
+        assert isinstance(passed_values, numpy.ndarray)
+        assert not passed_values.flags.owndata
+
+        # binary request and response
+        response = client.post(
+            "/predict/array_stats",
+            data=npz_body,
+            headers={"Content-Type": NPZ_MEDIA_TYPE, "Accept": NPZ_MEDIA_TYPE},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == NPZ_MEDIA_TYPE
+        outputs = npz_bytes_to_arrays(response.content)
+        assert numpy.array_equal(outputs["sums"], [6, 22, 38])
+
+        # json request, binary response of ragged outputs
+        response = client.post(
+            "/predict/array_stats",
+            json={"values": [[1, 2], [3, 4]]},
+            headers={"Accept": NPZ_MEDIA_TYPE},
+        )
+        assert response.status_code == 406
+
+        response = client.post(
+            "/predict/array_stats",
+            data=b"not an npz archive",
+            headers={"Content-Type": NPZ_MEDIA_TYPE},
+        )
+        assert response.status_code == 400
+
+        compressed_body = io.BytesIO()
+        numpy.savez_compressed(compressed_body, values=numpy.zeros((64, 64)))
+        with patch.object(BinaryTensorRoute, "max_uncompressed_size", 1024):
+            response = client.post(
+                "/predict/array_stats",
+                data=compressed_body.getvalue(),
+                headers={"Content-Type": NPZ_MEDIA_TYPE},
+            )
+        assert response.status_code == 400
+
+    def test_batch_endpoint_returns_per_item_errors(self, app, client):
+        def _run_batch(requests):
+            results = []
+            for request in requests:
+                try:
+                    value = parse(StrSchema.parse_obj(request))
+                except ValidationError as err:
+                    results.append(err)
+                    continue
+                results.append(ValueError("negative value") if value < 0 else value)
+            return results
+
+        mock_pipeline = Mock(
+            run_batch=Mock(side_effect=_run_batch),
+            input_schema=StrSchema,
+            output_schema=int,
+            logger=None,
+        )
+        _add_pipeline_endpoint(
+            app,
+            system_logging_config=SystemLoggingConfig(),
+            endpoint_config=Mock(route="/predict/parse_batch"),
+            pipeline=mock_pipeline,
+        )
+        assert app.routes[-2].path == "/predict/parse_batch/batch"
+
+        response = client.post(
+            "/predict/parse_batch/batch",
+            json=[dict(value="1"), dict(value="-2"), dict(not_a_value="3")],
+        )
+        assert response.status_code == 200
+        outputs = response.json()
+        assert outputs[:2] == [
+            {"output": 1, "error": None},
+            {"output": None, "error": "ValueError: negative value"},
+        ]
+        assert outputs[2]["error"].startswith("ValidationError")
+
+    def test_bucketing_endpoint(self, app, client):
+        pipeline = BucketingPipeline(
+            [
+                BucketedAddPipeline(max_values=2, offset=1.0),
+                BucketedAddPipeline(max_values=4, offset=2.0),
+            ]
+        )
+        _add_pipeline_endpoint(
+            app,
+            system_logging_config=SystemLoggingConfig(),
+            endpoint_config=Mock(route="/predict/bucketing"),
+            pipeline=pipeline,
+        )
+
+        # each input runs on the bucket it is routed to
+        response = client.post("/predict/bucketing", json=dict(values=[1.0]))
+        assert response.status_code == 200
+        assert response.json() == {"values": [2.0]}
+        response = client.post("/predict/bucketing", json=dict(values=[1.0, 2.0, 3.0]))
+        assert response.status_code == 200
+        assert response.json() == {"values": [3.0, 4.0, 5.0]}
+
+        response = client.post(
+            "/predict/bucketing/batch",
+            json=[dict(values=[1.0, 2.0, 3.0]), dict(values=[1.0]), dict(foo=1)],
+        )
+        assert response.status_code == 200
+        outputs = response.json()
+        assert outputs[:2] == [
+            {"output": {"values": [3.0, 4.0, 5.0]}, "error": None},
+            {"output": {"values": [2.0]}, "error": None},
+        ]
+        assert outputs[2]["error"].startswith("ValidationError")
+
+    def test_streamed_from_files_endpoint(self, app, client):
+        _add_pipeline_endpoint(
+            app,
+            system_logging_config=SystemLoggingConfig(),
+            endpoint_config=Mock(route="/predict/parse_files"),
+            pipeline=Mock(
+                run_async=AsyncMock(side_effect=parse_all),
+                inputs_from_files=lambda files: StrFilesSchema.from_files(
+                    files, from_server=True
+                ),
+                input_schema=StrFilesSchema,
+                output_schema=IntsSchema,
+                batch_size=2,
+                logger=None,
+            ),
+        )
+        assert app.routes[-3].path == "/predict/parse_files/from_files/stream"
+
+        files = [("request", (f"{i}.txt", str(i).encode())) for i in range(4)]
+        files.append(("request", ("bad.txt", b"not an int")))
+        response = client.post("/predict/parse_files/from_files/stream", files=files)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[:2] == [
+            {"files": ["0.txt", "1.txt"], "output": {"values": [0, 1]}},
+            {"files": ["2.txt", "3.txt"], "output": {"values": [2, 3]}},
+        ]
+        assert lines[2]["files"] == ["bad.txt"]
+        assert lines[2]["error"].startswith("ValueError")
+
     def test_add_model_endpoint_with_from_files(self, app):
         _add_pipeline_endpoint(
             app,
@@ -239,6 +500,116 @@ class TestDynamicEndpoints:
             yield TestClient(app)
 
 
+def test_latency_metrics_endpoint():
+    profiler = LatencyProfiler()
+    mock_pipeline = Mock(
+        side_effect=parse,
+        input_schema=StrSchema,
+        output_schema=int,
+        logger=None,
+        latency_profiler=profiler,
+    )
+    server_config = ServerConfig(
+        num_cores=1,
+        num_workers=1,
+        endpoints=[EndpointConfig(name="parse", task="custom", model="")],
+        loggers={},
+    )
+    with patch.object(Pipeline, "from_config", return_value=mock_pipeline):
+        client = TestClient(_build_app(server_config))
+
+    profiler.record("engine_forward", 0.5)
+    response = client.get("/metrics/latency", params=dict(reset=True))
+    assert response.status_code == 200
+    assert response.json()["parse"]["engine_forward"]["count"] == 1
+    assert client.get("/metrics/latency").json() == {"parse": {}}
+
+    response = client.delete(
+        "/endpoints",
+        json=EndpointConfig(route="/predict", task="custom", model="").dict(),
+    )
+    assert response.status_code == 200
+    assert client.get("/metrics/latency").json() == {}
+    # the batch route of the endpoint is removed with it
+    assert client.post("/predict/batch", json=[]).status_code == 404
+
+
+def test_replace_endpoint_without_downtime():
+    def _mock_pipeline(offset):
+        return Mock(
+            run_async=AsyncMock(side_effect=lambda v: parse(v) + offset),
+            input_schema=StrSchema,
+            output_schema=int,
+            logger=None,
+            engine=Mock(),
+            latency_profiler=LatencyProfiler(),
+        )
+
+    old_pipeline, new_pipeline = _mock_pipeline(0), _mock_pipeline(100)
+    server_config = ServerConfig(
+        num_cores=1,
+        num_workers=1,
+        endpoints=[EndpointConfig(name="parse", task="custom", model="old")],
+        loggers={},
+    )
+    with patch.object(Pipeline, "from_config", return_value=old_pipeline):
+        client = TestClient(_build_app(server_config))
+    assert client.post("/predict", json=dict(value="1")).json() == 1
+
+    def _build_new_pipeline(*args, **kwargs):
+        # the old pipeline keeps serving while the new one is built
+        assert client.post("/predict", json=dict(value="2")).json() == 2
+        assert client.get("/ready").json() is True
+        assert set(client.get("/metrics/latency").json()) == {"parse"}
+        return new_pipeline
+
+    with patch.object(Pipeline, "from_config", side_effect=_build_new_pipeline):
+        response = client.put(
+            "/endpoints",
+            json=EndpointConfig(route="/predict", task="custom", model="new").dict(),
+        )
+    assert response.status_code == 200
+
+    assert client.post("/predict", json=dict(value="3")).json() == 103
+    assert [route.path for route in client.app.routes].count("/predict") == 1
+    # the old pipeline is drained and closed, releasing its engine
+    old_pipeline.close.assert_called_once()
+    new_pipeline.close.assert_not_called()
+    assert set(client.get("/metrics/latency").json()) == {"parse"}
+
+
+def test_replace_endpoint_failed_build_keeps_endpoint():
+    old_pipeline = Mock(
+        run_async=AsyncMock(side_effect=parse),
+        input_schema=StrSchema,
+        output_schema=int,
+        logger=None,
+        engine=Mock(),
+        latency_profiler=LatencyProfiler(),
+    )
+    server_config = ServerConfig(
+        num_cores=1,
+        num_workers=1,
+        endpoints=[EndpointConfig(name="parse", task="custom", model="old")],
+        loggers={},
+    )
+    with patch.object(Pipeline, "from_config", return_value=old_pipeline):
+        client = TestClient(_build_app(server_config), raise_server_exceptions=False)
+
+    with patch.object(Pipeline, "from_config", side_effect=RuntimeError("bad model")):
+        response = client.put(
+            "/endpoints",
+            json=EndpointConfig(route="/predict", task="custom", model="new").dict(),
+        )
+    assert response.status_code == 500
+
+    # the old endpoint is still served and reported
+    assert client.post("/predict", json=dict(value="1")).json() == 1
+    assert client.get("/ready").json() is True
+    assert set(client.get("/metrics/latency").json()) == {"parse"}
+    old_pipeline.close.assert_not_called()
+
+
 @mock_engine(rng_seed=0)
 def test_dynamic_add_and_remove_endpoint(engine_mock):
     server_config = ServerConfig(num_cores=1, num_workers=1, endpoints=[], loggers={})
@@ -266,3 +637,104 @@ def test_dynamic_add_and_remove_endpoint(engine_mock):
     )
     assert response.status_code == 200
     assert 404 == client.post("/predict", json=dict(sequences="asdf")).status_code
+
+
+def test_dedicated_endpoint_context():
+    server_config = ServerConfig(
+        num_cores=2,
+        num_workers=2,
+        endpoints=[
+            EndpointConfig(name="shared", route="/shared", task="custom", model=""),
+            EndpointConfig(
+                name="isolated",
+                route="/isolated",
+                task="custom",
+                model="",
+                num_cores=1,
+                num_streams=1,
+                priority=10,
+            ),
+        ],
+        loggers={},
+    )
+    mock_pipeline = Mock(
+        input_schema=StrSchema,
+        output_schema=int,
+        logger=None,
+        latency_profiler=LatencyProfiler(),
+    )
+    with patch.object(
+        Pipeline, "from_config", return_value=mock_pipeline
+    ) as from_config:
+        _build_app(server_config)
+
+    (shared_config, shared_context, _), (isolated_config, isolated_context, _) = [
+        call.args for call in from_config.call_args_list
+    ]
+    shared_executor = shared_config.kwargs["executor"]
+    isolated_executor = isolated_config.kwargs["executor"]
+    assert isolated_context is not shared_context
+    assert isolated_context.num_cores == 1
+    assert isolated_executor is not shared_executor
+    assert isolated_executor._max_workers == 1
+    assert shared_executor._max_workers == 2
+    isolated_executor.shutdown()
+
+
+def test_ready_after_warmup():
+    warmup_started, finish_warmup = threading.Event(), threading.Event()
+
+    def _warmup(num_iterations, sample_input):
+        warmup_started.set()
+        finish_warmup.wait(timeout=10)
+
+    mock_pipeline = Mock(
+        input_schema=StrSchema,
+        output_schema=int,
+        logger=None,
+        latency_profiler=LatencyProfiler(),
+        warmup=Mock(side_effect=_warmup),
+    )
+    server_config = ServerConfig(
+        num_cores=1,
+        num_workers=1,
+        endpoints=[
+            EndpointConfig(
+                name="parse",
+                task="custom",
+                model="",
+                warmup_iterations=2,
+                warmup_input=dict(value="1"),
+            )
+        ],
+        loggers={},
+    )
+    with patch.object(Pipeline, "from_config", return_value=mock_pipeline):
+        client = TestClient(_build_app(server_config))
+
+    assert warmup_started.wait(timeout=10)
+    # live while warming up, but not ready
+    assert client.get("/health").json() is True
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() is False
+
+    finish_warmup.set()
+    for _ in range(100):
+        if client.get("/ready").status_code == 200:
+            break
+        time.sleep(0.01)
+    assert client.get("/ready").json() is True
+    mock_pipeline.warmup.assert_called_once_with(2, dict(value="1"))
+
+    # endpoints added at runtime are warmed up before being served
+    with patch.object(Pipeline, "from_config", return_value=mock_pipeline):
+        response = client.post(
+            "/endpoints",
+            json=EndpointConfig(
+                route="/other", task="custom", model="", warmup_iterations=1
+            ).dict(),
+        )
+    assert response.status_code == 200
+    mock_pipeline.warmup.assert_called_with(1, None)
+    assert client.get("/ready").json() is True
@@ -98,6 +98,26 @@ def test_update_endpoints(delete: MagicMock, post: MagicMock):
     post.assert_called_once_with("", json=route3.dict())
 
 
+@patch("requests.put")
+@patch("requests.post")
+@patch("requests.delete")
+def test_update_endpoints_replaces_modified(
+    delete: MagicMock, post: MagicMock, put: MagicMock
+):
+    old_route = EndpointConfig(task="b", model="c", route="1")
+    new_route = EndpointConfig(task="b", model="d", route="1")
+
+    added, removed = _update_endpoints(
+        "", ServerConfig(endpoints=[old_route]), ServerConfig(endpoints=[new_route])
+    )
+    assert added == [new_route]
+    assert removed == [old_route]
+
+    delete.assert_not_called()
+    post.assert_not_called()
+    put.assert_called_once_with("", json=new_route.dict())
+
+
 def test_file_changes(tmp_path: Path):
     # NOTE: this sleeps between each write because timestamps
     # only have a certain resolution
@@ -121,9 +141,10 @@ def test_file_changes(tmp_path: Path):
     assert content.maybe_update_content() == ("first", "second")
 
 
+@patch("requests.put")
 @patch("requests.post")
 @patch("requests.delete")
-def test_file_monitoring(delete_mock, post_mock, tmp_path: Path):
+def test_file_monitoring(delete_mock, post_mock, put_mock, tmp_path: Path):
     path = str(tmp_path / "cfg.yaml")
     versions_path = tmp_path / "cfg.yaml.versions"
 
@@ -0,0 +1,198 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+from pydantic import BaseModel
+
+import pytest
+from deepsparse import Pipeline
+from deepsparse.loggers.config import SystemLoggingGroup
+from deepsparse.server.config import (
+    EndpointConfig,
+    LazyLoadingConfig,
+    ServerConfig,
+    ServerSystemLoggingConfig,
+)
+from deepsparse.server.lazy_loading import PipelineLoader
+from deepsparse.server.server import _build_app
+from deepsparse.timing import LatencyProfiler
+from fastapi.testclient import TestClient
+
+
+_MB = 1024**2
+
+
+class StrSchema(BaseModel):
+    value: str
+
+
+@pytest.fixture
+def resident_memory():
+    # each engine load grows the resident memory of the process by 60 MB
+    rss = [0]
+
+    def _initialize_engine():
+        rss[0] += 60 * _MB
+        return Mock()
+
+    with patch("deepsparse.server.lazy_loading.psutil.Process") as process:
+        process.return_value.memory_info.side_effect = lambda: Mock(rss=rss[0])
+        yield _initialize_engine
+
+
+def _mock_pipeline(initialize_engine):
+    return _closes_engine(
+        Mock(
+            engine=None,
+            _initialize_engine=Mock(side_effect=initialize_engine),
+            side_effect=lambda value: int(value),
+        )
+    )
+
+
+def _closes_engine(pipeline):
+    # like Pipeline.close, closing the mock pipeline releases its engine
+    pipeline.close.side_effect = lambda: setattr(pipeline, "engine", None)
+    return pipeline
+
+
+def test_loads_on_first_use(resident_memory):
+    loader = PipelineLoader(LazyLoadingConfig())
+    pipeline = loader.lazy_pipeline("a", _mock_pipeline(resident_memory))
+    assert loader.loaded == []
+
+    assert pipeline("1") == 1
+    assert pipeline("2") == 2
+    assert pipeline.pipeline._initialize_engine.call_count == 1
+    assert pipeline.pipeline.engine is not None
+    assert loader.loaded == ["a"]
+    assert loader.memory_bytes == 60 * _MB
+    assert loader.num_loads == 1
+
+
+def test_evicts_least_recently_used_over_budget(resident_memory):
+    loader = PipelineLoader(LazyLoadingConfig(max_memory_mb=150))
+    a, b, c = [
+        loader.lazy_pipeline(name, _mock_pipeline(resident_memory))
+        for name in ("a", "b", "c")
+    ]
+    a("1")
+    b("1")
+    a("1")
+    c("1")
+    # b is the least recently used pipeline
+    assert loader.loaded == ["a", "c"]
+    assert b.pipeline.engine is None
+    assert loader.num_evictions == 1
+
+    # reloading b makes room for its known size before loading it
+    b("1")
+    assert loader.loaded == ["c", "b"]
+    assert b.pipeline._initialize_engine.call_count == 2
+
+
+def test_pipelines_in_use_are_not_evicted(resident_memory):
+    loader = PipelineLoader(LazyLoadingConfig(max_memory_mb=100))
+    a, b = [
+        loader.lazy_pipeline(name, _mock_pipeline(resident_memory))
+        for name in ("a", "b")
+    ]
+    with loader.loaded_pipeline(a):
+        b("1")
+        # over budget, but a is in use
+        assert loader.loaded == ["a", "b"]
+    # once idle, the least recently used pipeline is evicted
+    loader.evict_idle()
+    assert loader.loaded == ["b"]
+
+    c = loader.lazy_pipeline("c", _mock_pipeline(resident_memory))
+    c("1")
+    assert loader.loaded == ["c"]
+
+
+def test_logs_loads_and_evictions(resident_memory):
+    server_logger = Mock()
+    loader = PipelineLoader(
+        LazyLoadingConfig(max_memory_mb=100),
+        server_logger,
+        ServerSystemLoggingConfig(endpoint_loading=SystemLoggingGroup(enable=True)),
+    )
+    for name in ("a", "b"):
+        loader.lazy_pipeline(name, _mock_pipeline(resident_memory))("1")
+
+    logged = {
+        call.kwargs["identifier"]: call.kwargs["value"]
+        for call in server_logger.log.call_args_list
+    }
+    assert logged["endpoint_loading/a/loaded"] == 0
+    assert logged["endpoint_loading/b/loaded"] == 1
+    assert logged["endpoint_loading/b/memory_bytes"] == 60 * _MB
+    assert "endpoint_loading/b/cold_load_seconds" in logged
+    assert logged["endpoint_loading/load_count"] == 2
+    assert logged["endpoint_loading/eviction_count"] == 1
+    assert logged["endpoint_loading/loaded_endpoints"] == 1
+
+
+def test_evicts_idle_pipelines(resident_memory):
+    loader = PipelineLoader(LazyLoadingConfig(idle_ttl_seconds=0.05))
+    pipeline = loader.lazy_pipeline("a", _mock_pipeline(resident_memory))
+    pipeline("1")
+    for _ in range(100):
+        if not loader.loaded:
+            break
+        time.sleep(0.01)
+    loader.close()
+    assert loader.loaded == []
+    assert pipeline.pipeline.engine is None
+
+
+def test_server_loads_endpoints_lazily(resident_memory):
+    mock_pipeline = _closes_engine(
+        Mock(
+            engine=None,
+            _initialize_engine=Mock(side_effect=resident_memory),
+            run_async=AsyncMock(side_effect=lambda request: int(request.value)),
+            input_schema=StrSchema,
+            output_schema=int,
+            logger=None,
+            latency_profiler=LatencyProfiler(),
+        )
+    )
+    server_config = ServerConfig(
+        num_cores=1,
+        num_workers=1,
+        endpoints=[EndpointConfig(name="parse", task="custom", model="")],
+        lazy_loading=LazyLoadingConfig(max_memory_mb=100),
+        loggers={},
+    )
+    with patch.object(
+        Pipeline, "from_config", return_value=mock_pipeline
+    ) as from_config:
+        client = TestClient(_build_app(server_config))
+    assert from_config.call_args.args[0].kwargs["_delay_engine_initialize"] is True
+    mock_pipeline._initialize_engine.assert_not_called()
+
+    assert client.post("/predict", json=dict(value="5")).json() == 5
+    mock_pipeline._initialize_engine.assert_called_once()
+    assert mock_pipeline.engine is not None
+
+    # removing the endpoint releases its engine
+    response = client.delete(
+        "/endpoints",
+        json=EndpointConfig(route="/predict", task="custom", model="").dict(),
+    )
+    assert response.status_code == 200
+    assert mock_pipeline.engine is None
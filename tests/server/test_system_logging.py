@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
 from unittest import mock
 
 import pytest
@@ -23,7 +25,7 @@ from deepsparse.server.config import (
 )
 from deepsparse.server.helpers import server_logger_from_config
 from deepsparse.server.server import _build_app
-from deepsparse.server.system_logging import log_resource_utilization
+from deepsparse.server.system_logging import ResourceSampler, log_resource_utilization
 from fastapi.testclient import TestClient
 from tests.deepsparse.loggers.helpers import ListLogger
 from tests.utils import mock_engine
@@ -167,3 +169,69 @@ def test_log_resource_utilization(num_iterations, additional_items_to_log):
     _test_cpu_utilization(calls, num_iterations)
     _test_memory_utilization(calls, num_iterations)
     _test_total_memory_available(calls, num_iterations)
+
+
+def test_resource_sampler_samples_in_background():
+    sampler = ResourceSampler(interval_seconds=0.01)
+    sampler.start()
+    try:
+        first = sampler.snapshot()
+        assert set(first) == {
+            "cpu_utilization_percent",
+            "memory_utilization_percent",
+            "resident_memory_bytes",
+            "num_threads",
+            "active_threads",
+            "total_memory_available_bytes",
+        }
+        assert first["resident_memory_bytes"] > 0
+        for _ in range(100):
+            if sampler.snapshot() is not first:
+                break
+            time.sleep(0.01)
+        assert sampler.snapshot() is not first
+    finally:
+        sampler.stop()
+    assert not sampler.running
+
+
+def test_resource_sampler_resamples_stale_snapshot():
+    # without the background thread, the snapshot is refreshed on demand
+    sampler = ResourceSampler(interval_seconds=0.05)
+    first = sampler.snapshot()
+    assert sampler.snapshot() is first
+    time.sleep(0.1)
+    assert sampler.snapshot() is not first
+    assert not sampler.running
+
+
+def test_resource_sampler_counts_active_threads():
+    sampler = ResourceSampler()
+    sampler.sample()
+    stop = threading.Event()
+
+    def _spin():
+        while not stop.is_set():
+            pass
+
+    thread = threading.Thread(target=_spin)
+    thread.start()
+    try:
+        time.sleep(0.2)
+        assert sampler.sample()["active_threads"] >= 1
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_log_resource_utilization_reads_snapshot():
+    # once sampled, logging does not query the system
+    log_resource_utilization(ListLogger())
+    server_logger = ListLogger()
+    with mock.patch("deepsparse.server.system_logging.psutil") as psutil:
+        log_resource_utilization(server_logger)
+    assert not psutil.mock_calls
+    assert any(
+        call.startswith("identifier:resource_utilization/resident_memory_bytes")
+        for call in server_logger.calls
+    )
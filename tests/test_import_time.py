@@ -0,0 +1,50 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def _modules_after_import(statement: str):
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {statement}; print(','.join(sorted(sys.modules)))",
+        ],
+        env={**os.environ, "NM_VERSION_CHECK": "false"},
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return set(process.stdout.strip().split(","))
+
+
+@pytest.mark.parametrize(
+    "lazy_module",
+    [
+        "deepsparse.engine",
+        "deepsparse.lib",
+        "deepsparse.pipeline",
+        "deepsparse.loggers",
+        "deepsparse.tasks",
+        "pydantic",
+        "sparsezoo",
+    ],
+)
+def test_import_is_lazy(lazy_module):
+    assert lazy_module not in _modules_after_import("import deepsparse")
@@ -12,10 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
+import zipfile
+
 import numpy
 
 import pytest
-from deepsparse.utils import arrays_to_bytes, bytes_to_arrays
+from deepsparse.utils import (
+    arrays_to_bytes,
+    arrays_to_npz_bytes,
+    bytes_to_arrays,
+    npz_bytes_to_arrays,
+)
 
 
 @pytest.mark.parametrize(
@@ -43,3 +51,60 @@ def test_arrays_bytes_conversion(arrays):
         assert isinstance(deserialized_array, numpy.ndarray)
         assert array.shape == deserialized_array.shape
         assert numpy.all(array == deserialized_array)
+
+
+def test_npz_bytes_conversion():
+    arrays = {
+        "uint8": numpy.random.randint(255, size=(3, 24, 24), dtype=numpy.uint8),
+        "float32": numpy.random.randn(16, 384).astype(numpy.float32),
+        "fortran": numpy.asfortranarray(numpy.random.randn(4, 5)),
+        "strings": numpy.array(["today is great", "today is terrible"]),
+        "empty": numpy.zeros((0, 3)),
+    }
+    serialized_npz = arrays_to_npz_bytes(arrays)
+    assert isinstance(serialized_npz, bytes)
+
+    deserialized_arrays = npz_bytes_to_arrays(serialized_npz)
+    assert deserialized_arrays.keys() == arrays.keys()
+    for name, array in arrays.items():
+        deserialized_array = deserialized_arrays[name]
+        assert deserialized_array.dtype == array.dtype
+        assert numpy.array_equal(deserialized_array, array)
+        # arrays are views into the serialized bytes
+        assert not deserialized_array.flags.owndata
+        assert not deserialized_array.flags.writeable
+
+
+def test_npz_bytes_compressed_and_object_arrays():
+    array = numpy.random.randn(8, 8)
+    buffer = io.BytesIO()
+    numpy.savez_compressed(buffer, array=array)
+    assert numpy.array_equal(npz_bytes_to_arrays(buffer.getvalue())["array"], array)
+
+    buffer = io.BytesIO()
+    numpy.savez(buffer, ragged=numpy.array([[1], [1, 2]], dtype=object))
+    with pytest.raises(ValueError):
+        npz_bytes_to_arrays(buffer.getvalue())
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_npz_bytes_declared_size_checked(compression):
+    npy_file = io.BytesIO()
+    header = {"descr": "<f8", "fortran_order": False, "shape": (2**20, 2**20)}
+    numpy.lib.format.write_array_header_1_0(npy_file, header)
+    npy_file.write(numpy.zeros(4).tobytes())
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=compression) as archive:
+        archive.writestr("array.npy", npy_file.getvalue())
+
+    # rejected before the declared array is allocated
+    with pytest.raises(ValueError, match="declares"):
+        npz_bytes_to_arrays(buffer.getvalue())
+
+
+def test_npz_bytes_max_uncompressed_size():
+    buffer = io.BytesIO()
+    numpy.savez_compressed(buffer, array=numpy.zeros((8, 8)))
+    with pytest.raises(ValueError, match="maximum uncompressed size"):
+        npz_bytes_to_arrays(buffer.getvalue(), max_uncompressed_size=256)
+    assert npz_bytes_to_arrays(buffer.getvalue(), max_uncompressed_size=1024)
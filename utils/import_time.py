@@ -0,0 +1,135 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the time of `import deepsparse` with `python -X importtime`
+
+usage: import_time.py [-h] [--module MODULE] [--runs RUNS] [--top TOP]
+                      [--max-ms MAX_MS]
+
+example: python utils/import_time.py --runs 10 --max-ms 250
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+__all__ = [
+    "parse_import_times",
+    "measure_import_time",
+]
+
+# lines of the form "import time:    self [us] |  cumulative | imported package"
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the import time of a module with python -X importtime"
+    )
+    parser.add_argument(
+        "--module", type=str, default="deepsparse", help="Module to import"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of fresh interpreters to import the module in",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of modules with the largest self import time to print",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Exit with an error if the median import time exceeds this budget",
+    )
+
+    return parser.parse_args()
+
+
+def parse_import_times(importtime_output: str) -> Dict[str, Tuple[int, int]]:
+    """
+    :param importtime_output: stderr of a `python -X importtime` run
+    :return: mapping of imported module name to its (self, cumulative)
+        import time in microseconds
+    """
+    times = {}
+    for line in importtime_output.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            times[module] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure_import_time(module: str, runs: int) -> List[Dict[str, Tuple[int, int]]]:
+    """
+    :param module: name of the module to import
+    :param runs: number of fresh interpreters to import the module in
+    :return: parsed import times of each run
+    """
+    env = dict(os.environ)
+    env.setdefault("NM_VERSION_CHECK", "false")
+    results = []
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Unable to import {module}:\n{process.stderr}")
+        results.append(parse_import_times(process.stderr))
+    return results
+
+
+def main():
+    args = parse_args()
+    results = measure_import_time(args.module, args.runs)
+
+    totals_ms = [run[args.module][1] / 1000 for run in results]
+    median_ms = statistics.median(totals_ms)
+    print(
+        f"import {args.module}: median {median_ms:.1f} ms, "
+        f"min {min(totals_ms):.1f} ms, max {max(totals_ms):.1f} ms "
+        f"over {args.runs} runs"
+    )
+
+    slowest = sorted(results[-1].items(), key=lambda item: item[1][0], reverse=True)
+    print(f"\n{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+    for module, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>16.1f}  {module}")
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(
+            f"\nimport {args.module} took {median_ms:.1f} ms, "
+            f"exceeding the budget of {args.max_ms} ms"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# Copyright (c) 2021 - present / Neuralmagic, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Benchmark the vectorized built-in data logging metric functions against their
+previous implementations, which process the items of a batch one by one
+
+usage: metric_functions_benchmark.py [-h] [--batch-size BATCH_SIZE]
+                                     [--image-size IMAGE_SIZE]
+                                     [--num-detections NUM_DETECTIONS]
+                                     [--num-tokens NUM_TOKENS] [--runs RUNS]
+
+example: python utils/metric_functions_benchmark.py --batch-size 64 --runs 20
+"""
+
+import argparse
+import timeit
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy
+
+from deepsparse.loggers.metric_functions import (
+    detected_classes,
+    mean_score,
+    mean_score_per_detection,
+    std_pixels_per_channel,
+    std_score_per_detection,
+)
+from deepsparse.loggers.metric_functions.computer_vision.built_ins import (
+    _check_valid_detection,
+    _check_valid_score,
+)
+
+
+__all__ = ["benchmark_metric_functions"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the built-in data logging metric functions"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=64, help="Number of items per batch"
+    )
+    parser.add_argument(
+        "--image-size", type=int, default=224, help="Height and width of the images"
+    )
+    parser.add_argument(
+        "--num-detections",
+        type=int,
+        default=50,
+        help="Number of detections per image",
+    )
+    parser.add_argument(
+        "--num-tokens", type=int, default=128, help="Number of tokens per sequence"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Number of timed calls per function"
+    )
+
+    return parser.parse_args()
+
+
+# the previous implementations of the built-in functions, applying numpy
+# to every item of the batch
+
+
+def _loop_std_pixels_per_channel(img: numpy.ndarray) -> Dict[str, float]:
+    stds = tuple(numpy.std(img, axis=(0, 2, 3)))
+    return {f"channel_{index}": std for index, std in enumerate(stds)}
+
+
+def _loop_detected_classes(classes: List[List[int]]) -> Dict[str, int]:
+    counter = Counter()
+    for detection in classes:
+        _check_valid_detection(detection)
+        counter.update(detection)
+    return {str(label): count for label, count in counter.items()}
+
+
+def _loop_mean_score_per_detection(scores: List[List[float]]) -> List[float]:
+    results = []
+    for score in scores:
+        _check_valid_score(score)
+        results.append(0.0 if score == [None] else numpy.mean(score))
+    return results
+
+
+def _loop_std_score_per_detection(scores: List[List[float]]) -> List[float]:
+    results = []
+    for score in scores:
+        _check_valid_score(score)
+        results.append(0.0 if score == [None] else numpy.std(score))
+    return results
+
+
+def _loop_mean_score(output: Any) -> List[float]:
+    return [
+        numpy.mean([result.score for result in prediction])
+        for prediction in output.predictions
+    ]
+
+
+def _build_inputs(
+    batch_size: int, image_size: int, num_detections: int, num_tokens: int
+) -> Dict[str, Any]:
+    rng = numpy.random.default_rng(0)
+    token_results = [
+        [
+            SimpleNamespace(entity=f"LABEL_{rng.integers(3)}", score=float(score))
+            for score in rng.random(num_tokens)
+        ]
+        for _ in range(batch_size)
+    ]
+    return {
+        "images": rng.integers(
+            0, 256, size=(batch_size, 3, image_size, image_size), dtype=numpy.uint8
+        ),
+        "classes": rng.integers(0, 80, size=(batch_size, num_detections)).tolist(),
+        "scores": rng.random((batch_size, num_detections)).tolist(),
+        # token classification output schema
+        "tokens": SimpleNamespace(predictions=token_results),
+    }
+
+
+def benchmark_metric_functions(
+    batch_size: int = 64,
+    image_size: int = 224,
+    num_detections: int = 50,
+    num_tokens: int = 128,
+    runs: int = 10,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    :param batch_size: number of items per batch
+    :param image_size: height and width of the uint8 images
+    :param num_detections: number of detections per image
+    :param num_tokens: number of tokens per sequence
+    :param runs: number of timed calls per function
+    :return: mapping of metric function name to the mean seconds per call of
+        the loop implementation and of the built-in function
+    """
+    inputs = _build_inputs(batch_size, image_size, num_detections, num_tokens)
+    cases: List[Tuple[Callable, Callable, str]] = [
+        (_loop_std_pixels_per_channel, std_pixels_per_channel, "images"),
+        (_loop_detected_classes, detected_classes, "classes"),
+        (_loop_mean_score_per_detection, mean_score_per_detection, "scores"),
+        (_loop_std_score_per_detection, std_score_per_detection, "scores"),
+        (_loop_mean_score, mean_score, "tokens"),
+    ]
+
+    results = {}
+    for loop_function, function, input_name in cases:
+        value = inputs[input_name]
+        numpy.testing.assert_allclose(
+            _as_array(loop_function(value)), _as_array(function(value))
+        )
+        loop_seconds = timeit.timeit(lambda: loop_function(value), number=runs)
+        seconds = timeit.timeit(lambda: function(value), number=runs)
+        results[function.__name__] = (loop_seconds / runs, seconds / runs)
+    return results
+
+
+def _as_array(result: Any) -> numpy.ndarray:
+    if isinstance(result, dict):
+        result = [result[key] for key in sorted(result)]
+    return numpy.asarray(result, dtype=numpy.float64)
+
+
+def main():
+    args = parse_args()
+    results = benchmark_metric_functions(
+        batch_size=args.batch_size,
+        image_size=args.image_size,
+        num_detections=args.num_detections,
+        num_tokens=args.num_tokens,
+        runs=args.runs,
+    )
+
+    print(f"{'function':<26} {'loop [ms]':>10} {'built-in [ms]':>14} {'speedup':>8}")
+    for name, (loop_seconds, seconds) in results.items():
+        print(
+            f"{name:<26} {loop_seconds * 1000:>10.3f} {seconds * 1000:>14.3f} "
+            f"{loop_seconds / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()